@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AutomationBrain command dispatch
+===========================================
+
+Generates a few thousand varied commands (searches, memory requests, websites,
+media, system, file, window and input commands, status questions and plain
+chatter) and finds the handler routes for each of them two ways:
+
+- legacy:  the checks the pipeline used to make - _is_memory_command,
+           _is_search_command and _is_web_browsing_command, then every
+           handler's own loop over its phrases, plus the separate scans of
+           _analyze_command_context
+- matcher: one PhraseMatcher scan, shared by _analyze_command_context and
+           _match_command_routes
+
+Only the routing is timed; no handler action runs, so nothing is opened,
+typed or clicked. Both ways must pick the same routes in the same order and
+the same context for every command, otherwise the benchmark fails.
+
+The legacy checks matched memory and search triggers against the command as
+typed; the matcher sees the lower-cased command. The generated commands are
+lower case, so both agree.
+
+Usage:
+    python benchmarks/bench_command_dispatch.py
+    python benchmarks/bench_command_dispatch.py --commands 5000 --rounds 10
+
+AutomationBrain needs the assistant's desktop dependencies (pyautogui,
+pygetwindow, psutil), so run this where ZIA itself runs.
+"""
+
+import sys
+import time
+import random
+import argparse
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from brains.automation_brain import AutomationBrain  # noqa: E402
+
+# Handler phrase tables as the legacy handlers scanned them, in their order
+VIDEO_CONTROLS = ["play video", "pause video", "skip forward", "skip backward", "fullscreen", "exit fullscreen",
+                  "mute video", "unmute video"]
+SYSTEM_COMMANDS = ["system status", "system info", "time", "date", "performance stats", "task manager",
+                   "control panel", "lock screen", "sleep mode", "restart computer", "shutdown computer"]
+FILE_PREFIXES = ["create file", "delete file", "copy file", "move file", "rename file"]
+WINDOW_COMMANDS = ["minimize window", "maximize window", "close window", "new window", "new tab", "close tab",
+                   "switch window", "list windows"]
+
+TOPICS = ["black holes", "sourdough bread", "the roman empire", "python decorators", "quantum computing",
+          "penguins", "the stock market", "climate change", "jazz history", "machine learning", "mars",
+          "the french revolution", "photosynthesis", "chess openings", "my meeting with sarah"]
+TEMPLATES = [
+    "search for {topic}", "google {topic}", "look up {topic}", "tell me about {topic}", "what is {topic}",
+    "who is the author of {topic}", "how to learn {topic}", "explain {topic} quickly", "summarize {topic}",
+    "remember {topic}", "recall {topic}", "what do you remember about {topic}", "note this: {topic}",
+    "open {site}", "go to {site}", "visit {site}.com", "take me to {site}", "open the {site} website now",
+    "show me a video about {topic}", "play video", "pause video", "exit fullscreen", "volume up", "volume down",
+    "system status", "system info please", "what's the time", "what date is it", "open task manager",
+    "create file notes.txt", "delete file old_report.docx", "rename file a.txt", "organize files on my desktop",
+    "clean desktop", "minimize window", "maximize window", "new tab", "close tab and then new window",
+    "switch window", "move mouse to 300 400", "move mouse to the corner", "left click", "double click",
+    "copy the text", "paste text here", "type hello world", "type", "performance stats", "show stats",
+    "version", "help", "hello there", "good morning", "thank you", "how are you doing", "sing me a song",
+    "set an alarm for seven", "i feel tired", "let's play a game", "hurry up and open {site} asap",
+]
+SITES = ["youtube", "github", "reddit", "wikipedia", "netflix", "gmail", "my bank", "the news", "spotify", "docs"]
+
+
+def generate_commands(count: int, seed: int):
+    rng = random.Random(seed)
+    return [rng.choice(TEMPLATES).format(topic=rng.choice(TOPICS), site=rng.choice(SITES)) for _ in range(count)]
+
+
+def legacy_context(brain: AutomationBrain, command: str):
+    """_analyze_command_context as it was before the shared scan."""
+    context = { "length": len(command), "word_count": len(command.split()), "has_question": "?" in command, "urgency_indicators": [], "category": "general", "complexity": "simple" }
+    urgent_words = ["urgent", "quickly", "now", "immediately", "asap", "fast", "hurry"]
+    for word in urgent_words:
+        if word in command.lower(): context["urgency_indicators"].append(word)
+    if len(command.split()) > 10 or any(word in command.lower() for word in ["and", "then", "after", "before"]): context["complexity"] = "complex"
+    if any(trigger in command.lower() for trigger in brain.search_triggers): context["category"] = "search"
+    elif any(trigger in command.lower() for trigger in brain.memory_triggers): context["category"] = "memory"
+    elif any(trigger in command.lower() for trigger in brain.web_triggers): context["category"] = "web_browsing"
+    elif "file" in command.lower(): context["category"] = "file_operations"
+    elif any(word in command.lower() for word in ["window", "tab", "minimize", "maximize"]): context["category"] = "window_management"
+    return context
+
+
+def legacy_routes(brain: AutomationBrain, command: str, command_lower: str):
+    """(handler, route name) for each handler the legacy pipeline would have tried and the branch it took."""
+    routes = []
+    if any(trigger in command for trigger in brain.memory_triggers):
+        routes.append(("memory", brain.memory_triggers[0]))
+    if any(trigger in command for trigger in brain.search_triggers):
+        routes.append(("search", brain.search_triggers[0]))
+    c = command_lower
+    has_web_trigger = any(trigger in c for trigger in brain.web_triggers)
+    has_domain = any(domain in c for domain in brain.web_domains) or any(site in c for site in brain.common_websites)
+    if has_web_trigger and has_domain:
+        routes.append(("web", brain.web_triggers[0]))
+
+    if "show me" in c and "video" in c:
+        routes.append(("multimedia", "show me"))
+    else:
+        control = next((phrase for phrase in VIDEO_CONTROLS + ["volume up", "volume down"] if phrase in c), None)
+        if control: routes.append(("multimedia", control))
+
+    system_command = next((phrase for phrase in SYSTEM_COMMANDS if phrase in c), None)
+    if system_command: routes.append(("system", system_command))
+
+    file_command = next((prefix for prefix in FILE_PREFIXES if c.startswith(prefix)), None)
+    if file_command is None:
+        file_command = next((phrase for phrase in ("organize files", "clean desktop") if phrase in c), None)
+    if file_command: routes.append(("file", file_command))
+
+    window_command = next((phrase for phrase in WINDOW_COMMANDS if phrase in c), None)
+    if window_command: routes.append(("window", window_command))
+
+    if c.startswith("move mouse to"): routes.append(("input", "move mouse to"))
+    elif "left click" in c: routes.append(("input", "left click"))
+    elif "right click" in c: routes.append(("input", "right click"))
+    elif "double click" in c: routes.append(("input", "double click"))
+    elif "copy" in c and "text" in c: routes.append(("input", "copy"))
+    elif "paste" in c and "text" in c: routes.append(("input", "paste"))
+    elif c.startswith("type"): routes.append(("input", "type"))
+
+    if "performance stats" in c or "stats" in c: routes.append(("status", "performance stats"))
+    elif "version" in c or "about" in c: routes.append(("status", "version"))
+    elif "help" in c: routes.append(("status", "help"))
+    return routes
+
+
+def legacy_dispatch(brain: AutomationBrain, command: str):
+    command_lower = command.lower().strip()
+    return legacy_context(brain, command), legacy_routes(brain, command, command_lower)
+
+
+def matcher_dispatch(brain: AutomationBrain, command: str):
+    command_lower = command.lower().strip()
+    matches = brain.command_matcher.scan(command_lower)
+    routes = brain._match_command_routes(command_lower, matches)
+    return brain._analyze_command_context(command, matches), [(route.handler, route.name) for route in routes]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_dispatch(dispatch, brain: AutomationBrain, commands, rounds: int):
+    """Per-command latencies over `rounds` passes."""
+    latencies = []
+    for _ in range(rounds):
+        for command in commands:
+            start = time.perf_counter()
+            dispatch(brain, command)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy and single-scan AutomationBrain command dispatch")
+    parser.add_argument("--commands", type=int, default=3000, help="Generated commands")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed passes over the commands")
+    parser.add_argument("--seed", type=int, default=7, help="Command generator seed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    brain = AutomationBrain(None, {})
+    brain.logger.setLevel(logging.WARNING)
+    commands = generate_commands(args.commands, args.seed)
+
+    try:
+        mismatches = [command for command in commands if legacy_dispatch(brain, command) != matcher_dispatch(brain, command)]
+        if mismatches:
+            for command in mismatches[:10]:
+                print(f"mismatch: {command!r}\n  legacy:  {legacy_dispatch(brain, command)}\n  matcher: {matcher_dispatch(brain, command)}")
+            sys.exit(1)
+
+        print(f"{len(commands)} commands x {args.rounds} rounds, {len(brain.command_matcher.phrases)} phrases, "
+              f"{len(brain.command_routes)} routes; routes and context identical")
+        print(f"{'mode':>8} {'p50 us':>8} {'p95 us':>8} {'mean us':>8}")
+        results = {}
+        for name, dispatch in (("legacy", legacy_dispatch), ("matcher", matcher_dispatch)):
+            latencies = time_dispatch(dispatch, brain, commands, args.rounds)
+            results[name] = sum(latencies) / len(latencies)
+            print(f"{name:>8} {percentile(latencies, 0.50) * 1e6:>8.2f} {percentile(latencies, 0.95) * 1e6:>8.2f} "
+                  f"{results[name] * 1e6:>8.2f}")
+        print(f"speedup {results['legacy'] / results['matcher']:.2f}x")
+    finally:
+        brain.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DecisionBrain under concurrent callers
+=================================================
+
+Hammers one DecisionBrain with make_decision() from 1, 2, 4, ... threads (as
+when voice and text front ends submit commands at the same time) and reports
+throughput for each thread count, next to a "serialized" run that wraps every
+call in one global lock the way make_decision used to hold _decision_lock for
+the whole classification.
+
+After every run it checks that no update to the shared state was lost:
+total_decisions must equal the number of calls, and the conversation history
+must still respect the context window.
+
+Usage:
+    python benchmarks/bench_decision_concurrency.py
+    python benchmarks/bench_decision_concurrency.py --threads 1,2,4,8,16 --calls 4000 --cache
+
+On a standard (GIL) CPython build regex matching does not run in parallel, so
+expect flat throughput but no lock convoy; on a free-threaded build the
+unlocked path scales with cores.
+"""
+
+import sys
+import time
+import argparse
+import logging
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from brains.decision_brain import DecisionBrain  # noqa: E402
+from bench_intent_matching import COMMANDS  # noqa: E402
+
+
+def new_brain(cache: bool) -> DecisionBrain:
+    config = {"decision_brain": {"learning_enabled": False, "decision_cache_size": 512 if cache else 0}}
+    return DecisionBrain(None, config)
+
+
+def run(brain: DecisionBrain, threads: int, calls: int, serialized: bool) -> float:
+    """Split `calls` make_decision calls over `threads` threads and return calls per second."""
+    outer_lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+    per_thread = calls // threads
+
+    def worker(offset: int):
+        barrier.wait()
+        for i in range(per_thread):
+            command = COMMANDS[(offset + i) % len(COMMANDS)]
+            if serialized:
+                with outer_lock:
+                    brain.make_decision(command)
+            else:
+                brain.make_decision(command)
+
+    pool = [threading.Thread(target=worker, args=(n * 7,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def check_state(brain: DecisionBrain, calls: int, threads: int):
+    stats = brain.get_performance_stats()
+    assert stats['total_decisions'] == calls, f"{threads} threads: {stats['total_decisions']} decisions counted for {calls} calls"
+    assert stats['successful_decisions'] + stats['clarifications_needed'] <= calls
+    assert len(brain.conversation_history) <= brain.context_window
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure DecisionBrain throughput with concurrent callers")
+    parser.add_argument("--threads", default="1,2,4,8", help="Comma-separated thread counts")
+    parser.add_argument("--calls", type=int, default=2000, help="make_decision calls per run (rounded to a multiple of threads)")
+    parser.add_argument("--cache", action="store_true", help="Keep the decision cache enabled")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(f"{args.calls} calls per run, decision cache {'on' if args.cache else 'off'}")
+    print(f"{'threads':>7} {'unlocked/s':>11} {'serialized/s':>13} {'ratio':>6}")
+
+    for threads in (int(n) for n in args.threads.split(",")):
+        calls = args.calls // threads * threads
+        results = {}
+        for serialized in (False, True):
+            brain = new_brain(args.cache)
+            results[serialized] = run(brain, threads, calls, serialized)
+            check_state(brain, calls, threads)
+
+        print(f"{threads:>7} {results[False]:>11.0f} {results[True]:>13.0f} {results[False] / results[True]:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DecisionBrain decision quality and latency
+=====================================================
+
+Runs every command of a labelled corpus (benchmarks/intent_corpus.tsv by
+default) through DecisionBrain.make_decision and reports:
+
+- latency of make_decision: p50 / p95 / p99 / max, and throughput
+- top-1 accuracy: the decided intent equals the label ("none" = no intent)
+- clarification rate: share of commands answered with a CLARIFY prompt
+- per-intent accuracy and the misclassified commands
+
+Each command is decided from a clean session (no history, no learning), so
+results do not depend on corpus order. The fallback classifier is loaded
+first, and the first pass warms up the pattern tables and is not timed. The
+decision cache is off unless --cache is given, so latency reflects the
+matching itself.
+
+Results can be saved as JSON and compared with an earlier run:
+
+    python benchmarks/bench_decision_quality.py --output results/after.json
+    python benchmarks/bench_decision_quality.py --baseline results/before.json
+
+With --baseline the exit status is 1 when accuracy drops by more than
+--max-accuracy-drop or p95 latency grows by more than --max-latency-increase,
+so the comparison can gate a change automatically.
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+import platform
+import datetime
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from brains.decision_brain import DecisionBrain  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "intent_corpus.tsv"
+NO_INTENT = "none"
+
+
+def read_corpus(path: Path):
+    """(command, expected intent) pairs from a tab-separated file, skipping blank and comment lines."""
+    corpus = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            command, _, intent = line.rstrip("\n").rpartition("\t")
+            if command and intent:
+                corpus.append((command, intent.strip()))
+    return corpus
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def reset_session(brain: DecisionBrain):
+    with brain._decision_lock:
+        brain.conversation_history.clear()
+        brain.session_context['last_intent'] = None
+
+
+def decided_intent(result) -> str:
+    return result.intent if result is not None and result.intent else NO_INTENT
+
+
+def run(brain: DecisionBrain, corpus, rounds: int):
+    """Decide the corpus `rounds` times; returns (latencies, last round's results)."""
+    for command, _ in corpus:  # Warm-up
+        reset_session(brain)
+        brain.make_decision(command)
+
+    latencies = []
+    results = []
+    for _ in range(rounds):
+        results = []
+        for command, _ in corpus:
+            reset_session(brain)
+            start = time.perf_counter()
+            result = brain.make_decision(command)
+            latencies.append(time.perf_counter() - start)
+            results.append(result)
+    return latencies, results
+
+
+def summarize(corpus, latencies, results, config, args):
+    per_intent = {}
+    misclassified = []
+    correct = clarifications = 0
+    for (command, expected), result in zip(corpus, results):
+        actual = decided_intent(result)
+        stats = per_intent.setdefault(expected, {"count": 0, "correct": 0})
+        stats["count"] += 1
+        if actual == expected:
+            stats["correct"] += 1
+            correct += 1
+        else:
+            misclassified.append({"command": command, "expected": expected, "actual": actual})
+        if result is not None and result.clarification_needed:
+            clarifications += 1
+
+    total_time = sum(latencies)
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "corpus": str(args.corpus),
+        "commands": len(corpus),
+        "rounds": args.rounds,
+        "config": config["decision_brain"],
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": max(latencies) * 1000,
+            "mean": total_time / len(latencies) * 1000,
+        },
+        "throughput_per_second": len(latencies) / total_time if total_time > 0 else 0.0,
+        "accuracy": correct / len(corpus),
+        "clarification_rate": clarifications / len(corpus),
+        "intent_distribution": dict(Counter(decided_intent(result) for result in results).most_common()),
+        "per_intent": {intent: {**stats, "accuracy": stats["correct"] / stats["count"]}
+                       for intent, stats in sorted(per_intent.items())},
+        "misclassified": misclassified,
+    }
+
+
+def print_report(report):
+    latency = report["latency_ms"]
+    print(f"{report['commands']} commands x {report['rounds']} rounds ({report['corpus']})")
+    print(f"latency ms  p50 {latency['p50']:.3f}  p95 {latency['p95']:.3f}  p99 {latency['p99']:.3f}  max {latency['max']:.3f}")
+    print(f"throughput  {report['throughput_per_second']:.0f} decisions/s")
+    print(f"accuracy    {report['accuracy'] * 100:.1f}%")
+    print(f"clarify     {report['clarification_rate'] * 100:.1f}%")
+    print(f"\n{'intent':>16} {'n':>3} {'accuracy':>9}")
+    for intent, stats in report["per_intent"].items():
+        print(f"{intent:>16} {stats['count']:>3} {stats['accuracy'] * 100:>8.0f}%")
+    if report["misclassified"]:
+        print("\nmisclassified:")
+        for miss in report["misclassified"]:
+            print(f"  {miss['command']!r}: expected {miss['expected']}, got {miss['actual']}")
+
+
+def compare(report, baseline, max_accuracy_drop, max_latency_increase) -> bool:
+    """Print the change against a baseline report; True if it is within the allowed regression."""
+    accuracy_delta = report["accuracy"] - baseline["accuracy"]
+    base_p95 = baseline["latency_ms"]["p95"]
+    latency_change = (report["latency_ms"]["p95"] - base_p95) / base_p95 if base_p95 > 0 else 0.0
+    print(f"\nvs baseline {baseline['timestamp']}:")
+    print(f"  accuracy   {accuracy_delta * 100:+.1f} points")
+    print(f"  p95        {latency_change * 100:+.1f}%")
+    print(f"  clarify    {(report['clarification_rate'] - baseline['clarification_rate']) * 100:+.1f} points")
+    regressed = accuracy_delta < -max_accuracy_drop or latency_change > max_latency_increase
+    print("  REGRESSION" if regressed else "  ok")
+    return not regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure DecisionBrain accuracy, clarification rate and latency")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Labelled command file (command<TAB>intent)")
+    parser.add_argument("--rounds", type=int, default=20, help="Timed passes over the corpus")
+    parser.add_argument("--cache", action="store_true", help="Keep the decision cache enabled")
+    parser.add_argument("--no-fallback", action="store_true", help="Disable the n-gram fallback classifier")
+    parser.add_argument("--confidence-threshold", type=float, default=None, help="Override confidence_threshold")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON results to compare against")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.0, help="Allowed accuracy drop vs baseline (fraction)")
+    parser.add_argument("--max-latency-increase", type=float, default=0.25, help="Allowed p95 increase vs baseline (fraction)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    config = {"decision_brain": {
+        "learning_enabled": False,
+        "decision_cache_size": 512 if args.cache else 0,
+        "fallback_classifier_enabled": not args.no_fallback,
+    }}
+    if args.confidence_threshold is not None:
+        config["decision_brain"]["confidence_threshold"] = args.confidence_threshold
+    brain = DecisionBrain(None, config)
+    brain._get_fallback_classifier(wait=True)  # Loaded or trained in the background; score with it ready
+
+    corpus = read_corpus(args.corpus)
+    missing = set(brain.knowledge_base) - {intent for _, intent in corpus}
+    if missing:
+        print(f"warning: corpus has no commands for {', '.join(sorted(missing))}")
+
+    latencies, results = run(brain, corpus, args.rounds)
+    report = summarize(corpus, latencies, results, config, args)
+    print_report(report)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare(report, baseline, args.max_accuracy_drop, args.max_latency_increase):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AutomationBrain search requests with and without connection pooling
+==============================================================================
+
+Starts a local stub HTTP server that answers like the DuckDuckGo instant-answer
+and Wikipedia summary APIs, points an AutomationBrain at it and times repeated
+searches two ways:
+
+- per-request: every search calls requests.get, as the search methods used
+  to, so each one opens (and pays for) a new connection
+- pooled:      searches go through AutomationBrain.http_session, which keeps
+  connections alive per host
+
+The stub delays every new connection by --handshake-ms to stand in for the
+DNS + TCP + TLS setup to a real remote host (a few tens of ms is typical);
+requests on a reused connection skip that cost. The number of connections
+the server accepted is reported alongside the latencies.
+
+Usage:
+    python benchmarks/bench_http_pooling.py
+    python benchmarks/bench_http_pooling.py --searches 200 --handshake-ms 60
+
+AutomationBrain needs the assistant's desktop dependencies (pyautogui,
+pygetwindow, psutil), so run this where ZIA itself runs.
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from brains.automation_brain import AutomationBrain  # noqa: E402
+
+
+class StubSearchHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small instant-answer / page-summary JSON body over keep-alive HTTP/1.1."""
+    protocol_version = "HTTP/1.1"
+    handshake_delay = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubSearchHandler.lock:
+            StubSearchHandler.connections += 1
+        time.sleep(self.handshake_delay)  # Once per connection, like connection setup to a remote host
+
+    def do_GET(self):
+        body = json.dumps({
+            "Abstract": "A stub abstract for benchmarking.", "AbstractSource": "Stub",
+            "title": "Stub", "extract": "A stub page summary for benchmarking.",
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_searches(brain: AutomationBrain, searches: int):
+    """Alternate DuckDuckGo and Wikipedia searches; returns per-search latencies."""
+    latencies = []
+    for i in range(searches):
+        start = time.perf_counter()
+        if i % 2:
+            result = brain._search_wikipedia_enhanced(f"topic {i}")
+        else:
+            result = brain._search_duckduckgo_enhanced(f"topic {i}")
+        latencies.append(time.perf_counter() - start)
+        assert result, "stub search returned nothing"
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-request and pooled HTTP for AutomationBrain searches")
+    parser.add_argument("--searches", type=int, default=100, help="Searches per mode")
+    parser.add_argument("--handshake-ms", type=float, default=30.0, help="Simulated connection setup cost")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    StubSearchHandler.handshake_delay = args.handshake_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSearchHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    brain = AutomationBrain(None, {})
+    brain.logger.setLevel(logging.WARNING)
+    brain.duckduckgo_api_url = f"{base_url}/"
+    brain.wikipedia_summary_url = f"{base_url}/api/rest_v1/page/summary/"
+    pooled_session = brain.http_session
+
+    print(f"{args.searches} searches per mode, {args.handshake_ms:.0f} ms simulated connection setup")
+    print(f"{'mode':>12} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8} {'connections':>12}")
+    try:
+        # The requests module has the same get() signature as a Session, minus the pooling
+        for name, session in (("per-request", requests), ("pooled", pooled_session)):
+            brain.http_session = session
+            StubSearchHandler.connections = 0
+            latencies = time_searches(brain, args.searches)
+            print(f"{name:>12} {percentile(latencies, 0.50) * 1000:>8.2f} {percentile(latencies, 0.95) * 1000:>8.2f} "
+                  f"{sum(latencies) / len(latencies) * 1000:>8.2f} {StubSearchHandler.connections:>12}")
+    finally:
+        brain.http_session = pooled_session
+        brain.shutdown()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DecisionBrain intent matching
+========================================
+
+Compares per-command latency of the original matcher (one re.search per
+pattern string, entities extracted for every matching pattern) with the
+current DecisionBrain._determine_intent_with_confidence (precompiled table
+plus literal prefilter), with and without the decision cache, and checks that
+all of them produce the same IntentMatch ranking for every command. It also
+checks that the shared per-command entity pass extracts exactly what the old
+per-pattern extraction did for every pattern that matches the corpus.
+
+A few intents with inline flags ("(?i)...", "(?i:...)") are added at runtime
+before comparing, so the prefilter is also checked against patterns whose
+literals are not matched verbatim.
+
+Usage:
+    python benchmarks/bench_intent_matching.py
+    python benchmarks/bench_intent_matching.py --rounds 2000
+"""
+
+import re
+import sys
+import time
+import argparse
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from brains.decision_brain import DecisionBrain, IntentMatch  # noqa: E402
+
+
+COMMANDS = [
+    "show me a video about black holes",
+    "play some music by queen",
+    "what is the capital of australia",
+    "open youtube.com",
+    "system status",
+    "check system performance",
+    "buy new running shoes",
+    "i am bored",
+    "tell me about the history of rome",
+    "learn about quantum computing",
+    "send an email to John",
+    "latest news about the election",
+    "open notepad",
+    "schedule appointment with the dentist at 10:30 am",
+    "find file named report.docx",
+    "open facebook",
+    "google for cheap flights to Paris",
+    "remind me to call mom",
+    "how to bake sourdough bread",
+    "something fun to do tonight",
+    "remind me to call Sarah Connor at 5 pm on 12/25/2026",
+    "find restaurants near Central Park",
+    "message Alex in Berlin about the 10-04-2026 meeting",
+    "weather in Paris",
+    "what's the forecast for tomorrow",
+    "set a Timer for ten minutes",
+]
+
+# Runtime intents whose literals are under a case-insensitive flag
+FLAGGED_INTENTS = {
+    "weather": {
+        "high_confidence": [r"(?i)Weather.*in\s+(.+)"],
+        "medium_confidence": [r"(?i:Forecast) for (.+)"],
+    },
+    "timer": {"high_confidence": [r"set a (?i:TIMER) for (.+)"]},
+}
+
+
+def legacy_extract_entities(brain: DecisionBrain, match, command: str):
+    """Entity extraction as it was before the per-command pass (every extractor, per matching pattern)."""
+    entities = {}
+    if match.groups():
+        entities['primary_entity'] = match.group(1).strip()
+
+    for entity_type, patterns in brain.entity_extractors.items():
+        for pattern in patterns:
+            entity_match = re.search(pattern, command, re.IGNORECASE)
+            if entity_match:
+                entities[entity_type] = entity_match.group(1)
+                break
+    return entities
+
+
+def check_entity_extraction(brain: DecisionBrain, commands):
+    """Check the shared per-command entity pass against per-match extraction for every matching pattern."""
+    checked = 0
+    for command in commands:
+        command_lower = command.lower().strip()
+        command_entities = brain._extract_command_entities(command)
+        for compiled in brain.compiled_intent_patterns:
+            match = compiled.regex.search(command_lower)
+            if match:
+                expected = legacy_extract_entities(brain, match, command)
+                assert brain._extract_entities_from_match(match, command) == expected, \
+                    f"entities differ for {command!r} / {compiled.pattern!r}"
+                assert brain._extract_entities_from_match(match, command, command_entities) == expected, \
+                    f"shared entities differ for {command!r} / {compiled.pattern!r}"
+                checked += 1
+    return checked
+
+
+def legacy_determine_intent(brain: DecisionBrain, command: str):
+    """The matcher as it was before patterns were precompiled (kept here as the baseline)."""
+    command_lower = command.lower().strip()
+    intent_matches = []
+
+    for intent, pattern_groups in brain.intent_patterns.items():
+        best_confidence = 0.0
+        best_pattern = ""
+        best_entities = {}
+
+        for confidence_level, base_confidence in [("high_confidence", 0.9), ("medium_confidence", 0.6), ("low_confidence", 0.3)]:
+            if confidence_level not in pattern_groups: continue
+
+            for pattern in pattern_groups[confidence_level]:
+                match = re.search(pattern, command_lower)
+                if match:
+                    pattern_confidence = base_confidence
+                    if match.group(0) == command_lower: pattern_confidence += 0.1
+                    match_ratio = len(match.group(0)) / len(command_lower)
+                    pattern_confidence += match_ratio * 0.1
+
+                    entities = legacy_extract_entities(brain, match, command)
+
+                    if pattern_confidence > best_confidence:
+                        best_confidence = pattern_confidence
+                        best_pattern = pattern
+                        best_entities = entities
+
+        if best_confidence > 0:
+            intent_matches.append(IntentMatch(
+                intent=intent, confidence=min(best_confidence, 1.0),
+                matched_pattern=best_pattern, extracted_entities=best_entities
+            ))
+
+    intent_matches.sort(key=lambda x: x.confidence, reverse=True)
+    return brain._apply_context_boosting(intent_matches, command)
+
+
+def time_per_command(func, commands, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command in commands:
+            func(command)
+    return (time.perf_counter() - start) / (rounds * len(commands))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare intent matcher latency before and after precompilation")
+    parser.add_argument("--rounds", type=int, default=500, help="Passes over the command corpus")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    brain = DecisionBrain(None, {"decision_brain": {"decision_cache_size": 0}})
+    cached_brain = DecisionBrain(None, {})
+    for intent, patterns in FLAGGED_INTENTS.items():
+        brain.add_intent(intent, patterns)
+        cached_brain.add_intent(intent, patterns)
+
+    for _ in range(2):  # The second pass compares cache hits
+        for command in COMMANDS:
+            before = legacy_determine_intent(brain, command)
+            assert before == brain._determine_intent_with_confidence(command), f"ranking differs for {command!r}"
+            assert before == cached_brain._determine_intent_with_confidence(command), f"cached ranking differs for {command!r}"
+    print(f"Rankings identical for all {len(COMMANDS)} commands")
+    print(f"Entities identical for all {check_entity_extraction(brain, COMMANDS)} pattern matches")
+
+    legacy = time_per_command(lambda c: legacy_determine_intent(brain, c), COMMANDS, args.rounds)
+    current = time_per_command(brain._determine_intent_with_confidence, COMMANDS, args.rounds)
+    cached = time_per_command(cached_brain._determine_intent_with_confidence, COMMANDS, args.rounds)
+    print(f"{'matcher':>12} {'us/command':>11} {'speedup':>8}")
+    for name, seconds in (("legacy", legacy), ("current", current), ("cached", cached)):
+        print(f"{name:>12} {seconds * 1e6:>11.1f} {legacy / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
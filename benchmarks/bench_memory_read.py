@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial vs parallel MemoryBrain.read_log
+=================================================
+
+Builds throwaway encrypted memory logs of increasing size and compares the
+throughput of the serial reader with the multi-process reader.
+
+Usage:
+    python benchmarks/bench_memory_read.py
+    python benchmarks/bench_memory_read.py --sizes 10000,100000 --workers 4
+
+Everything is written to a temporary directory; the real ZIA database and
+memory key are never touched.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from brains.memory_brain import MemoryBrain  # noqa: E402
+
+
+class BenchConfig:
+    """Minimal config object for a standalone MemoryBrain."""
+    session_id = "bench_session"
+    version = "bench"
+    memory_brain = {"flush_size": 1000, "max_queue_size": 100000, "parallel_read_min_bytes": 0}
+
+
+def build_log(entries: int) -> MemoryBrain:
+    """Create a MemoryBrain in the current directory and fill it with `entries` actions."""
+    memory = MemoryBrain(None, BenchConfig())
+    for i in range(entries - 1):  # INITIALIZED counts as the first entry
+        memory.log_action("BENCH_BRAIN", "SYNTHETIC_ACTION", {
+            "command": f"synthetic command number {i}",
+            "success": i % 7 != 0,
+            "execution_time": (i % 100) / 1000.0,
+        })
+    memory.flush()
+    return memory
+
+
+def time_call(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare serial and parallel memory log reads")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated entry counts")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    original_cwd = os.getcwd()
+
+    print(f"CPU cores: {os.cpu_count()}, workers: {args.workers or os.cpu_count()}")
+    print(f"{'entries':>10} {'log MB':>8} {'serial s':>9} {'parallel s':>11} {'serial/s':>10} {'parallel/s':>11} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        workdir = tempfile.mkdtemp(prefix="zia_bench_")
+        try:
+            os.chdir(workdir)
+            memory = build_log(size)
+            log_mb = memory.get_log_stats()["file_size_bytes"] / (1024 * 1024)
+
+            serial, serial_time = time_call(memory.read_log)
+            parallel, parallel_time = time_call(memory.read_log, parallel=True, workers=args.workers)
+            assert serial == parallel, "parallel read returned different entries"
+
+            print(f"{len(serial):>10} {log_mb:>8.1f} {serial_time:>9.2f} {parallel_time:>11.2f} "
+                  f"{len(serial) / serial_time:>10.0f} {len(parallel) / parallel_time:>11.0f} "
+                  f"{serial_time / parallel_time:>7.2f}x")
+            memory.close()
+            # Drop the brain while still inside its directory - its __del__ logs a SHUTDOWN entry
+            del memory
+        finally:
+            os.chdir(original_cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
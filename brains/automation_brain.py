@@ -20,17 +20,22 @@ import pygetwindow as gw
 import re
 import urllib.parse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import sqlite3
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple, Union
+from typing import Dict, Any, List, Optional, Tuple, Union, Callable, FrozenSet, Iterable
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import sys
 import shutil
 from dataclasses import dataclass
 from contextlib import contextmanager
+from collections import OrderedDict, deque
 
 @dataclass
 class CommandResult:
@@ -41,6 +46,315 @@ class CommandResult:
     execution_time: float = 0.0
     category: str = "general"
 
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and entry/byte limits.
+    
+    Entries expire `ttl` seconds after they were stored. Lookups never return an
+    expired entry, and a daemon thread sweeps expired entries every
+    `expiry_interval` seconds so idle entries do not accumulate. When adding an
+    entry exceeds `max_entries` or `max_bytes` (approximate payload size), least
+    recently used entries are evicted. Hits, misses, evictions and expirations
+    are counted for get_performance_stats().
+    """
+    
+    def __init__(self, name: str, ttl: float = 300, max_entries: int = 256, max_bytes: int = 1048576,
+                 expiry_interval: Optional[float] = 60, logger: Optional[logging.Logger] = None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self._entries: "OrderedDict[Any, Tuple[Any, float, int]]" = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.metrics = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        
+        self._stop_event = threading.Event()
+        self._expiry_thread = None
+        if expiry_interval:
+            self._expiry_thread = threading.Thread(
+                target=self._expiry_loop, args=(expiry_interval,), name=f"zia-cache-{name}", daemon=True
+            )
+            self._expiry_thread.start()
+    
+    @classmethod
+    def approximate_size(cls, value: Any) -> int:
+        """Rough payload size in bytes: text and bytes by length, containers by their contents."""
+        if isinstance(value, str): return len(value.encode('utf-8', errors='replace'))
+        if isinstance(value, (bytes, bytearray)): return len(value)
+        if isinstance(value, dict): return sum(cls.approximate_size(k) + cls.approximate_size(v) for k, v in value.items())
+        if isinstance(value, (list, tuple, set)): return sum(cls.approximate_size(item) for item in value)
+        return sys.getsizeof(value)
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Return the live value for `key` (marking it recently used), or `default`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics['misses'] += 1
+                return default
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                self.metrics['expirations'] += 1
+                self.metrics['misses'] += 1
+                return default
+            self._entries.move_to_end(key)
+            self.metrics['hits'] += 1
+            return entry[0]
+    
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        """Store `value`, evicting least recently used entries to stay within the limits."""
+        size = self.approximate_size(key) + self.approximate_size(value)
+        if size > self.max_bytes:
+            self.logger.debug(f"Cache '{self.name}': {size}-byte entry exceeds max_bytes, not cached")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl), size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.metrics['evictions'] += 1
+    
+    def pop(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries: return default
+            value = self._entries[key][0]
+            self._remove(key)
+            return value
+    
+    def _remove(self, key: Any):
+        """Drop an entry (caller holds the lock)."""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    def purge_expired(self) -> int:
+        """Remove every expired entry; returns how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self.metrics['expirations'] += len(expired)
+        return len(expired)
+    
+    def _expiry_loop(self, interval: float):
+        while not self._stop_event.wait(interval):
+            try:
+                self.purge_expired()
+            except Exception as e:
+                self.logger.error(f"Cache '{self.name}' expiry error: {e}")
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def close(self):
+        """Stop the background expiry thread."""
+        self._stop_event.set()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > time.monotonic()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Current size, limits and hit/miss/eviction/expiration counters."""
+        with self._lock:
+            lookups = self.metrics['hits'] + self.metrics['misses']
+            return {
+                **self.metrics,
+                'hit_rate_percent': round(self.metrics['hits'] / lookups * 100, 1) if lookups else 0.0,
+                'entries': len(self._entries), 'bytes': self._bytes,
+                'max_entries': self.max_entries, 'max_bytes': self.max_bytes, 'ttl': self.ttl
+            }
+
+class PersistentSearchCache:
+    """
+    Size-bounded on-disk cache of search summaries (SQLite), surviving restarts.
+    
+    Entries are keyed by normalized query and context. An entry is fresh for `ttl`
+    seconds and then stale for another `stale_ttl` seconds: lookups still return a
+    stale summary (flagged as such) so the caller can answer at once and refresh
+    it in the background (stale-while-revalidate). After that it is deleted.
+    When the cache exceeds `max_entries` or `max_bytes`, the least recently used
+    entries are dropped.
+    """
+    
+    def __init__(self, path: Path, ttl: float = 86400, stale_ttl: float = 604800, max_entries: int = 5000,
+                 max_bytes: int = 20971520, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self.metrics = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            " key TEXT PRIMARY KEY, query TEXT NOT NULL, context TEXT NOT NULL, summary TEXT NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS search_cache_accessed ON search_cache (accessed)")
+        self._connection.commit()
+    
+    @staticmethod
+    def make_key(query: str, context: str) -> str:
+        """Case and whitespace differences do not make a different question."""
+        return f"{context}|{' '.join(query.lower().split())}"
+    
+    def get(self, query: str, context: str) -> Optional[Tuple[str, bool]]:
+        """
+        Look up a summary.
+        
+        Returns:
+            (summary, is_stale), or None when there is no usable entry
+        """
+        key = self.make_key(query, context)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT summary, created FROM search_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.metrics['misses'] += 1
+                return None
+            summary, created = row
+            age = now - created
+            if age >= self.ttl + self.stale_ttl:
+                self._connection.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._connection.commit()
+                self.metrics['misses'] += 1
+                return None
+            self._connection.execute("UPDATE search_cache SET accessed = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            is_stale = age >= self.ttl
+            self.metrics['stale_hits' if is_stale else 'hits'] += 1
+            return summary, is_stale
+    
+    def put(self, query: str, context: str, summary: str):
+        """Store a fresh summary, then trim the cache back within its limits."""
+        now = time.time()
+        size = len(summary.encode('utf-8', errors='replace'))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO search_cache (key, query, context, summary, created, accessed, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(query, context), query, context, summary, now, now, size)
+            )
+            entries, total_bytes = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache").fetchone()
+            if entries > self.max_entries or total_bytes > self.max_bytes:
+                self._evict(entries, total_bytes)
+            self._connection.commit()
+    
+    def _evict(self, entries: int, total_bytes: int):
+        """Drop least recently used entries until within both limits (caller holds the lock)."""
+        evicted = []
+        for key, size in self._connection.execute("SELECT key, size FROM search_cache ORDER BY accessed"):
+            if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            entries -= 1
+            total_bytes -= size
+        self._connection.executemany("DELETE FROM search_cache WHERE key = ?", evicted)
+        self.metrics['evictions'] += len(evicted)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total_bytes = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache").fetchone()
+            return {**self.metrics, 'entries': entries, 'bytes': total_bytes, 'max_entries': self.max_entries,
+                    'max_bytes': self.max_bytes, 'ttl': self.ttl, 'stale_ttl': self.stale_ttl}
+    
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of phrases.
+    
+    Built once, it finds every phrase occurring anywhere in a text in a single
+    left-to-right pass whose cost does not grow with the number of phrases. The
+    result is the same as testing `phrase in text` for each phrase.
+    """
+    
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = tuple(dict.fromkeys(phrase for phrase in phrases if phrase))
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for phrase in self.phrases:
+            node = 0
+            for char in phrase:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    outputs.append(())
+                node = next_node
+            outputs[node] = (phrase,)
+        
+        # Failure links (longest proper suffix that is also a trie path), breadth first
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                fallback = fail[node]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(char, 0) if node else 0
+                outputs[child] += outputs[fail[child]]
+        
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+    
+    def scan(self, text: str) -> Dict[str, int]:
+        """
+        Find all phrases in `text`.
+        
+        Returns:
+            phrase -> index of its first occurrence, for every phrase that occurs
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = {}
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for phrase in outputs[node]:
+                if phrase not in found:
+                    found[phrase] = index - len(phrase) + 1
+        return found
+
+@dataclass(frozen=True)
+class CommandRoute:
+    """
+    One dispatch rule of the command pipeline.
+    
+    The route applies when every group in `requires` has at least one phrase in
+    the command and, if `prefix` is set, the command starts with it. Of the
+    applicable routes of one handler only the first (in priority order) is tried.
+    """
+    handler: str
+    name: str
+    requires: Tuple[FrozenSet[str], ...]
+    action: Callable[[str, str], Optional[Union[str, CommandResult]]]
+    prefix: Optional[str] = None
+
 class AutomationBrain:
     """
     Enhanced AI automation brain for ZIA-X with advanced memory system.
@@ -68,10 +382,14 @@ class AutomationBrain:
         
         # Enhanced search and memory triggers
         self._setup_command_patterns()
+        self._setup_command_routes()
         
         # Enhanced search headers with rotation
         self._setup_search_headers()
         
+        # Pooled keep-alive HTTP session for search APIs
+        self._setup_http_session()
+        
         # Task automation patterns
         self._setup_automation_patterns()
         
@@ -140,6 +458,10 @@ class AutomationBrain:
             # Reference
             "wikipedia": "wikipedia.org", "wolframalpha": "wolframalpha.com"
         }
+        
+        # Search API endpoints
+        self.duckduckgo_api_url = "https://api.duckduckgo.com/"
+        self.wikipedia_summary_url = "https://en.wikipedia.org/api/rest_v1/page/summary/"
 
     def _setup_command_patterns(self):
         """Setup enhanced command patterns and triggers."""
@@ -155,7 +477,125 @@ class AutomationBrain:
             "memorize this", "add to memory", "keep track of", "log this", "note this", "record this", "save this info"
         ]
         
+        # Subset of memory_triggers that asks for something back rather than storing it (longest first)
+        self.memory_recall_triggers = [
+            "what do you remember about", "tell me what you know about", "what did we discuss about",
+            "do you remember when", "recall"
+        ]
+        self.memory_time_windows = {
+            "today": 0, "yesterday": 1, "this week": 7, "last week": 14, "this month": 31, "last month": 62
+        }
+        
         self.web_triggers = [ "open", "go to", "visit", "navigate to", "browse to", "load", "access", "show me", "take me to" ]
+        
+        # Words _analyze_command_context looks for
+        self.urgency_words = ["urgent", "quickly", "now", "immediately", "asap", "fast", "hurry"]
+        self.complexity_words = ["and", "then", "after", "before"]
+        self.window_words = ["window", "tab", "minimize", "maximize"]
+
+    def _setup_command_routes(self):
+        """
+        Build the command dispatch table and the phrase matcher over all its triggers.
+        
+        Routes are listed in priority order: memory, search, web browsing,
+        multimedia, system, file, window, input control, status. A command is
+        scanned once for every phrase of every route, and only the routes whose
+        phrases occurred are tried.
+        """
+        def route(handler, phrases, action, *also_requires, prefix=False):
+            phrases = (phrases,) if isinstance(phrases, str) else phrases
+            requires = (frozenset(phrases),) + tuple(
+                frozenset((group,) if isinstance(group, str) else group) for group in also_requires)
+            return CommandRoute(handler, phrases[0], requires, action, phrases[0] if prefix else None)
+        
+        routes = [
+            route("memory", self.memory_triggers, lambda command, command_lower: self._handle_memory_command(command)),
+            route("search", self.search_triggers, lambda command, command_lower: self._search_web_enhanced(
+                self._extract_search_query(command), self._determine_search_context(command))),
+            route("web", self.web_triggers, lambda command, command_lower: self._handle_web_browsing(command_lower),
+                  self.web_domains + list(self.common_websites)),
+            
+            route("multimedia", "show me", lambda command, command_lower: self._search_youtube_enhanced(
+                self._extract_video_query(command_lower)), "video")
+        ]
+        video_controls = {
+            "play video": ("space", "Video playback started"), "pause video": ("space", "Video paused"),
+            "skip forward": ("right", "Skipped forward 10 seconds"), "skip backward": ("left", "Skipped backward 10 seconds"),
+            "fullscreen": ("f", "Entered fullscreen mode"), "exit fullscreen": ("escape", "Exited fullscreen mode"),
+            "mute video": ("m", "Video muted"), "unmute video": ("m", "Video unmuted")
+        }
+        for control_phrase, (key, message) in video_controls.items():
+            routes.append(route("multimedia", control_phrase,
+                                lambda command, command_lower, key=key, message=message: self._press_media_key(key, message)))
+        routes += [
+            route("multimedia", "volume up", lambda command, command_lower: self._volume_control("up")),
+            route("multimedia", "volume down", lambda command, command_lower: self._volume_control("down"))
+        ]
+        
+        system_commands = {
+            "system status": self._get_system_status_enhanced, "system info": self._get_system_info_enhanced,
+            "time": self._get_current_time_enhanced, "date": self._get_current_date_enhanced,
+            "performance stats": self._get_performance_report, "task manager": self._open_task_manager,
+            "control panel": self._open_control_panel, "lock screen": self._lock_screen,
+            "sleep mode": self._sleep_system, "restart computer": self._restart_system,
+            "shutdown computer": self._shutdown_system
+        }
+        routes += [route("system", sys_cmd, lambda command, command_lower, action=action: action())
+                   for sys_cmd, action in system_commands.items()]
+        
+        routes += [
+            route("file", "create file", lambda command, command_lower: self._create_file_enhanced(
+                command_lower.replace("create file", "").strip()), prefix=True),
+            route("file", "delete file", lambda command, command_lower: self._delete_file_enhanced(
+                command_lower.replace("delete file", "").strip()), prefix=True),
+            route("file", "copy file", lambda command, command_lower: self._copy_file_enhanced(command_lower), prefix=True),
+            route("file", "move file", lambda command, command_lower: self._move_file_enhanced(command_lower), prefix=True),
+            route("file", "rename file", lambda command, command_lower: self._rename_file_enhanced(command_lower), prefix=True),
+            route("file", "organize files", lambda command, command_lower: self._organize_files_enhanced()),
+            route("file", "clean desktop", lambda command, command_lower: self._clean_desktop_enhanced())
+        ]
+        
+        window_commands = {
+            "minimize window": self._minimize_current_window, "maximize window": self._maximize_current_window,
+            "close window": self._close_current_window, "new window": self._new_window,
+            "new tab": self._new_tab, "close tab": self._close_tab,
+            "switch window": self._switch_window, "list windows": self._list_windows
+        }
+        routes += [route("window", window_cmd, lambda command, command_lower, action=action: action())
+                   for window_cmd, action in window_commands.items()]
+        
+        routes += [
+            route("input", "move mouse to", lambda command, command_lower: self._move_mouse_command(command_lower), prefix=True),
+            route("input", "left click", lambda command, command_lower: self._click_mouse_enhanced("left")),
+            route("input", "right click", lambda command, command_lower: self._click_mouse_enhanced("right")),
+            route("input", "double click", lambda command, command_lower: self._double_click_enhanced()),
+            route("input", "copy", lambda command, command_lower: self._copy_text(), "text"),
+            route("input", "paste", lambda command, command_lower: self._paste_text(), "text"),
+            route("input", "type", lambda command, command_lower: self._type_text_command(command_lower), prefix=True),
+            
+            route("status", ("performance stats", "stats"), lambda command, command_lower: self._format_performance_stats()),
+            route("status", ("version", "about"), lambda command, command_lower: self._get_version_info()),
+            route("status", "help", lambda command, command_lower: self._get_help_info())
+        ]
+        self.command_routes = tuple(routes)
+        
+        # Routes indexed by the phrases of their first requirement, which every route has
+        self._routes_by_phrase: Dict[str, List[int]] = {}
+        for index, command_route in enumerate(self.command_routes):
+            for phrase in command_route.requires[0]:
+                self._routes_by_phrase.setdefault(phrase, []).append(index)
+        
+        route_phrases = [phrase for command_route in self.command_routes for group in command_route.requires for phrase in group]
+        self.command_matcher = PhraseMatcher(
+            route_phrases + self.urgency_words + self.complexity_words + ["file"] + self.window_words)
+        
+        # Handlers that count their commands, and the error replies of those that catch failures
+        self.route_counters = {"system": "system_operations", "file": "file_operations"}
+        self.route_error_labels = {
+            "multimedia": ("Multimedia command", "multimedia command"), "system": ("System automation", "system command"),
+            "file": ("File operation", "file operation"), "window": ("Window management", "window command"),
+            "input": ("Input control", "input command")
+        }
 
     def _setup_search_headers(self):
         """Setup rotating search headers for better success rate."""
@@ -171,6 +611,50 @@ class AutomationBrain:
         self.current_header_index = (self.current_header_index + 1) % len(self.search_headers_pool)
         return headers
 
+    def _setup_http_session(self):
+        """
+        Setup the shared HTTP session used for all search requests.
+        
+        The adapter keeps a pool of keep-alive connections per host, so repeated
+        searches reuse an open TCP/TLS connection instead of paying DNS, TCP and TLS
+        setup on every request. Idempotent requests that fail to connect or get a
+        429/5xx answer are retried with exponential backoff (honouring Retry-After).
+        """
+        automation_config = self.config.get('automation_brain', {})
+        self.http_timeout = (
+            automation_config.get('http_connect_timeout', 3.05),
+            automation_config.get('http_read_timeout', 10)
+        )
+        retry = Retry(
+            total=automation_config.get('http_max_retries', 2),
+            backoff_factor=automation_config.get('http_backoff_factor', 0.3),
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=automation_config.get('http_pool_connections', 10),
+            pool_maxsize=automation_config.get('http_pool_maxsize', 10),
+            max_retries=retry
+        )
+        self.http_session = requests.Session()
+        self.http_session.mount("https://", adapter)
+        self.http_session.mount("http://", adapter)
+        
+        # Concurrent summary lookups: all relevant sources at once, bounded by the CNS command timeout
+        self.concurrent_search = automation_config.get('concurrent_search', True)
+        self.search_budget = self.config.get('cns', {}).get('command_timeout', 30)
+        self._search_executor = ThreadPoolExecutor(
+            max_workers=automation_config.get('search_workers', 4), thread_name_prefix="zia-search"
+        )
+
+    def _http_get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the pooled session with rotating headers and the configured (connect, read) timeout."""
+        kwargs.setdefault('headers', self._get_next_headers())
+        kwargs.setdefault('timeout', self.http_timeout)
+        return self.http_session.get(url, **kwargs)
+
     def _setup_automation_patterns(self):
         """Setup comprehensive automation patterns."""
         self.automation_patterns = {
@@ -208,8 +692,41 @@ class AutomationBrain:
 
     def _setup_caching(self):
         """Setup intelligent caching system."""
-        self.cache = { 'search_results': {}, 'website_status': {}, 'system_info': {}, 'file_paths': {} }
-        self.cache_ttl = 300  # 5 minutes TTL
+        automation_config = self.config.get('automation_brain', {})
+        self.cache_ttl = automation_config.get('cache_ttl', 300)  # 5 minutes TTL
+        max_entries = automation_config.get('cache_max_entries', 256)
+        max_bytes = automation_config.get('cache_max_bytes', 1048576)
+        expiry_interval = automation_config.get('cache_expiry_interval', 60)
+        self.cache = {
+            'search_results': TTLCache('search_results', self.cache_ttl, max_entries, max_bytes, expiry_interval, self.logger),
+            # Security verdicts per domain; short-lived so blocklist changes apply quickly
+            'website_status': TTLCache('website_status', automation_config.get('website_status_cache_ttl', 60),
+                                       max_entries, max_bytes, expiry_interval, self.logger),
+            # Static platform details barely change during a session
+            'system_info': TTLCache('system_info', automation_config.get('system_info_cache_ttl', 3600),
+                                    16, max_bytes, expiry_interval, self.logger)
+        }
+        
+        # Search summaries on disk, so common questions answer instantly after a restart
+        self.search_store = None
+        self._revalidating = set()
+        # Stale-entry refreshes get their own threads: they fan out into _search_executor
+        # and wait on it, which would deadlock if they ran on that pool themselves
+        self._revalidation_executor = ThreadPoolExecutor(
+            max_workers=automation_config.get('search_revalidation_workers', 2), thread_name_prefix="zia-revalidate"
+        )
+        if automation_config.get('search_cache_enabled', True):
+            try:
+                self.search_store = PersistentSearchCache(
+                    Path(automation_config.get('search_cache_path', self.cache_dir / "search_cache.sqlite3")),
+                    ttl=automation_config.get('search_cache_ttl', 86400),
+                    stale_ttl=automation_config.get('search_cache_stale_ttl', 604800),
+                    max_entries=automation_config.get('search_cache_max_entries', 5000),
+                    max_bytes=automation_config.get('search_cache_max_bytes', 20971520),
+                    logger=self.logger
+                )
+            except Exception as e:
+                self.logger.warning(f"Persistent search cache unavailable: {e}")
     @contextmanager
     def _performance_timer(self, operation: str):
         """Context manager for performance timing."""
@@ -241,13 +758,14 @@ class AutomationBrain:
 
         with self._performance_timer("command_execution"):
             try:
+                matches = self.command_matcher.scan(command_lower)
                 if self.memory_enabled:
                     self.memory_brain.log_action("AUTOMATION_BRAIN", "COMMAND_RECEIVED_V1.5", {
                         "command": command, "timestamp": datetime.datetime.now().isoformat(),
                         "source": "Boss", "command_id": self.command_stats['total_commands'],
-                        "context": self._analyze_command_context(command)
+                        "context": self._analyze_command_context(command, matches)
                     })
-                result = self._process_command_pipeline(command, command_lower)
+                result = self._process_command_pipeline(command, command_lower, matches)
                 if result:
                     self.command_stats['successful_commands'] += 1
                     self._log_command_success(command, result)
@@ -264,57 +782,65 @@ class AutomationBrain:
                     })
                 return f"Boss, I encountered an error: {type(e).__name__}. Let me try a different approach or check the logs for details."
 
-    def _process_command_pipeline(self, command: str, command_lower: str) -> Optional[Union[str, CommandResult]]:
-        """Process command through enhanced pipeline."""
-        if self._is_memory_command(command): return self._handle_memory_command(command)
-        if self._is_search_command(command):
-            search_query = self._extract_search_query(command)
-            search_context = self._determine_search_context(command)
-            return self._search_web_enhanced(search_query, search_context)
-        if self._is_web_browsing_command(command_lower): return self._handle_web_browsing(command_lower)
-        
-        multimedia_result = self._handle_multimedia_commands(command_lower)
-        if multimedia_result: return multimedia_result
-        
-        system_result = self._handle_system_automation(command_lower)
-        if system_result: return system_result
-        
-        file_result = self._handle_file_operations(command_lower)
-        if file_result: return file_result
+    def _process_command_pipeline(self, command: str, command_lower: str,
+                                  matches: Optional[Dict[str, int]] = None) -> Optional[Union[str, CommandResult]]:
+        """
+        Dispatch a command to the first handler that produces a result.
         
-        window_result = self._handle_window_management(command_lower)
-        if window_result: return window_result
-        
-        control_result = self._handle_input_control(command_lower)
-        if control_result: return control_result
-        
-        status_result = self._handle_status_commands(command_lower)
-        if status_result: return status_result
-        
-        automation_result = self._handle_advanced_automation(command_lower)
-        if automation_result: return automation_result
+        Args:
+            command: The command as given
+            command_lower: Lower-cased, stripped command
+            matches: Result of command_matcher.scan(command_lower), if already computed
+        """
+        for command_route in self._match_command_routes(command_lower, matches):
+            result = self._run_command_route(command_route, command, command_lower)
+            if result: return result
+        return self._handle_advanced_automation(command_lower)
+
+    def _match_command_routes(self, command_lower: str, matches: Optional[Dict[str, int]] = None) -> List[CommandRoute]:
+        """Applicable routes for a command in priority order, at most one per handler."""
+        if matches is None:
+            matches = self.command_matcher.scan(command_lower)
+        candidates = sorted({index for phrase in matches for index in self._routes_by_phrase.get(phrase, ())})
         
-        return None
-    def _analyze_command_context(self, command: str) -> Dict[str, Any]:
+        selected = []
+        decided = set()
+        for index in candidates:
+            command_route = self.command_routes[index]
+            if command_route.handler in decided:
+                continue
+            if command_route.prefix is not None and matches.get(command_route.prefix) != 0:
+                continue
+            if all(not group.isdisjoint(matches) for group in command_route.requires[1:]):
+                selected.append(command_route)
+                decided.add(command_route.handler)
+        return selected
+
+    def _run_command_route(self, command_route: CommandRoute, command: str, command_lower: str) -> Optional[Union[str, CommandResult]]:
+        """Run a route's action, turning failures of the guarded handlers into a reply."""
+        counter = self.route_counters.get(command_route.handler)
+        if counter: self.command_stats[counter] += 1
+        try:
+            return command_route.action(command, command_lower)
+        except Exception as e:
+            if command_route.handler not in self.route_error_labels: raise
+            log_label, reply_label = self.route_error_labels[command_route.handler]
+            self.logger.error(f"{log_label} error: {e}")
+            return f"Boss, I had trouble with that {reply_label}: {str(e)}"
+
+    def _analyze_command_context(self, command: str, matches: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
         """Analyze command context for better processing."""
-        context = { "length": len(command), "word_count": len(command.split()), "has_question": "?" in command, "urgency_indicators": [], "category": "general", "complexity": "simple" }
-        urgent_words = ["urgent", "quickly", "now", "immediately", "asap", "fast", "hurry"]
-        for word in urgent_words:
-            if word in command.lower(): context["urgency_indicators"].append(word)
-        if len(command.split()) > 10 or any(word in command.lower() for word in ["and", "then", "after", "before"]): context["complexity"] = "complex"
-        if any(trigger in command.lower() for trigger in self.search_triggers): context["category"] = "search"
-        elif any(trigger in command.lower() for trigger in self.memory_triggers): context["category"] = "memory"
-        elif any(trigger in command.lower() for trigger in self.web_triggers): context["category"] = "web_browsing"
-        elif "file" in command.lower(): context["category"] = "file_operations"
-        elif any(word in command.lower() for word in ["window", "tab", "minimize", "maximize"]): context["category"] = "window_management"
+        if matches is None:
+            matches = self.command_matcher.scan(command.lower())
+        context = { "length": len(command), "word_count": len(command.split()), "has_question": "?" in command, "urgency_indicators": [word for word in self.urgency_words if word in matches], "category": "general", "complexity": "simple" }
+        if len(command.split()) > 10 or any(word in matches for word in self.complexity_words): context["complexity"] = "complex"
+        if any(trigger in matches for trigger in self.search_triggers): context["category"] = "search"
+        elif any(trigger in matches for trigger in self.memory_triggers): context["category"] = "memory"
+        elif any(trigger in matches for trigger in self.web_triggers): context["category"] = "web_browsing"
+        elif "file" in matches: context["category"] = "file_operations"
+        elif any(word in matches for word in self.window_words): context["category"] = "window_management"
         return context
 
-    def _is_web_browsing_command(self, command: str) -> bool:
-        """Check if command is for web browsing."""
-        has_web_trigger = any(trigger in command for trigger in self.web_triggers)
-        has_domain = any(domain in command for domain in self.web_domains) or any(site in command for site in self.common_websites)
-        return has_web_trigger and has_domain
-
     def _handle_web_browsing(self, command: str) -> str:
         """Handle enhanced web browsing commands."""
         try:
@@ -330,11 +856,9 @@ class AutomationBrain:
                 if not any(domain in target for domain in self.web_domains): target += ".com"
                 url = f"https://{target}"
             
-            if hasattr(self.cns, 'security_brain') and self.cns.security_brain is not None:
-                domain = urlparse(url).netloc
-                security_response = self.cns.security_brain.check_website_access(domain)
-                if security_response != "ALLOWED":
-                    return f"Boss, access to {domain} is restricted by security protocols."
+            domain = urlparse(url).netloc
+            if self._check_website_access(domain) != "ALLOWED":
+                return f"Boss, access to {domain} is restricted by security protocols."
             
             webbrowser.open(url)
             if self.memory_enabled:
@@ -344,6 +868,22 @@ class AutomationBrain:
             self.logger.error(f"Web browsing error: {e}")
             return f"Boss, I had trouble opening that website: {str(e)}"
 
+    def _check_website_access(self, domain: str) -> str:
+        """
+        Security verdict for a domain, "ALLOWED" when no SecurityBrain is connected.
+        
+        Definitive verdicts (ALLOWED / DENIED) are cached per domain for a short time;
+        prompts asking the Boss for permission are never cached.
+        """
+        if not hasattr(self.cns, 'security_brain') or self.cns.security_brain is None:
+            return "ALLOWED"
+        verdict = self.cache['website_status'].get(domain)
+        if verdict is None:
+            verdict = self.cns.security_brain.check_website_access(domain)
+            if verdict in ("ALLOWED", "DENIED"):
+                self.cache['website_status'].set(domain, verdict)
+        return verdict
+
     def _extract_web_target(self, command: str) -> Optional[str]:
         """Extract website target from command."""
         for trigger in self.web_triggers:
@@ -370,20 +910,29 @@ class AutomationBrain:
             
             self.logger.info(f"Enhanced search with context '{context}': {cleaned_query}")
             
-            cache_key = f"{cleaned_query}_{context}"
-            if cache_key in self.cache['search_results']:
-                cached_result = self.cache['search_results'][cache_key]
-                if time.time() - cached_result['timestamp'] < self.cache_ttl:
-                    return f"Boss, here's what I found (cached): {cached_result['result']}"
+            cache_key = PersistentSearchCache.make_key(cleaned_query, context)
+            cached_summary = self.cache['search_results'].get(cache_key)
+            if cached_summary is not None:
+                return f"Boss, here's what I found (cached): {cached_summary}"
             
-            if hasattr(self.cns, 'security_brain') and self.cns.security_brain is not None:
-                security_response = self.cns.security_brain.check_website_access("google.com")
-                if security_response != "ALLOWED": return "Boss, web search is currently restricted by security protocols."
+            stored = self.search_store.get(cleaned_query, context) if self.search_store else None
+            if stored is not None:
+                stored_summary, is_stale = stored
+                if not is_stale:
+                    self.cache['search_results'].set(cache_key, stored_summary)
+                    return f"Boss, here's what I found (cached): {stored_summary}"
+                # Answer now from the stale copy and refresh it in the background
+                self._revalidate_search(cleaned_query, context)
+                return f"Boss, here's what I found earlier (may be out of date, refreshing): {stored_summary}"
+            
+            if self._check_website_access("google.com") != "ALLOWED":
+                return "Boss, web search is currently restricted by security protocols."
             
             summary = self._get_enhanced_web_summary(cleaned_query, context)
             
             if summary:
-                self.cache['search_results'][cache_key] = {'result': summary, 'timestamp': time.time()}
+                self.cache['search_results'].set(cache_key, summary)
+                if self.search_store: self.search_store.put(cleaned_query, context, summary)
                 response = f"Boss, here's what I found about '{cleaned_query}':\n\n{summary}"
                 if context == "how_to": response += "\n\n💡 Would you like me to search for video tutorials on this topic?"
                 elif context == "definition": response += "\n\n💡 Need more detailed information? I can search for related topics."
@@ -401,28 +950,92 @@ class AutomationBrain:
             self.logger.error(f"Enhanced web search error: {str(e)}")
             return f"Boss, I encountered a technical issue while searching for '{query}'. Let me try opening a browser search instead."
 
+    def _revalidate_search(self, query: str, context: str):
+        """Fetch a fresh summary for a stale cached search in the background (once per key at a time)."""
+        cache_key = PersistentSearchCache.make_key(query, context)
+        if cache_key in self._revalidating:
+            return
+        self._revalidating.add(cache_key)
+        
+        def refresh():
+            try:
+                if self._check_website_access("google.com") != "ALLOWED":
+                    return
+                summary = self._get_enhanced_web_summary(query, context)
+                if summary:
+                    self.cache['search_results'].set(cache_key, summary)
+                    self.search_store.put(query, context, summary)
+                    self.logger.info(f"Refreshed stale search result: {query}")
+            except Exception as e:
+                self.logger.error(f"Search revalidation error: {e}")
+            finally:
+                self._revalidating.discard(cache_key)
+        
+        try:
+            self._revalidation_executor.submit(refresh)
+        except RuntimeError:  # Executor already shut down
+            self._revalidating.discard(cache_key)
+
     def _get_enhanced_web_summary(self, query: str, context: str = "general") -> Optional[str]:
         """Enhanced web content summarization with multiple sources."""
         try:
-            summary = self._search_duckduckgo_enhanced(query)
-            if summary: return summary
+            sources = [("DuckDuckGo", self._search_duckduckgo_enhanced)]
             if context in ["definition", "general", "factual", "person"]:
-                wiki_summary = self._search_wikipedia_enhanced(query)
-                if wiki_summary: return wiki_summary
+                sources.append(("Wikipedia", self._search_wikipedia_enhanced))
             if context == "how_to":
-                howto_summary = self._search_howto_enhanced(query)
-                if howto_summary: return howto_summary
+                sources.append(("How-to", self._search_howto_enhanced))
+            
+            if self.concurrent_search and len(sources) > 1:
+                return self._first_summary_concurrently(query, sources)
+            for _, search in sources:
+                summary = search(query)
+                if summary: return summary
             return None
         except Exception as e:
             self.logger.error(f"Enhanced summary generation error: {str(e)}")
             return None
 
+    def _first_summary_concurrently(self, query: str, sources: List[Tuple[str, Any]]) -> Optional[str]:
+        """
+        Query all sources in parallel and return the first acceptable summary in priority order.
+        
+        A lower-priority answer is only used once every source before it has come back
+        empty, so the result matches the sequential lookup. The whole lookup is bounded
+        by search_budget (cns.command_timeout): when it runs out, the best answer that
+        has already arrived is used. Sources that are no longer needed are cancelled if
+        they have not started; running requests end on their own timeout and are ignored.
+        """
+        deadline = time.monotonic() + self.search_budget
+        futures = [(name, self._search_executor.submit(search, query)) for name, search in sources]
+        try:
+            for name, future in futures:
+                remaining = deadline - time.monotonic()
+                try:
+                    summary = future.result(timeout=max(0.0, remaining))
+                except FutureTimeoutError:
+                    self.logger.warning(f"Search budget of {self.search_budget}s ran out waiting for {name}: {query}")
+                    break
+                except Exception as e:
+                    self.logger.error(f"{name} search error: {e}")
+                    continue
+                if summary: return summary
+            else:
+                return None
+            
+            # Out of time - settle for the best answer that is already in
+            for name, future in futures:
+                if future.done() and not future.cancelled() and future.exception() is None and future.result():
+                    return future.result()
+            return None
+        finally:
+            for _, future in futures:
+                future.cancel()
+
     def _search_duckduckgo_enhanced(self, query: str) -> Optional[str]:
         """Enhanced DuckDuckGo search with better result parsing."""
         try:
-            duckduckgo_url = f"https://api.duckduckgo.com/?q={urllib.parse.quote_plus(query)}&format=json&no_html=1&skip_disambig=1"
-            headers = self._get_next_headers()
-            response = requests.get(duckduckgo_url, headers=headers, timeout=10)
+            duckduckgo_url = f"{self.duckduckgo_api_url}?q={urllib.parse.quote_plus(query)}&format=json&no_html=1&skip_disambig=1"
+            response = self._http_get(duckduckgo_url)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('Abstract'):
@@ -443,9 +1056,8 @@ class AutomationBrain:
     def _search_wikipedia_enhanced(self, query: str) -> Optional[str]:
         """Enhanced Wikipedia search."""
         try:
-            wiki_url = "https://en.wikipedia.org/api/rest_v1/page/summary/" + urllib.parse.quote_plus(query)
-            headers = self._get_next_headers()
-            response = requests.get(wiki_url, headers=headers, timeout=10)
+            wiki_url = self.wikipedia_summary_url + urllib.parse.quote_plus(query)
+            response = self._http_get(wiki_url)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('extract'):
@@ -466,31 +1078,10 @@ class AutomationBrain:
         except Exception as e:
             self.logger.error(f"How-to search error: {str(e)}")
             return None
-    def _handle_multimedia_commands(self, command: str) -> Optional[str]:
-        """Enhanced multimedia command handling."""
-        try:
-            if "show me" in command and "video" in command:
-                query = self._extract_video_query(command)
-                return self._search_youtube_enhanced(query)
-            
-            video_controls = {
-                "play video": ("space", "Video playback started"), "pause video": ("space", "Video paused"),
-                "skip forward": ("right", "Skipped forward 10 seconds"), "skip backward": ("left", "Skipped backward 10 seconds"),
-                "fullscreen": ("f", "Entered fullscreen mode"), "exit fullscreen": ("escape", "Exited fullscreen mode"),
-                "mute video": ("m", "Video muted"), "unmute video": ("m", "Video unmuted")
-            }
-            for control_phrase, (key, message) in video_controls.items():
-                if control_phrase in command:
-                    pyautogui.press(key)
-                    return f"Boss, {message.lower()}."
-            
-            if "volume up" in command: return self._volume_control("up")
-            elif "volume down" in command: return self._volume_control("down")
-            
-            return None
-        except Exception as e:
-            self.logger.error(f"Multimedia command error: {e}")
-            return f"Boss, I had trouble with that multimedia command: {str(e)}"
+    def _press_media_key(self, key: str, message: str) -> str:
+        """Send a media player key press."""
+        pyautogui.press(key)
+        return f"Boss, {message.lower()}."
 
     def _extract_video_query(self, command: str) -> str:
         """Extract video search query from command."""
@@ -523,25 +1114,6 @@ class AutomationBrain:
             self.logger.error(f"Volume control error: {e}")
             return f"Boss, I had trouble adjusting the volume: {str(e)}"
 
-    def _handle_system_automation(self, command: str) -> Optional[str]:
-        """Handle enhanced system automation tasks."""
-        try:
-            self.command_stats['system_operations'] += 1
-            system_commands = {
-                "system status": self._get_system_status_enhanced, "system info": self._get_system_info_enhanced,
-                "time": self._get_current_time_enhanced, "date": self._get_current_date_enhanced,
-                "performance stats": self._get_performance_report, "task manager": self._open_task_manager,
-                "control panel": self._open_control_panel, "lock screen": self._lock_screen,
-                "sleep mode": self._sleep_system, "restart computer": self._restart_system,
-                "shutdown computer": self._shutdown_system
-            }
-            for sys_cmd, action in system_commands.items():
-                if sys_cmd in command: return action()
-            return None
-        except Exception as e:
-            self.logger.error(f"System automation error: {e}")
-            return f"Boss, I had trouble with that system command: {str(e)}"
-
     def _get_system_status_enhanced(self) -> str:
         """Get enhanced system status information."""
         try:
@@ -563,6 +1135,9 @@ class AutomationBrain:
     def _get_system_info_enhanced(self) -> str:
         """Get detailed system information."""
         try:
+            info = self.cache['system_info'].get('platform')
+            if info is not None:
+                return info
             info = (f"🖥️ **System Information**\n\n"
                     f"OS: {platform.system()} {platform.release()}\n"
                     f"Architecture: {platform.architecture()[0]}\n"
@@ -570,6 +1145,7 @@ class AutomationBrain:
                     f"Python: {platform.python_version()}\n"
                     f"Machine: {platform.machine()}\n"
                     f"Node: {platform.node()}")
+            self.cache['system_info'].set('platform', info)
             return info
         except Exception as e:
             return f"Boss, I couldn't get system information: {str(e)}"
@@ -593,26 +1169,6 @@ class AutomationBrain:
             return "Boss, I've opened the task manager."
         except Exception as e:
             return f"Boss, I couldn't open the task manager: {str(e)}"
-    def _handle_file_operations(self, command: str) -> Optional[str]:
-        """Handle enhanced file operations."""
-        try:
-            self.command_stats['file_operations'] += 1
-            if command.startswith("create file"):
-                filename = command.replace("create file", "").strip()
-                return self._create_file_enhanced(filename)
-            elif command.startswith("delete file"):
-                filename = command.replace("delete file", "").strip()
-                return self._delete_file_enhanced(filename)
-            elif command.startswith("copy file"): return self._copy_file_enhanced(command)
-            elif command.startswith("move file"): return self._move_file_enhanced(command)
-            elif command.startswith("rename file"): return self._rename_file_enhanced(command)
-            elif "organize files" in command: return self._organize_files_enhanced()
-            elif "clean desktop" in command: return self._clean_desktop_enhanced()
-            return None
-        except Exception as e:
-            self.logger.error(f"File operation error: {e}")
-            return f"Boss, I had trouble with that file operation: {str(e)}"
-
     def _create_file_enhanced(self, filename: str) -> str:
         """Create a file with enhanced error handling."""
         try:
@@ -639,22 +1195,6 @@ class AutomationBrain:
             return f"Boss, I've deleted the file '{safe_filename}' from your desktop."
         except Exception as e: return f"Boss, I couldn't delete the file: {str(e)}"
 
-    def _handle_window_management(self, command: str) -> Optional[str]:
-        """Handle window management commands."""
-        try:
-            window_commands = {
-                "minimize window": self._minimize_current_window, "maximize window": self._maximize_current_window,
-                "close window": self._close_current_window, "new window": self._new_window,
-                "new tab": self._new_tab, "close tab": self._close_tab,
-                "switch window": self._switch_window, "list windows": self._list_windows
-            }
-            for window_cmd, action in window_commands.items():
-                if window_cmd in command: return action()
-            return None
-        except Exception as e:
-            self.logger.error(f"Window management error: {e}")
-            return f"Boss, I had trouble with that window command: {str(e)}"
-
     def _minimize_current_window(self) -> str:
         try:
             active_window = gw.getActiveWindow()
@@ -688,24 +1228,17 @@ class AutomationBrain:
             return "Boss, I've closed the current tab."
         except Exception as e: return f"Boss, I couldn't close the tab: {str(e)}"
 
-    def _handle_input_control(self, command: str) -> Optional[str]:
-        """Handle enhanced mouse and keyboard control."""
-        try:
-            if command.startswith("move mouse to"):
-                coords = re.findall(r'\d+', command)
-                if len(coords) >= 2: return self._move_mouse_enhanced(int(coords[0]), int(coords[1]))
-            elif "left click" in command: return self._click_mouse_enhanced("left")
-            elif "right click" in command: return self._click_mouse_enhanced("right")
-            elif "double click" in command: return self._double_click_enhanced()
-            elif "copy" in command and "text" in command: pyautogui.hotkey('ctrl', 'c'); return "Boss, I've copied the selected text."
-            elif "paste" in command and "text" in command: pyautogui.hotkey('ctrl', 'v'); return "Boss, I've pasted the text."
-            elif command.startswith("type"):
-                text = command.replace("type", "").strip()
-                if text: pyautogui.write(text); return f"Boss, I've typed: {text}"
-            return None
-        except Exception as e:
-            self.logger.error(f"Input control error: {e}")
-            return f"Boss, I had trouble with that input command: {str(e)}"
+    def _move_mouse_command(self, command: str) -> Optional[str]:
+        """Handle "move mouse to X Y"."""
+        coords = re.findall(r'\d+', command)
+        if len(coords) >= 2: return self._move_mouse_enhanced(int(coords[0]), int(coords[1]))
+        return None
+
+    def _type_text_command(self, command: str) -> Optional[str]:
+        """Handle "type <text>"."""
+        text = command.replace("type", "").strip()
+        if text: pyautogui.write(text); return f"Boss, I've typed: {text}"
+        return None
 
     def _move_mouse_enhanced(self, x: int, y: int) -> str:
         try:
@@ -722,13 +1255,6 @@ class AutomationBrain:
             elif button == "right": pyautogui.rightClick(); return "Boss, I've performed a right click."
             else: return "Boss, I can only perform left or right clicks."
         except Exception as e: return f"Boss, I couldn't perform the click: {str(e)}"
-    def _handle_status_commands(self, command: str) -> Optional[str]:
-        """Handle status and information commands."""
-        if "performance stats" in command or "stats" in command: return self._format_performance_stats()
-        elif "version" in command or "about" in command: return self._get_version_info()
-        elif "help" in command: return self._get_help_info()
-        return None
-
     def _format_performance_stats(self) -> str:
         """Format comprehensive performance statistics."""
         stats = self.get_performance_stats()
@@ -744,6 +1270,8 @@ class AutomationBrain:
                 f"⚙️ System Operations: {stats['system_operations']}\n"
                 f"💾 Memory Operations: {stats['memory_operations']}\n"
                 f"⏱️ Avg Execution Time: {stats['average_execution_time']:.2f}s\n"
+                f"🗃️ Search Cache: {stats['cache']['search_results']['hit_rate_percent']}% hits, "
+                f"{stats['cache']['search_results']['entries']} entries\n"
                 f"🕐 Session Uptime: {uptime_str}")
 
     def _get_version_info(self) -> str:
@@ -763,7 +1291,9 @@ class AutomationBrain:
 
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get comprehensive performance statistics."""
-        return self.command_stats
+        cache_stats = {name: cache.stats() for name, cache in self.cache.items()}
+        if self.search_store: cache_stats['search_store'] = self.search_store.stats()
+        return {**self.command_stats, 'cache': cache_stats}
 
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for safe file operations."""
@@ -787,9 +1317,68 @@ class AutomationBrain:
             return str(datetime.timedelta(seconds=int(time.time() - psutil.boot_time())))
         except: return "Unknown"
     
-    def _is_memory_command(self, command: str) -> bool: return any(trigger in command for trigger in self.memory_triggers)
-    def _is_search_command(self, command: str) -> bool: return any(trigger in command for trigger in self.search_triggers)
-    def _handle_memory_command(self, command: str) -> str: return "Memory command recognized, but not yet implemented, Boss."
+    def _handle_memory_command(self, command: str) -> str:
+        """Store a note in memory, or recall past activity through the memory brain's full-text search."""
+        if not self.memory_enabled:
+            return "Boss, my memory system is offline right now."
+        self.command_stats['memory_operations'] += 1
+        command_lower = command.lower().strip()
+        
+        recall_trigger = next((trigger for trigger in self.memory_recall_triggers if trigger in command_lower), None)
+        if recall_trigger is None:
+            store_trigger = next((trigger for trigger in self.memory_triggers if trigger in command_lower), "")
+            note = command_lower.split(store_trigger, 1)[-1].strip(" :,.") if store_trigger else command_lower
+            if not note:
+                return "Boss, what would you like me to remember?"
+            self.memory_brain.log_action("AUTOMATION_BRAIN", "MEMORY_NOTE", {"note": note, "command": command})
+            return f"🧠 Got it, Boss. I'll remember: {note}"
+        
+        topic = command_lower.split(recall_trigger, 1)[1].strip(" ?.")
+        since = None
+        for phrase, days_back in self.memory_time_windows.items():
+            if phrase in topic:
+                topic = topic.replace(phrase, " ").strip()
+                start_of_day = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+                since = start_of_day - datetime.timedelta(days=days_back)
+                break
+        if not topic:
+            return "Boss, what should I try to remember?"
+        
+        try:
+            results = self.memory_brain.search(topic, since=since, limit=20)
+        except Exception as e:
+            self.logger.error(f"Memory recall failed: {e}")
+            return "Boss, I couldn't search my memory just now."
+        
+        # Every command is also logged as received and succeeded; those echoes only add a
+        # memory when no more specific entry (note, search, file, ...) records the same command
+        echo_actions = ("COMMAND_RECEIVED_V1.5", "COMMAND_SUCCESS_V1.5")
+        recorded_commands = {result["entry"].get("details", {}).get("command") for result in results
+                             if result["entry"].get("action") not in echo_actions}
+        
+        lines = []
+        seen_summaries = set()
+        for result in results:
+            entry = result["entry"]
+            details = entry.get("details", {})
+            # Skip the recall requests themselves, which naturally match their own keywords
+            if recall_trigger in json.dumps(details).lower():
+                continue
+            if entry.get("action") in echo_actions and details.get("command") in recorded_commands:
+                continue
+            summary = next((str(details[key]) for key in ("note", "query", "command", "filename", "url", "target") if details.get(key)), None)
+            summary = summary or json.dumps(details, ensure_ascii=False)[:80]
+            if summary in seen_summaries:
+                continue
+            seen_summaries.add(summary)
+            lines.append(f"• {entry.get('timestamp', '')[:16].replace('T', ' ')} — {entry.get('action', '').replace('_', ' ').lower()}: {summary}")
+            if len(lines) >= 5:
+                break
+        
+        if not lines:
+            return f"Boss, I don't have any memories about '{topic}'."
+        return f"🧠 **Here's what I remember about '{topic}':**\n\n" + "\n".join(lines)
+
     def _copy_file_enhanced(self, command: str) -> str: return "Copy file command recognized, but not yet implemented, Boss."
     def _move_file_enhanced(self, command: str) -> str: return "Move file command recognized, but not yet implemented, Boss."
     def _rename_file_enhanced(self, command: str) -> str: return "Rename file command recognized, but not yet implemented, Boss."
@@ -799,6 +1388,8 @@ class AutomationBrain:
     def _switch_window(self) -> str: pyautogui.hotkey('alt', 'tab'); return "Switched window, Boss."
     def _list_windows(self) -> str: return "List windows command recognized, but not yet implemented, Boss."
     def _double_click_enhanced(self) -> str: pyautogui.doubleClick(); return "Double click executed, Boss."
+    def _copy_text(self) -> str: pyautogui.hotkey('ctrl', 'c'); return "Boss, I've copied the selected text."
+    def _paste_text(self) -> str: pyautogui.hotkey('ctrl', 'v'); return "Boss, I've pasted the text."
     def _get_performance_report(self) -> str: return self._format_performance_stats()
     def _open_control_panel(self) -> str: os.system('control'); return "Opening Control Panel, Boss."
     def _lock_screen(self) -> str: 
@@ -828,6 +1419,12 @@ class AutomationBrain:
                     "shutdown_time": datetime.datetime.now().isoformat(),
                     "message": "AutomationBrain V1.5 shutting down gracefully, Boss!"
                 })
+            self._revalidation_executor.shutdown(wait=False, cancel_futures=True)
+            self._search_executor.shutdown(wait=False, cancel_futures=True)
+            for cache in self.cache.values():
+                cache.close()
+            if self.search_store: self.search_store.close()
+            self.http_session.close()
             self.logger.info("AutomationBrain V1.5 shutdown completed.")
         except Exception as e:
             self.logger.error(f"Shutdown error: {e}")
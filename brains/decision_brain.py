@@ -10,17 +10,33 @@ Author: ZIA-X Development Team
 Version: 2.0 - Production-Ready Enhanced Edition
 """
 
+import os
 import logging
 import re
 import json
+import math
 import time
+import zlib
+import hashlib
 import datetime
-from typing import Dict, List, Union, Optional, Tuple, Any
+from typing import Dict, List, Union, Optional, Tuple, Any, Iterable
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import Counter, OrderedDict, deque
 import threading
+import itertools
 from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    import numpy as np
+except ImportError:  # The n-gram fallback classifier is disabled without NumPy
+    np = None
 
 @dataclass
 class DecisionResult:
@@ -36,6 +52,18 @@ class DecisionResult:
     execution_time: float = 0.0
     alternatives: Optional[List[str]] = None
 
+@dataclass
+class BatchDecisionResult:
+    """Results of classifying many commands at once, with aggregate distributions."""
+    results: List[Optional[DecisionResult]]
+    intent_distribution: Dict[str, int]
+    confidence_distribution: Dict[str, int]
+    average_confidence: float = 0.0
+    successful: int = 0
+    clarifications: int = 0
+    unrecognized: int = 0
+    processing_time: float = 0.0
+
 @dataclass
 class IntentMatch:
     """Represents an intent match with confidence scoring."""
@@ -44,12 +72,321 @@ class IntentMatch:
     matched_pattern: str
     extracted_entities: Dict[str, Any]
 
+@dataclass
+class CompiledIntentPattern:
+    """An intent pattern compiled once at setup, with its tier's base confidence."""
+    intent: str
+    tier: str
+    base_confidence: float
+    pattern: str
+    regex: "re.Pattern"
+    required_literal: Optional[str] = None
+
+class IntentPatternTable(dict):
+    """
+    The intent -> confidence tier -> patterns mapping, which notifies its owner
+    whenever an intent is added, replaced or removed so derived matching
+    structures can be rebuilt. Edit the tier lists of an existing intent through
+    DecisionBrain.add_intent() rather than in place.
+    """
+    
+    def __init__(self, patterns: Dict[str, Dict[str, List[str]]], on_change):
+        super().__init__(patterns)
+        self._on_change = on_change
+    
+    def _changed(self, result=None):
+        self._on_change()
+        return result
+    
+    def __setitem__(self, key, value): return self._changed(super().__setitem__(key, value))
+    def __delitem__(self, key): return self._changed(super().__delitem__(key))
+    def pop(self, *args): return self._changed(super().pop(*args))
+    def popitem(self): return self._changed(super().popitem())
+    def clear(self): return self._changed(super().clear())
+    def update(self, *args, **kwargs): return self._changed(super().update(*args, **kwargs))
+    def setdefault(self, key, default=None):
+        if key in self: return self[key]
+        self[key] = default
+        return default
+
+class NgramIntentClassifier:
+    """
+    TF-IDF nearest-centroid intent classifier over hashed word and character n-grams.
+    
+    Each training sample becomes a sparse vector of word unigrams/bigrams and
+    character 3-5 grams, hashed into a fixed number of dimensions. Every intent is
+    represented by the normalized sum of its samples' vectors, so classifying a
+    command is a single product of its (sparse) vector with the centroid matrix,
+    yielding cosine similarities for all intents at once.
+    """
+    
+    DIMENSIONS = 1 << 15
+    CHAR_NGRAMS = (3, 4, 5)
+    WORD_PATTERN = re.compile(r"[^\W_]+")
+    
+    def __init__(self, intents: List[str], centroids, idf, signature: str = ""):
+        self.intents = intents
+        self.centroids = centroids  # (DIMENSIONS, len(intents)) float32, columns L2-normalized
+        self.idf = idf              # (DIMENSIONS,) float32
+        self.signature = signature
+    
+    @classmethod
+    def ngram_indices(cls, text: str) -> Dict[int, int]:
+        """Hashed n-gram index -> count for a piece of text."""
+        counts: Dict[int, int] = {}
+        mask = cls.DIMENSIONS - 1
+        words = cls.WORD_PATTERN.findall(text.lower())
+        grams = [f"w:{word}" for word in words]
+        grams.extend(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+        for word in words:
+            padded = f" {word} "
+            for n in cls.CHAR_NGRAMS:
+                grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        for gram in grams:
+            index = zlib.crc32(gram.encode("utf-8")) & mask
+            counts[index] = counts.get(index, 0) + 1
+        return counts
+    
+    @classmethod
+    def train(cls, samples: Iterable[Tuple[str, str, float]], signature: str = "") -> Optional["NgramIntentClassifier"]:
+        """
+        Train from (text, intent, weight) samples.
+        
+        Returns:
+            The classifier, or None if there are no usable samples
+        """
+        documents = []
+        intents: Dict[str, int] = {}
+        for text, intent, weight in samples:
+            counts = cls.ngram_indices(text)
+            if counts and weight > 0:
+                documents.append((np.fromiter(counts.keys(), dtype=np.int64, count=len(counts)),
+                                  np.fromiter(counts.values(), dtype=np.float32, count=len(counts)),
+                                  intents.setdefault(intent, len(intents)), weight))
+        if not documents:
+            return None
+        
+        document_frequency = np.zeros(cls.DIMENSIONS, dtype=np.float32)
+        for indices, _, _, _ in documents:
+            document_frequency[indices] += 1
+        idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+        
+        centroids = np.zeros((cls.DIMENSIONS, len(intents)), dtype=np.float32)
+        for indices, counts, column, weight in documents:
+            values = (1 + np.log(counts)) * idf[indices]
+            centroids[indices, column] += weight * values / np.linalg.norm(values)
+        norms = np.linalg.norm(centroids, axis=0)
+        centroids /= np.where(norms > 0, norms, 1)
+        return cls(list(intents), centroids, idf, signature)
+    
+    def predict(self, text: str) -> List[Tuple[str, float]]:
+        """All intents with their cosine similarity to `text`, best first."""
+        counts = self.ngram_indices(text)
+        if not counts:
+            return []
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = (1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))) * self.idf[indices]
+        norm = np.linalg.norm(values)
+        if norm == 0:
+            return []
+        scores = (values / norm) @ self.centroids[indices]
+        order = np.argsort(scores)[::-1]
+        return [(self.intents[i], float(scores[i])) for i in order]
+    
+    def save(self, path: Path):
+        """Save the trained model (NumPy .npz)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, centroids=self.centroids, idf=self.idf,
+                                intents=np.array(self.intents), signature=np.array(self.signature))
+    
+    @classmethod
+    def load(cls, path: Path) -> "NgramIntentClassifier":
+        """Load a model written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            if data["centroids"].shape[0] != cls.DIMENSIONS:
+                raise ValueError(f"model has {data['centroids'].shape[0]} dimensions, expected {cls.DIMENSIONS}")
+            return cls([str(intent) for intent in data["intents"]], data["centroids"], data["idf"], str(data["signature"]))
+
+class LearningStore:
+    """
+    Bounded, decaying store of learned preferences: intent -> key -> score.
+    
+    Every intent keeps at most `top_k` keys. Scores decay exponentially with
+    `half_life` seconds, so a key reinforced often and recently outranks one that
+    was popular months ago; when an intent is full, the key with the lowest
+    decayed score is evicted. Scores are kept as (score, timestamp) pairs and
+    decayed on read, so recording is O(1) until an eviction (O(top_k)).
+    
+    Persistence is an append-only JSON-lines log of (timestamp, intent, key,
+    weight) events, replayed through the same decay and eviction on load. Once
+    the log holds `compact_factor` times more events than live keys it is
+    rewritten as one event per live key (checked on every append, on load and
+    on close), so it stays proportional to the store during long sessions too.
+    """
+    
+    def __init__(self, path: Optional[Path], logger: logging.Logger, top_k: int = 50,
+                 half_life: float = 30 * 86400, compact_factor: int = 4):
+        self.path = path
+        self.logger = logger
+        self.top_k = max(1, top_k)
+        self.half_life = half_life
+        self.compact_factor = compact_factor
+        self.entries: Dict[str, Dict[str, List[float]]] = {}  # intent -> key -> [score, timestamp]
+        self._log_file = None
+        self._logged_events = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def normalize(key: str) -> str:
+        """Case and whitespace differences do not make a new phrasing."""
+        return " ".join(key.lower().split())
+    
+    def _decayed(self, entry: List[float], now: float) -> float:
+        score, timestamp = entry
+        if self.half_life <= 0 or now <= timestamp:
+            return score
+        return score * 0.5 ** ((now - timestamp) / self.half_life)
+    
+    def _apply(self, intent: str, key: str, weight: float, timestamp: float):
+        keys = self.entries.setdefault(intent, {})
+        entry = keys.get(key)
+        if entry is None:
+            keys[key] = [weight, timestamp]
+            if len(keys) > self.top_k:
+                # Evict the weakest key, never the one just learned
+                weakest = min((k for k in keys if k != key), key=lambda k: self._decayed(keys[k], timestamp))
+                del keys[weakest]
+        else:
+            entry[0] = self._decayed(entry, timestamp) + weight
+            entry[1] = max(entry[1], timestamp)
+    
+    def record(self, intent: str, key: str, weight: float = 1.0):
+        """Reinforce `key` for `intent` now and append the event to the log."""
+        key = self.normalize(key)
+        if not intent or not key:
+            return
+        now = time.time()
+        with self._lock:
+            self._apply(intent, key, weight, now)
+            if self.path is None:
+                return
+            try:
+                if self._log_file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._log_file = open(self.path, "a", encoding="utf-8")
+                self._log_file.write(json.dumps({"t": round(now, 3), "i": intent, "k": key, "w": weight}) + "\n")
+                self._log_file.flush()
+                self._logged_events += 1
+                if self._compaction_due():
+                    self._compact()
+            except Exception as e:
+                self.logger.warning(f"Could not append learning event: {e}")
+    
+    def most_common(self, intent: str, n: Optional[int] = None) -> List[Tuple[str, float]]:
+        """The keys of an intent by decayed score, highest first."""
+        now = time.time()
+        with self._lock:
+            ranked = sorted(((key, self._decayed(entry, now)) for key, entry in self.entries.get(intent, {}).items()),
+                            key=lambda item: item[1], reverse=True)
+        return ranked[:n] if n is not None else ranked
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """intent -> key -> current decayed score."""
+        now = time.time()
+        with self._lock:
+            return {intent: {key: self._decayed(entry, now) for key, entry in keys.items()}
+                    for intent, keys in self.entries.items()}
+    
+    def restore(self, snapshot: Dict[str, Dict[str, float]]):
+        """Replace the in-memory state with a snapshot() (nothing is logged)."""
+        now = time.time()
+        with self._lock:
+            self.entries = {}
+            for intent, keys in snapshot.items():
+                for key, score in keys.items():
+                    self._apply(intent, key, score, now)
+    
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self.entries.values())
+    
+    def load(self, legacy_path: Optional[Path] = None):
+        """Replay the event log (importing the old learning_data.json the first time) and compact it if due."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self.path.exists():
+                if legacy_path is not None and legacy_path.exists():
+                    self._import_legacy(legacy_path)
+                return
+            skipped = 0
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                        self._apply(event["i"], event["k"], float(event["w"]), float(event["t"]))
+                        self._logged_events += 1
+                    except (ValueError, KeyError, TypeError):
+                        skipped += 1  # Torn or corrupted line
+            if skipped:
+                self.logger.warning(f"Skipped {skipped} unreadable learning events in {self.path}")
+            if skipped or self._compaction_due():
+                self._compact()
+    
+    def _import_legacy(self, legacy_path: Path):
+        """Bring in the counters of the old whole-file JSON format, timestamped at the file's mtime."""
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            timestamp = legacy_path.stat().st_mtime
+            for intent, counts in data.get("user_preferences", {}).items():
+                for key, count in sorted(counts.items(), key=lambda item: item[1]):
+                    if self.normalize(key):
+                        self._apply(intent, self.normalize(key), float(count), timestamp)
+            self._compact()
+            self.logger.info(f"Imported learning data from {legacy_path}")
+        except Exception as e:
+            self.logger.warning(f"Could not import legacy learning data: {e}")
+    
+    def _compaction_due(self) -> bool:
+        return self._logged_events > self.compact_factor * max(len(self), self.top_k)
+
+    def _compact(self):
+        """Rewrite the log as one event per live key (caller holds the lock)."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for intent, keys in self.entries.items():
+                for key, (score, timestamp) in keys.items():
+                    f.write(json.dumps({"t": round(timestamp, 3), "i": intent, "k": key, "w": score}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._logged_events = len(self)
+    
+    def close(self):
+        """Compact the log if due and close it."""
+        with self._lock:
+            try:
+                if self.path is not None and self._compaction_due():
+                    self._compact()
+            finally:
+                if self._log_file is not None:
+                    self._log_file.close()
+                    self._log_file = None
+
 class DecisionBrain:
     """
     Enhanced intelligent decision-making brain for ZIA with advanced capabilities.
     Features context awareness, learning capabilities, and sophisticated NLP.
     """
     
+    # Confidence tiers in evaluation order with their base confidence
+    CONFIDENCE_TIERS = (("high_confidence", 0.9), ("medium_confidence", 0.6), ("low_confidence", 0.3))
+    
     def __init__(self, cns, config):
         """
         Initialize the Enhanced DecisionBrain with advanced features.
@@ -67,17 +404,34 @@ class DecisionBrain:
         self.max_alternatives = self.config.get('decision_brain', {}).get('max_alternatives', 3)
         self.learning_enabled = self.config.get('decision_brain', {}).get('learning_enabled', True)
         self.context_window = self.config.get('decision_brain', {}).get('context_window', 5)
+        self.context_boost = self.config.get('decision_brain', {}).get('context_boost', 0.1)
+        self.context_turn_half_life = self.config.get('decision_brain', {}).get('context_turn_half_life', 1.0)
+        self.context_time_half_life = self.config.get('decision_brain', {}).get('context_time_half_life_seconds', 300)
+        self.decision_cache_size = self.config.get('decision_brain', {}).get('decision_cache_size', 512)
+        self.fallback_classifier_enabled = self.config.get('decision_brain', {}).get('fallback_classifier_enabled', True)
+        self.fallback_min_similarity = self.config.get('decision_brain', {}).get('fallback_min_similarity', 0.35)
+        self.fallback_min_margin = self.config.get('decision_brain', {}).get('fallback_min_margin', 0.1)
+        self.fallback_model_path = Path(self.config.get('decision_brain', {}).get('fallback_model_path', 'config/intent_classifier.npz'))
         
         # Initialize core components
+        self._setup_decision_cache()
         self._setup_knowledge_base()
         self._setup_intent_patterns()
         self._setup_entity_extractors()
+        self._setup_fallback_classifier()
         self._setup_context_manager()
         self._setup_learning_system()
         self._setup_performance_tracking()
         
-        # Thread safety
+        # Thread safety: matching runs unlocked over the immutable compiled tables; _decision_lock
+        # guards only the mutable session state (performance_stats, conversation_history,
+        # user_preferences, session_context)
         self._decision_lock = threading.Lock()
+        self._compile_lock = threading.Lock()
+        self._classifier_lock = threading.Lock()
+        
+        # Load or train the fallback model off the decision path
+        self._start_fallback_classifier_build()
         
         self.logger.info("Enhanced DecisionBrain V2.0 initialized successfully")
 
@@ -125,7 +479,7 @@ class DecisionBrain:
 
     def _setup_intent_patterns(self):
         """Setup enhanced intent patterns with confidence scoring."""
-        self.intent_patterns = {
+        self.intent_patterns = IntentPatternTable({
             "find_video": {
                 "high_confidence": [r"show me.*video.*about\s+(.+)", r"find.*video.*on\s+(.+)", r"search.*video.*(.+)", r"want.*watch.*video.*(.+)"],
                 "medium_confidence": [r"show me.*(.+).*video", r"find.*(.+).*video", r"watch.*(.+)", r"video.*(.+)"],
@@ -206,7 +560,368 @@ class DecisionBrain:
                 "medium_confidence": [r"shopping.*(.+)", r"buy.*(.+)", r"price.*(.+)"],
                 "low_confidence": [r"buy", r"shop", r"purchase"]
             }
-        }
+        }, self._on_intent_patterns_changed)
+        self._compile_intent_patterns()
+
+    def _on_intent_patterns_changed(self):
+        """Intents were added or removed - recompile before the next match."""
+        self._intent_index_stale = True
+        self.clear_decision_cache()
+        self._fallback_generation += 1
+        self._fallback_classifier = None
+
+    def _compile_intent_patterns(self):
+        """
+        Compile every intent pattern once into a flat table (intent by intent, tiers
+        from high to low) and build the literal prefilter index over it.
+        
+        Most patterns can only match if the command contains some literal text
+        ("video", "buy", "show me"). Each pattern is filed in intent_literal_index
+        under the longest such literal, so a command only has its patterns evaluated
+        when that literal occurs in it. Literals are checked as substrings rather
+        than whole words since the patterns are not word-bounded ("video" matches
+        "videos"). Patterns without a required literal are always evaluated.
+        
+        The tables are built aside and published as one immutable tuple, so
+        threads matching concurrently never see a half-built table.
+        """
+        self._intent_index_stale = False
+        table: List[CompiledIntentPattern] = []
+        literal_index: Dict[str, List[int]] = {}
+        unanchored: List[int] = []
+        
+        for intent, pattern_groups in list(self.intent_patterns.items()):
+            for tier, base_confidence in self.CONFIDENCE_TIERS:
+                for pattern in pattern_groups.get(tier, []):
+                    position = len(table)
+                    literal = self._required_literal(pattern)
+                    table.append(CompiledIntentPattern(intent, tier, base_confidence, pattern, re.compile(pattern), literal))
+                    if literal:
+                        literal_index.setdefault(literal, []).append(position)
+                    else:
+                        unanchored.append(position)
+        
+        self._intent_tables = (
+            tuple(table),
+            {literal: tuple(positions) for literal, positions in literal_index.items()},
+            tuple(unanchored)
+        )
+        self.compiled_intent_patterns, self.intent_literal_index, self._unanchored_positions = self._intent_tables
+        self.logger.debug(f"Compiled {len(self.compiled_intent_patterns)} intent patterns "
+                          f"({len(self.intent_literal_index)} prefilter literals)")
+
+    @staticmethod
+    def _required_literal(pattern: str) -> Optional[str]:
+        """
+        Longest run of literal characters that every match of `pattern` must contain,
+        or None if none can be determined. Only top-level (and plain group) literals
+        count - anything under a repeat or an alternation may be skipped. Literals
+        under a case-insensitive flag ("(?i)..." or "(?i:...)") do not count either,
+        since the prefilter looks them up verbatim.
+        """
+        try:
+            parsed = sre_parse.parse(pattern)
+        except Exception:
+            return None
+        case_flags = re.IGNORECASE | re.LOCALE
+        if parsed.state.flags & case_flags:
+            return None
+        
+        runs: List[str] = []
+        current: List[str] = []
+        
+        def walk(items):
+            for op, value in items:
+                if op == sre_parse.LITERAL:
+                    current.append(chr(value))
+                    continue
+                if current:
+                    runs.append("".join(current))
+                    current.clear()
+                if op == sre_parse.SUBPATTERN and not value[1] & case_flags:
+                    walk(value[-1])
+                    if current:
+                        runs.append("".join(current))
+                        current.clear()
+        
+        walk(parsed)
+        if current:
+            runs.append("".join(current))
+        return max(runs, key=len) if runs else None
+
+    @staticmethod
+    def _pattern_text(pattern: str) -> str:
+        """
+        The literal words of a pattern, used as a training sample for the fallback
+        classifier ("show me.*video.*about\\s+(.+)" -> "show me video about").
+        Every alternative of a group is kept.
+        """
+        try:
+            parsed = sre_parse.parse(pattern)
+        except Exception:
+            return ""
+        
+        text: List[str] = []
+        
+        def walk(items):
+            for op, value in items:
+                if op == sre_parse.LITERAL:
+                    text.append(chr(value))
+                    continue
+                text.append(" ")
+                if op == sre_parse.SUBPATTERN:
+                    walk(value[-1])
+                elif op == sre_parse.BRANCH:
+                    for branch in value[1]:
+                        walk(branch)
+                        text.append(" ")
+                elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+                    walk(value[2])
+        
+        walk(parsed)
+        return " ".join("".join(text).split())
+
+    def add_intent(self, intent: str, patterns: Dict[str, List[str]], knowledge: Optional[Dict[str, Any]] = None):
+        """
+        Add an intent (or extra patterns for an existing one) at runtime.
+        
+        Args:
+            intent: Intent name
+            patterns: Tier name ("high_confidence", "medium_confidence", "low_confidence") -> regex patterns
+            knowledge: Optional knowledge base entry (actions, priority, ...) for a new intent
+        """
+        merged = {tier: list(existing) for tier, existing in self.intent_patterns.get(intent, {}).items()}
+        for tier, tier_patterns in patterns.items():
+            merged.setdefault(tier, []).extend(tier_patterns)
+        self.intent_patterns[intent] = merged
+        if knowledge is not None:
+            self.knowledge_base[intent] = knowledge
+        self.logger.info(f"Intent '{intent}' registered with {sum(len(p) for p in merged.values())} patterns")
+
+    def _setup_decision_cache(self):
+        """
+        Setup the LRU cache of command -> ranked intent matches.
+        
+        Entries hold matches before context boosting, so the boosts for the last
+        intent and time of day are applied fresh on every lookup. Keys are the
+        stripped command with its case kept, since extracted entities (names,
+        places) keep the user's capitalization.
+        """
+        self._decision_cache: "OrderedDict[str, Tuple[IntentMatch, ...]]" = OrderedDict()
+        self._decision_cache_lock = threading.Lock()
+        self._decision_cache_generation = 0
+        self.decision_cache_stats = {'hits': 0, 'misses': 0}
+
+    def clear_decision_cache(self):
+        """Drop all cached intent matches (called automatically when intent patterns change)."""
+        with self._decision_cache_lock:
+            self._decision_cache.clear()
+            self._decision_cache_generation += 1
+
+    def _cached_intent_matches(self, key: str) -> Optional[List[IntentMatch]]:
+        """Look up a command in the decision cache, returning fresh copies of its matches."""
+        if self.decision_cache_size <= 0:
+            return None
+        with self._decision_cache_lock:
+            cached = self._decision_cache.get(key)
+            if cached is None:
+                self.decision_cache_stats['misses'] += 1
+                return None
+            self._decision_cache.move_to_end(key)
+            self.decision_cache_stats['hits'] += 1
+        return [IntentMatch(match.intent, match.confidence, match.matched_pattern, dict(match.extracted_entities))
+                for match in cached]
+
+    def _cache_intent_matches(self, key: str, intent_matches: List[IntentMatch], generation: int):
+        """Store unboosted matches, unless the patterns changed while they were computed."""
+        if self.decision_cache_size <= 0:
+            return
+        with self._decision_cache_lock:
+            if generation != self._decision_cache_generation:
+                return
+            self._decision_cache[key] = tuple(
+                IntentMatch(match.intent, match.confidence, match.matched_pattern, dict(match.extracted_entities))
+                for match in intent_matches
+            )
+            self._decision_cache.move_to_end(key)
+            while len(self._decision_cache) > self.decision_cache_size:
+                self._decision_cache.popitem(last=False)
+
+    def _setup_fallback_classifier(self):
+        """The n-gram classifier is loaded or trained on a background thread, see _get_fallback_classifier()."""
+        self._fallback_classifier: Optional[NgramIntentClassifier] = None
+        self._fallback_classifier_failed = False
+        self._fallback_thread: Optional[threading.Thread] = None
+        self._fallback_generation = 0  # Bumped when the intent patterns change, to discard models built for the old ones
+        self.fallback_stats = {'consulted': 0, 'resolved': 0, 'total_time': 0.0}
+        if self.fallback_classifier_enabled and np is None:
+            self.logger.warning("NumPy is not installed - the n-gram fallback classifier is disabled")
+            self.fallback_classifier_enabled = False
+
+    def _fallback_training_samples(self) -> List[Tuple[str, str, float]]:
+        """(text, intent, weight) samples: the literal text of every pattern plus learned successful commands."""
+        samples = []
+        for intent, pattern_groups in list(self.intent_patterns.items()):
+            samples.append((intent.replace("_", " "), intent, 1.0))
+            for tier, base_confidence in self.CONFIDENCE_TIERS:
+                for pattern in pattern_groups.get(tier, []):
+                    text = self._pattern_text(pattern)
+                    if text:
+                        samples.append((text, intent, base_confidence))
+        with self._decision_lock:
+            learned = self.user_preferences.snapshot()
+        for intent, commands in learned.items():
+            if intent in self.intent_patterns:
+                samples.extend((command, intent, 1.0 + math.log1p(score)) for command, score in commands.items())
+        return samples
+
+    def _fallback_signature(self) -> str:
+        """Fingerprint of the intent patterns a saved model must have been trained on."""
+        digest = hashlib.sha256()
+        for intent in sorted(self.intent_patterns):
+            digest.update(json.dumps([intent, self.intent_patterns[intent]], sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def train_fallback_classifier(self, extra_samples: Optional[Iterable[Tuple[str, str]]] = None,
+                                  save: bool = False) -> Optional[NgramIntentClassifier]:
+        """
+        (Re)train the n-gram fallback classifier from the intent patterns and learned commands.
+        
+        Args:
+            extra_samples: Additional (command, intent) pairs, e.g. from replayed command logs
+            save: Also write the model to fallback_model_path for later sessions
+            
+        Returns:
+            NgramIntentClassifier: The new classifier, or None if NumPy is unavailable
+        """
+        if np is None:
+            return None
+        classifier = self._train_classifier(extra_samples)
+        if classifier is None:
+            return None
+        if save:
+            classifier.save(self.fallback_model_path)
+        self._fallback_classifier = classifier
+        return classifier
+
+    def _train_classifier(self, extra_samples: Optional[Iterable[Tuple[str, str]]] = None) -> Optional[NgramIntentClassifier]:
+        """Train a classifier on the current patterns and learned commands without installing it."""
+        start_time = time.time()
+        samples = self._fallback_training_samples()
+        if extra_samples:
+            samples.extend((command, intent, 1.0) for command, intent in extra_samples if intent in self.intent_patterns)
+        classifier = NgramIntentClassifier.train(samples, self._fallback_signature())
+        if classifier is not None:
+            self.logger.info(f"Fallback classifier trained on {len(samples)} samples for {len(classifier.intents)} intents "
+                             f"in {(time.time() - start_time) * 1000:.0f}ms")
+        return classifier
+
+    def _start_fallback_classifier_build(self) -> Optional[threading.Thread]:
+        """Load or train the fallback classifier on a background thread, unless one is already running."""
+        if not self.fallback_classifier_enabled or self._fallback_classifier_failed:
+            return None
+        with self._classifier_lock:
+            if self._fallback_thread is None or not self._fallback_thread.is_alive():
+                self._fallback_thread = threading.Thread(
+                    target=self._build_fallback_classifier, args=(self._fallback_generation,),
+                    name="zia-fallback-classifier", daemon=True
+                )
+                self._fallback_thread.start()
+            return self._fallback_thread
+
+    def _build_fallback_classifier(self, generation: int):
+        """Load the saved model if it matches the current patterns, otherwise train one, and publish it."""
+        classifier = None
+        if self.fallback_model_path.exists():
+            try:
+                classifier = NgramIntentClassifier.load(self.fallback_model_path)
+                if classifier.signature == self._fallback_signature():
+                    self.logger.info(f"Fallback classifier loaded from {self.fallback_model_path}")
+                else:
+                    self.logger.info("Saved fallback classifier is out of date with the intent patterns - retraining")
+                    classifier = None
+            except Exception as e:
+                # Corrupt, truncated or incompatible model file - ignore it and train a fresh one
+                self.logger.warning(f"Ignoring unreadable fallback classifier {self.fallback_model_path}: {e}")
+                classifier = None
+        try:
+            if classifier is None:
+                classifier = self._train_classifier()
+            with self._classifier_lock:
+                if generation == self._fallback_generation:  # Patterns unchanged while building
+                    self._fallback_classifier = classifier
+        except Exception as e:
+            self.logger.warning(f"Fallback classifier unavailable: {e}")
+            self._fallback_classifier_failed = True
+
+    def _get_fallback_classifier(self, wait: bool = False) -> Optional[NgramIntentClassifier]:
+        """
+        The fallback classifier, or None while it is still being loaded or trained.
+        
+        A missing model (e.g. after the intent patterns changed) is rebuilt in the
+        background rather than on the caller's thread. With wait=True the caller
+        blocks until it is ready instead, as offline batch classification does.
+        """
+        classifier = self._fallback_classifier
+        if classifier is not None or not self.fallback_classifier_enabled or self._fallback_classifier_failed:
+            return classifier
+        thread = self._start_fallback_classifier_build()
+        if wait and thread is not None:
+            thread.join()
+            if self._fallback_classifier is None and not self._fallback_classifier_failed:
+                # The patterns changed during that build; rebuild for the current ones
+                self._build_fallback_classifier(self._fallback_generation)
+        return self._fallback_classifier
+
+    def _resolve_with_fallback(self, command: str, intent_matches: List[IntentMatch],
+                               record_stats: bool = True, wait_for_model: bool = False) -> Optional[IntentMatch]:
+        """
+        Try to settle a low-confidence decision with the n-gram classifier instead of asking.
+        
+        The top intent is accepted when its similarity reaches fallback_min_similarity and
+        beats the runner-up by fallback_min_margin. Its regex match (and entities) is reused
+        when it had one. With record_stats=False fallback_stats is left unchanged. Until the
+        model is ready the fallback is skipped, unless wait_for_model is set.
+        
+        The similarity is mapped linearly from [fallback_min_similarity, 1] onto
+        [confidence_threshold, 1], so an accepted fallback reports a confidence on the
+        same scale as a regex decision that cleared the threshold.
+        
+        Returns:
+            IntentMatch: The resolved intent (matched_pattern "ngram_classifier" when no regex
+            matched it), or None
+        """
+        classifier = self._get_fallback_classifier(wait=wait_for_model)
+        if classifier is None:
+            return None
+        start_time = time.time()
+        ranking = classifier.predict(command)
+        elapsed = time.time() - start_time
+        if record_stats:
+            with self._decision_lock:
+                self.fallback_stats['consulted'] += 1
+                self.fallback_stats['total_time'] += elapsed
+        if not ranking:
+            return None
+        
+        intent, similarity = ranking[0]
+        runner_up = ranking[1][1] if len(ranking) > 1 else 0.0
+        if similarity < self.fallback_min_similarity or similarity - runner_up < self.fallback_min_margin:
+            return None
+        if not self.knowledge_base.get(intent, {}).get("actions"):
+            return None
+        
+        if record_stats:
+            with self._decision_lock:
+                self.fallback_stats['resolved'] += 1
+        span = 1.0 - self.fallback_min_similarity
+        confidence = self.confidence_threshold + (1.0 - self.confidence_threshold) * (
+            (similarity - self.fallback_min_similarity) / span if span > 0 else 1.0)
+        confidence = min(1.0, confidence)
+        regex_match = next((match for match in intent_matches if match.intent == intent), None)
+        if regex_match is not None:
+            return IntentMatch(intent, confidence, regex_match.matched_pattern, regex_match.extracted_entities)
+        return IntentMatch(intent, confidence, "ngram_classifier", self._extract_command_entities(command))
 
     def _setup_entity_extractors(self):
         """Setup enhanced entity extraction patterns."""
@@ -216,17 +931,29 @@ class DecisionBrain:
             "person": [r"(?:call|to|message|email)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"],
             "location": [r"(?:in|at|near)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"],
         }
+        self.compiled_entity_extractors = {
+            entity_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for entity_type, patterns in self.entity_extractors.items()
+        }
 
     def _setup_context_manager(self):
         """Setup context management for conversation awareness."""
-        self.conversation_history = []
-        self.session_context = { "last_intent": None, "time_of_day": self._get_time_context() }
+        # Ring buffer of the last context_window turns (command, intent, action, entities, timestamp)
+        self.conversation_history: deque = deque(maxlen=max(1, self.context_window))
+        # time_of_day is refreshed by _context_snapshot() whenever a decision needs it
+        self.session_context = { "last_intent": None, "time_of_day": None }
 
     def _setup_learning_system(self):
-        """Setup learning and adaptation system."""
-        self.user_preferences = defaultdict(Counter)
-        # Placeholder for loading/saving learning data
-        self.learning_data_path = Path("config/learning_data.json")
+        """Setup learning and adaptation system, restoring what earlier sessions learned."""
+        learning_config = self.config.get('decision_brain', {})
+        self.learning_data_path = Path(learning_config.get('learning_data_path', 'config/learning_data.jsonl'))
+        self.user_preferences = LearningStore(
+            self.learning_data_path if self.learning_enabled else None, self.logger,
+            top_k=learning_config.get('learning_top_k', 50),
+            half_life=learning_config.get('learning_half_life_days', 30) * 86400
+        )
+        if self.learning_enabled:
+            self._load_learning_data()
 
     def _setup_performance_tracking(self):
         """Setup comprehensive performance tracking."""
@@ -247,11 +974,17 @@ class DecisionBrain:
 
     def _update_performance_stats(self, execution_time: float):
         """Update performance statistics."""
-        total = self.performance_stats['total_decisions']
-        current_avg_time = self.performance_stats['average_processing_time']
-        self.performance_stats['average_processing_time'] = (
-            (current_avg_time * total + execution_time) / (total + 1)
-        )
+        with self._decision_lock:
+            total = self.performance_stats['total_decisions']
+            current_avg_time = self.performance_stats['average_processing_time']
+            self.performance_stats['average_processing_time'] = (
+                (current_avg_time * total + execution_time) / (total + 1)
+            )
+
+    def _context_snapshot(self) -> Dict[str, Any]:
+        """Immutable view of the session context for one decision (caller holds _decision_lock)."""
+        self.session_context['time_of_day'] = self._get_time_context()
+        return {**self.session_context, 'recent_turns': tuple(self.conversation_history)}
 
     def _get_time_context(self) -> str:
         """Get current time context."""
@@ -261,67 +994,113 @@ class DecisionBrain:
         elif 17 <= hour < 21: return "evening"
         else: return "night"
 
-    def _determine_intent_with_confidence(self, command: str) -> List[IntentMatch]:
-        """Enhanced intent determination with confidence scoring."""
+    def _determine_intent_with_confidence(self, command: str, context: Optional[Dict[str, Any]] = None,
+                                          use_cache: bool = True) -> List[IntentMatch]:
+        """
+        Enhanced intent determination with confidence scoring (boosted by `context`, the session context by default).
+        
+        With use_cache=False the decision cache is neither read nor filled, so its
+        contents and hit/miss counters are left alone.
+        """
+        if not use_cache:
+            return self._apply_context_boosting(self._match_intents(command), command, context)
+        cache_key = command.strip()
+        intent_matches = self._cached_intent_matches(cache_key)
+        if intent_matches is None:
+            generation = self._decision_cache_generation
+            intent_matches = self._match_intents(command)
+            self._cache_intent_matches(cache_key, intent_matches, generation)
+        return self._apply_context_boosting(intent_matches, command, context)
+
+    def _match_intents(self, command: str) -> List[IntentMatch]:
+        """Run the pattern table over a command, returning matches ranked before context boosting."""
+        if self._intent_index_stale:
+            with self._compile_lock:
+                if self._intent_index_stale:
+                    self._compile_intent_patterns()
+        table, literal_index, unanchored = self._intent_tables
+        
         command_lower = command.lower().strip()
+        command_length = len(command_lower)
         intent_matches = []
         
-        for intent, pattern_groups in self.intent_patterns.items():
+        # Prefilter: only patterns whose required literal occurs in the command can match
+        candidates = set(unanchored)
+        for literal, positions in literal_index.items():
+            if literal in command_lower:
+                candidates.update(positions)
+        command_entities = None
+        
+        for intent, positions in itertools.groupby(sorted(candidates), key=lambda position: table[position].intent):
             best_confidence = 0.0
-            best_pattern = ""
-            best_entities = {}
+            best_pattern = None
+            best_match = None
             
-            for confidence_level, base_confidence in [("high_confidence", 0.9), ("medium_confidence", 0.6), ("low_confidence", 0.3)]:
-                if confidence_level not in pattern_groups: continue
-                
-                for pattern in pattern_groups[confidence_level]:
-                    match = re.search(pattern, command_lower)
-                    if match:
-                        pattern_confidence = base_confidence
-                        if match.group(0) == command_lower: pattern_confidence += 0.1
-                        match_ratio = len(match.group(0)) / len(command_lower)
-                        pattern_confidence += match_ratio * 0.1
-                        
-                        entities = self._extract_entities_from_match(match, command)
-                        
-                        if pattern_confidence > best_confidence:
-                            best_confidence = pattern_confidence
-                            best_pattern = pattern
-                            best_entities = entities
+            for position in positions:
+                compiled = table[position]
+                match = compiled.regex.search(command_lower)
+                if match:
+                    matched_text = match.group(0)
+                    pattern_confidence = compiled.base_confidence
+                    if matched_text == command_lower: pattern_confidence += 0.1
+                    pattern_confidence += len(matched_text) / command_length * 0.1
+                    
+                    # First pattern wins ties, as tiers are scanned from high to low
+                    if pattern_confidence > best_confidence:
+                        best_confidence = pattern_confidence
+                        best_pattern = compiled.pattern
+                        best_match = match
             
-            if best_confidence > 0:
+            if best_match is not None:
+                # Entity extractors only depend on the command, so run them once for all intents
+                if command_entities is None:
+                    command_entities = self._extract_command_entities(command)
                 intent_matches.append(IntentMatch(
                     intent=intent,
                     confidence=min(best_confidence, 1.0),
                     matched_pattern=best_pattern,
-                    extracted_entities=best_entities
+                    extracted_entities=self._extract_entities_from_match(best_match, command, command_entities)
                 ))
         
         intent_matches.sort(key=lambda x: x.confidence, reverse=True)
-        return self._apply_context_boosting(intent_matches, command)
+        return intent_matches
 
-    def _extract_entities_from_match(self, match, command: str) -> Dict[str, Any]:
-        """Extract entities from regex match and command."""
+    def _extract_entities_from_match(self, match, command: str,
+                                     command_entities: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Extract entities from regex match and command (pass `command_entities` to reuse an earlier pass)."""
         entities = {}
         if match.groups():
             entities['primary_entity'] = match.group(1).strip()
         
-        for entity_type, patterns in self.entity_extractors.items():
-            for pattern in patterns:
-                entity_match = re.search(pattern, command, re.IGNORECASE)
+        if command_entities is None:
+            command_entities = self._extract_command_entities(command)
+        entities.update(command_entities)
+        return entities
+
+    def _extract_command_entities(self, command: str) -> Dict[str, str]:
+        """Run the compiled entity extractors over a command - the first pattern to match wins per type."""
+        entities = {}
+        for entity_type, extractors in self.compiled_entity_extractors.items():
+            for extractor in extractors:
+                entity_match = extractor.search(command)
                 if entity_match:
                     entities[entity_type] = entity_match.group(1)
                     break
         return entities
 
-    def _apply_context_boosting(self, intent_matches: List[IntentMatch], command: str) -> List[IntentMatch]:
+    def _apply_context_boosting(self, intent_matches: List[IntentMatch], command: str,
+                                context: Optional[Dict[str, Any]] = None) -> List[IntentMatch]:
         """Apply context-based confidence boosting."""
-        if self.session_context['last_intent']:
-            for match in intent_matches:
-                if match.intent == self.session_context['last_intent']:
-                    match.confidence = min(1.0, match.confidence + 0.1)
+        if context is None:
+            with self._decision_lock:
+                context = self._context_snapshot()
+        
+        intent_boosts = self._recent_intent_boosts(context)
+        for match in intent_matches:
+            if match.intent in intent_boosts:
+                match.confidence = min(1.0, match.confidence + intent_boosts[match.intent])
         
-        time_context = self.session_context['time_of_day']
+        time_context = context.get('time_of_day') or self._get_time_context()
         time_boosts = {
             "morning": ["news_update", "productivity"],
             "evening": ["entertainment", "find_video"],
@@ -333,6 +1112,30 @@ class DecisionBrain:
         
         intent_matches.sort(key=lambda x: x.confidence, reverse=True)
         return intent_matches
+
+    def _recent_intent_boosts(self, context: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Confidence boost per intent from the recent turns in `context`.
+        
+        Each turn adds context_boost, halved for every context_turn_half_life turns
+        and every context_time_half_life seconds since it happened, so the intent of
+        the turn just before gets close to the full boost and a conversation that
+        went quiet fades out. The total per intent is capped at context_boost.
+        """
+        turns = context.get('recent_turns')
+        if turns is None:
+            # A plain context without history: treat last_intent as the turn just before
+            turns = ({'intent': context['last_intent'], 'timestamp': None},) if context.get('last_intent') else ()
+        
+        now = time.time()
+        boosts: Dict[str, float] = {}
+        for turns_ago, turn in enumerate(reversed(turns)):
+            weight = 0.5 ** (turns_ago / self.context_turn_half_life) if self.context_turn_half_life > 0 else float(turns_ago == 0)
+            if turn.get('timestamp') is not None and self.context_time_half_life > 0:
+                weight *= 0.5 ** (max(0.0, now - turn['timestamp']) / self.context_time_half_life)
+            boosts[turn['intent']] = boosts.get(turn['intent'], 0.0) + self.context_boost * weight
+        return {intent: min(boost, self.context_boost) for intent, boost in boosts.items()}
+
     def _extract_enhanced_parameters(self, command: str, intent_match: IntentMatch) -> Dict[str, Any]:
         """Enhanced parameter extraction with entity recognition."""
         parameters = intent_match.extracted_entities.copy()
@@ -400,64 +1203,170 @@ class DecisionBrain:
             
         self.logger.info(f"Making enhanced decision for command: {command}")
         
-        with self._decision_lock, self._performance_timer() as timer:
+        with self._performance_timer() as timer:
             try:
-                self.performance_stats['total_decisions'] += 1
-                
-                intent_matches = self._determine_intent_with_confidence(command)
-                if not intent_matches:
-                    return None
-                
-                best_match = intent_matches[0]
-                intent, confidence = best_match.intent, best_match.confidence
-                
-                self.logger.info(f"Best intent: {intent} (confidence: {confidence:.2f})")
-                
-                if confidence < self.confidence_threshold:
-                    alternatives = [match.intent for match in intent_matches[:self.max_alternatives]]
-                    return DecisionResult(
-                        success=False, intent=intent, confidence=confidence, clarification_needed=True,
-                        clarification_message=f"CLARIFY:I'm not entirely sure, Boss. Did you mean: {', '.join(alternatives)}?",
-                        alternatives=alternatives
-                    )
-                
-                parameters = self._extract_enhanced_parameters(command, best_match)
-                
-                intent_config = self.knowledge_base.get(intent, {})
-                possible_actions = intent_config.get("actions", [])
+                with self._decision_lock:
+                    self.performance_stats['total_decisions'] += 1
+                    context = self._context_snapshot()
                 
-                if not possible_actions: return None
+                # Matching itself only reads the compiled tables and the context snapshot
+                result, outcome = self._evaluate_command(command, context)
+                if result is not None and result.intent:
+                    self.logger.info(f"Best intent: {result.intent} (confidence: {result.confidence:.2f})")
                 
-                action_to_take = possible_actions[0]
-                if len(possible_actions) > 1:
-                    if intent_config.get("context_sensitive"):
-                        action_to_take = self._select_best_action(intent, parameters, self.session_context)
-                    else:
+                if outcome == "clarification":
+                    with self._decision_lock:
                         self.performance_stats['clarifications_needed'] += 1
-                        clarification = self._create_enhanced_clarification(intent, possible_actions, parameters)
-                        return DecisionResult(
-                            success=False, intent=intent, confidence=confidence, clarification_needed=True,
-                            clarification_message=clarification, alternatives=possible_actions
-                        )
-                
-                automation_mapping = self._map_action_to_automation_enhanced(action_to_take, parameters, intent)
-                
-                result = DecisionResult(
-                    success=True, action=action_to_take,
-                    automation_command=automation_mapping['automation_command'],
-                    parameters=parameters, confidence=confidence, intent=intent
-                )
-                
-                self._update_conversation_history(command, intent, result)
-                self._learn_from_interaction(command, intent, True)
-                self.performance_stats['successful_decisions'] += 1
+                elif outcome == "success":
+                    with self._decision_lock:
+                        self._update_conversation_history(command, result.intent, result)
+                        self._learn_from_interaction(command, result.intent, True)
+                        self.performance_stats['successful_decisions'] += 1
                 
                 return result
                 
             except Exception as e:
                 self.logger.error(f"Error in enhanced decision making: {str(e)}", exc_info=True)
-                self._learn_from_interaction(command, "", False)
+                with self._decision_lock:
+                    self._learn_from_interaction(command, "", False)
                 return DecisionResult(success=False, clarification_message=f"Boss, I had an error in my thought process: {type(e).__name__}")
+    def _evaluate_command(self, command: str, context: Dict[str, Any],
+                          record: bool = True) -> Tuple[Optional[DecisionResult], str]:
+        """
+        Classify a command against a given session context without changing any session state.
+        
+        Args:
+            command: The command to classify
+            context: Session context snapshot to boost against
+            record: Use the decision cache and count fallback lookups; False leaves
+                both untouched and waits for the fallback model instead of skipping
+                it while it loads (the batch path)
+        
+        Returns:
+            (result, outcome) where outcome is one of "no_match", "low_confidence",
+            "no_actions", "clarification" or "success"; result is None for
+            "no_match" and "no_actions"
+        """
+        intent_matches = self._determine_intent_with_confidence(command, context, use_cache=record)
+        if not intent_matches:
+            return None, "no_match"
+        
+        best_match = intent_matches[0]
+        intent, confidence = best_match.intent, best_match.confidence
+        
+        if confidence < self.confidence_threshold:
+            # Let the n-gram classifier settle it before asking the user
+            resolved = self._resolve_with_fallback(command, intent_matches, record_stats=record,
+                                                   wait_for_model=not record)
+            if resolved is None:
+                alternatives = [match.intent for match in intent_matches[:self.max_alternatives]]
+                return DecisionResult(
+                    success=False, intent=intent, confidence=confidence, clarification_needed=True,
+                    clarification_message=f"CLARIFY:I'm not entirely sure, Boss. Did you mean: {', '.join(alternatives)}?",
+                    alternatives=alternatives
+                ), "low_confidence"
+            best_match = resolved
+            intent, confidence = resolved.intent, resolved.confidence
+        
+        parameters = self._extract_enhanced_parameters(command, best_match)
+        
+        intent_config = self.knowledge_base.get(intent, {})
+        possible_actions = intent_config.get("actions", [])
+        
+        if not possible_actions: return None, "no_actions"
+        
+        action_to_take = possible_actions[0]
+        if len(possible_actions) > 1:
+            if intent_config.get("context_sensitive"):
+                action_to_take = self._select_best_action(intent, parameters, context)
+            else:
+                clarification = self._create_enhanced_clarification(intent, possible_actions, parameters)
+                return DecisionResult(
+                    success=False, intent=intent, confidence=confidence, clarification_needed=True,
+                    clarification_message=clarification, alternatives=possible_actions
+                ), "clarification"
+        
+        automation_mapping = self._map_action_to_automation_enhanced(action_to_take, parameters, intent)
+        
+        return DecisionResult(
+            success=True, action=action_to_take,
+            automation_command=automation_mapping['automation_command'],
+            parameters=parameters, confidence=confidence, intent=intent
+        ), "success"
+
+    def make_decisions(self, commands: Iterable[str], workers: Optional[int] = None) -> BatchDecisionResult:
+        """
+        Classify many commands at once, e.g. to replay a recorded command log offline.
+        
+        Every command is judged against a snapshot of the current session context,
+        and nothing is changed: no decision, cache or fallback stats, no decision
+        cache entries, and no history, learning or last-intent updates.
+        Repeated commands in the batch are classified once. With `workers` > 1 the
+        distinct commands are spread over a process pool, each worker holding its
+        own copy of the compiled pattern tables.
+        
+        Args:
+            commands: Commands to classify (any iterable)
+            workers: Worker processes; None or 1 classifies in this process
+            
+        Returns:
+            BatchDecisionResult: One result per command (None where no intent matched,
+            like make_decision) plus intent and confidence distributions
+        """
+        start_time = time.time()
+        commands = list(commands)
+        with self._decision_lock:
+            context = self._context_snapshot()
+            user_preferences = self.user_preferences.snapshot()
+        
+        # Classify each distinct command once
+        distinct = list(dict.fromkeys(commands))
+        if workers and workers > 1 and len(distinct) > 1:
+            classifier = self._get_fallback_classifier(wait=True)
+            snapshot = (self.config, dict(self.intent_patterns), self.knowledge_base, user_preferences, context, classifier)
+            chunksize = max(1, len(distinct) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(snapshot,)) as pool:
+                decided = list(pool.map(_batch_worker_decide, distinct, chunksize=chunksize))
+        else:
+            decided = [self._evaluate_for_batch(command, context) for command in distinct]
+        by_command = dict(zip(distinct, decided))
+        results = [by_command[command] for command in commands]
+        
+        intent_distribution = Counter()
+        confidence_distribution = Counter()
+        batch = BatchDecisionResult(results=results, intent_distribution={}, confidence_distribution={})
+        confidences = []
+        for result in results:
+            if result is None or not result.intent:
+                batch.unrecognized += 1
+                intent_distribution["unrecognized"] += 1
+                continue
+            intent_distribution[result.intent] += 1
+            confidences.append(result.confidence)
+            bucket = min(int(result.confidence * 10), 9) / 10
+            confidence_distribution[f"{bucket:.1f}-{bucket + 0.1:.1f}"] += 1
+            if result.success:
+                batch.successful += 1
+            elif result.clarification_needed:
+                batch.clarifications += 1
+        
+        batch.intent_distribution = dict(intent_distribution.most_common())
+        batch.confidence_distribution = dict(sorted(confidence_distribution.items()))
+        batch.average_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        batch.processing_time = time.time() - start_time
+        self.logger.info(f"Batch classified {len(results)} commands ({len(distinct)} distinct) in {batch.processing_time:.2f}s")
+        return batch
+
+    def _evaluate_for_batch(self, command: str, context: Dict[str, Any]) -> Optional[DecisionResult]:
+        """_evaluate_command for one batch item, turning empty commands and errors into failed results."""
+        if not command or not command.strip():
+            return DecisionResult(success=False, clarification_message="Boss, I need a command to process.")
+        try:
+            return self._evaluate_command(command, context, record=False)[0]
+        except Exception as e:
+            self.logger.error(f"Error classifying batch command '{command}': {e}")
+            return DecisionResult(success=False, clarification_message=f"Boss, I had an error in my thought process: {type(e).__name__}")
+
     def _select_best_action(self, intent: str, parameters: Dict[str, Any], context: Dict[str, Any]) -> str:
         """Intelligently select the best action based on context and user preferences."""
         intent_config = self.knowledge_base[intent]
@@ -468,20 +1377,20 @@ class DecisionBrain:
         best_action = priority_actions[0]
         
         # Check user preferences
-        if self.user_preferences[intent]:
+        with self._decision_lock:
+            preferred = self.user_preferences.most_common(intent, 1)
             # Get the most common action the user prefers for this intent
-            most_common_action = self.user_preferences[intent].most_common(1)[0][0]
-            if most_common_action in possible_actions:
-                best_action = most_common_action
+            most_common_action = preferred[0][0] if preferred else None
+        if most_common_action in possible_actions:
+            best_action = most_common_action
         
         return best_action
 
     def _update_conversation_history(self, command: str, intent: str, result: DecisionResult):
         """Update conversation history for context awareness."""
-        history_entry = {'command': command, 'intent': intent, 'action': result.action}
-        self.conversation_history.append(history_entry)
-        if len(self.conversation_history) > self.context_window:
-            self.conversation_history.pop(0)
+        history_entry = {'command': command, 'intent': intent, 'action': result.action,
+                         'entities': dict(result.parameters or {}), 'timestamp': time.time()}
+        self.conversation_history.append(history_entry)  # The deque drops the oldest turn itself
         self.session_context['last_intent'] = intent
 
     def _learn_from_interaction(self, command: str, intent: str, success: bool, user_feedback: str = None):
@@ -491,26 +1400,21 @@ class DecisionBrain:
         if success and intent:
             # This is a simplified learning mechanism
             # A real one would adjust weights or retrain models
-            self.user_preferences[intent][command] += 1
+            self.user_preferences.record(intent, command)
 
     def _load_learning_data(self):
-        """Load existing learning data from storage."""
-        if self.learning_data_path.exists():
-            try:
-                with open(self.learning_data_path, 'r') as f:
-                    data = json.load(f)
-                    self.user_preferences = defaultdict(Counter, {k: Counter(v) for k, v in data.get("user_preferences", {}).items()})
-                self.logger.info("Learning data loaded successfully")
-            except Exception as e:
-                self.logger.warning(f"Could not load learning data: {e}")
+        """Load existing learning data from storage (the old learning_data.json is imported once)."""
+        try:
+            self.user_preferences.load(legacy_path=self.learning_data_path.with_name("learning_data.json"))
+            self.logger.info(f"Learning data loaded successfully ({len(self.user_preferences)} preferences)")
+        except Exception as e:
+            self.logger.warning(f"Could not load learning data: {e}")
 
     def _save_learning_data(self):
-        """Save learning data to storage."""
+        """Save learning data to storage - events are appended as they happen, so this only compacts and closes the log."""
         if not self.learning_enabled: return
         try:
-            with open(self.learning_data_path, 'w') as f:
-                serializable_prefs = {k: dict(v) for k, v in self.user_preferences.items()}
-                json.dump({"user_preferences": serializable_prefs}, f, indent=2)
+            self.user_preferences.close()
             self.logger.info("Learning data saved successfully")
         except Exception as e:
             self.logger.warning(f"Could not save learning data: {e}")
@@ -538,24 +1442,72 @@ class DecisionBrain:
                     automation_command=automation_mapping['automation_command'],
                     parameters=parameters, confidence=best_match.confidence, intent=intent
                 )
-                self._learn_from_interaction(original_command, intent, True, clarification_response)
+                with self._decision_lock:
+                    self._learn_from_interaction(original_command, intent, True, clarification_response)
                 return result
 
         return DecisionResult(success=False, clarification_needed=True, clarification_message="CLARIFY:I didn't understand that choice, Boss.")
 
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get comprehensive performance statistics."""
-        total = self.performance_stats['total_decisions']
-        success_rate = (self.performance_stats['successful_decisions'] / total * 100) if total > 0 else 0
-        uptime = datetime.datetime.now() - self.performance_stats['session_start_time']
+        with self._decision_lock:
+            performance_stats = dict(self.performance_stats)
+            performance_stats['intent_distribution'] = Counter(performance_stats['intent_distribution'])
+        total = performance_stats['total_decisions']
+        success_rate = (performance_stats['successful_decisions'] / total * 100) if total > 0 else 0
+        uptime = datetime.datetime.now() - performance_stats['session_start_time']
+        with self._decision_lock:
+            fallback_stats = dict(self.fallback_stats)
+        cache_lookups = self.decision_cache_stats['hits'] + self.decision_cache_stats['misses']
+        cache_hit_rate = (self.decision_cache_stats['hits'] / cache_lookups * 100) if cache_lookups > 0 else 0
         
         return {
-            **self.performance_stats,
+            **performance_stats,
             'success_rate_percent': round(success_rate, 1),
-            'session_uptime': str(uptime).split('.')[0]
+            'session_uptime': str(uptime).split('.')[0],
+            'decision_cache': {
+                **self.decision_cache_stats,
+                'hit_rate_percent': round(cache_hit_rate, 1),
+                'size': len(self._decision_cache),
+                'max_size': self.decision_cache_size
+            },
+            'fallback_classifier': {
+                'enabled': self.fallback_classifier_enabled and not self._fallback_classifier_failed,
+                'ready': self._fallback_classifier is not None,
+                'consulted': fallback_stats['consulted'],
+                'resolved': fallback_stats['resolved'],
+                'average_latency_ms': round(fallback_stats['total_time'] / fallback_stats['consulted'] * 1000, 3)
+                                      if fallback_stats['consulted'] else 0.0
+            }
         }
 
     def shutdown(self):
         """Graceful shutdown of Enhanced DecisionBrain."""
         self.logger.info("Enhanced DecisionBrain shutting down...")
         self._save_learning_data()
+
+
+# Per-process DecisionBrain for make_decisions(workers=...), built once by the pool initializer
+_batch_worker_brain: Optional[DecisionBrain] = None
+_batch_worker_context: Optional[Dict[str, Any]] = None
+
+
+def _init_batch_worker(snapshot) -> None:
+    """Process pool initializer: rebuild the parent's brain from its patterns, knowledge, preferences and fallback model."""
+    global _batch_worker_brain, _batch_worker_context
+    config, intent_patterns, knowledge_base, user_preferences, context, classifier = snapshot
+    # The parent's fallback model and preferences are reused as is, so the worker must neither build
+    # its own model nor load (and possibly compact) the learning log the parent is appending to
+    worker_config = {**config, 'decision_brain': {**config.get('decision_brain', {}),
+                                                  'fallback_classifier_enabled': False, 'learning_enabled': False}}
+    brain = DecisionBrain(None, worker_config)
+    brain._fallback_classifier = classifier
+    brain.intent_patterns = IntentPatternTable(intent_patterns, brain._on_intent_patterns_changed)
+    brain._compile_intent_patterns()
+    brain.knowledge_base = knowledge_base
+    brain.user_preferences.restore(user_preferences)
+    _batch_worker_brain, _batch_worker_context = brain, context
+
+
+def _batch_worker_decide(command: str) -> Optional[DecisionResult]:
+    return _batch_worker_brain._evaluate_for_batch(command, _batch_worker_context)
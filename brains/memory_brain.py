@@ -10,20 +10,48 @@ Core Features:
 - Persistent storage of all AI actions and decisions
 - Secure key management with automatic generation
 - Robust error handling and data integrity protection
+- Write-behind batching so logging never blocks the command path
+- Sidecar index for seek-based queries by time, brain and action
+- Streaming iterators (forward and newest-first) that decrypt lazily
+- Segmented storage with rotation, retention and compressed archive compaction
+- Optional multi-process decryption for full-history audits
+- Configurable fsync durability with torn-tail recovery on startup
+- Rolling per-brain/action/hour/day counters for O(1) dashboards
+- Encrypted full-text index with ranked keyword search over entry details
+- Optional block format: compressed AES-GCM frames per write batch instead of a token per line
 
 Author: ZIA-X Development Team
 License: Proprietary - All Rights Reserved
 """
 
 import os
+import re
+import math
+import hmac
+import base64
 import json
+import time
+import struct
+import bisect
+import hashlib
+import zlib
+import queue
+import atexit
 import logging
 import datetime
-from typing import Dict, List, Any, Optional
+import threading
+import heapq
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterator, Iterable, Callable
 from pathlib import Path
 
 try:
     from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 except ImportError as e:
     raise ImportError(
         "The 'cryptography' library is required for the MemoryBrain module. "
@@ -31,6 +59,1725 @@ except ImportError as e:
     ) from e
 
 
+class _BufferedLogWriter:
+    """
+    Append-only writer for the encrypted memory log.
+    
+    In write-behind mode, serialized entries are pushed onto a bounded queue and a
+    dedicated daemon thread hands them in batches to the segment store, which
+    encrypts them in the active segment's format and keeps its file handle open. A batch is
+    written as soon as `flush_size` entries are pending or `flush_interval`
+    seconds have passed since the first pending entry, whichever comes first.
+    
+    In synchronous mode (or after `close()`), entries are written immediately by the
+    calling thread. `append`, `flush` and `close` share a lock, so an entry is either
+    queued before the stop marker (and written by the thread) or written directly
+    after the thread has finished - never both at once, and never lost.
+    
+    With `sync_interval` set, the writer thread also wakes up when idle and asks the
+    store to fsync anything written but not yet synced, so the "batch" durability
+    mode keeps its time bound even when no further entries arrive.
+    
+    The writer deliberately holds no reference to MemoryBrain, so a brain that goes
+    out of scope can still be garbage collected while the thread is running.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, store: "_SegmentStore", logger: logging.Logger,
+                 write_behind: bool = True, flush_interval: float = 0.5,
+                 flush_size: int = 64, max_queue_size: int = 10000,
+                 sync_interval: Optional[float] = None):
+        self.store = store
+        self.sync_interval = sync_interval
+        self.logger = logger
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.flush_size = max(1, int(flush_size))
+        
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_queue_size)))
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._state_lock = threading.Lock()  # Orders queueing against close()
+        
+        if write_behind:
+            self._thread = threading.Thread(
+                target=self._writer_loop, name="MemoryBrainWriterThread", daemon=True
+            )
+            self._thread.start()
+            # Make sure queued entries still reach disk if the owner never calls close()
+            atexit.register(self.close)
+    
+    @property
+    def is_buffered(self) -> bool:
+        """True while entries are being handed to the background writer thread."""
+        return self._thread is not None and self._thread.is_alive() and not self._closed
+    
+    def append(self, payload: bytes, meta: Tuple[str, str, str, Optional[bool]]) -> None:
+        """
+        Queue (or, in synchronous mode, immediately write) one serialized entry.
+        
+        Blocks when the write-behind queue is full so that no entry is ever dropped.
+        
+        Args:
+            payload (bytes): UTF-8 JSON of the log entry
+            meta: (timestamp, brain, action, success) used for the index and aggregates
+        """
+        with self._state_lock:
+            if self.is_buffered:
+                self._queue.put((payload, meta))
+                return
+        self._write_batch([(payload, meta)])
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every entry queued before this call has been written to disk.
+        
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait, None waits forever
+            
+        Returns:
+            bool: True if the queue was drained within the timeout
+        """
+        with self._state_lock:
+            if not self.is_buffered:
+                return True
+            barrier = threading.Event()
+            self._queue.put(barrier)
+        return barrier.wait(timeout)
+    
+    def close(self) -> None:
+        """Drain the queue and stop the writer thread. Idempotent."""
+        with self._state_lock:
+            if self._closed:
+                return
+            # Let the thread drain everything queued so far; concurrent appends wait on the
+            # lock and then write directly, once nothing else is writing to the segment
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(self._STOP)
+                self._thread.join()
+            self._closed = True
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+    
+    def _write_batch(self, items: List[Tuple[bytes, tuple]]) -> None:
+        """Append a batch of serialized entries to the store in a single write."""
+        if not items:
+            return
+        try:
+            self.store.append_entries([payload for payload, _ in items], [meta for _, meta in items])
+            self.logger.debug(f"Memory writer flushed {len(items)} entries")
+        except Exception as e:
+            self.logger.error(f"Failed to write {len(items)} memory entries: {e}")
+            print(f"⚠️  ZIA MEMORY BRAIN CRITICAL ERROR: Unable to write memory batch - {e}")
+    
+    def _writer_loop(self) -> None:
+        """Background loop: gather entries into batches and write them."""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.sync_interval)
+            except queue.Empty:
+                try:
+                    self.store.sync_if_due()
+                except Exception as e:
+                    self.logger.error(f"Failed to sync memory log: {e}")
+                continue
+            batch: List[Tuple[bytes, tuple]] = []
+            barriers: List[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            
+            while True:
+                if item is self._STOP:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    # Flush barrier - write everything gathered so far right away
+                    barriers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.flush_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            
+            self._write_batch(batch)
+            for barrier in barriers:
+                barrier.set()
+            if stop:
+                return
+
+
+class _LogIndex:
+    """
+    Sidecar index over one encrypted memory log segment.
+    
+    Each entry gets one fixed-width binary record holding the byte offset and
+    length of the line (or block) that stores it, its timestamp (epoch seconds)
+    and keyed-hash tags of its brain and action. Block-format segments also
+    record the entry's slot within its block. Tags are truncated HMAC-SHA256
+    digests under a key derived from the memory key, so brain/action names never
+    appear in plaintext on disk while the index can still be loaded with a
+    single read and no decryption.
+    
+    The index is considered valid for the prefix of the segment it covers.
+    Anything written past that point is caught up on load through the segment's
+    scanner, and a segment that is shorter than the index forces a full rebuild.
+    """
+    
+    RECORD = struct.Struct('<QIdQQ')  # offset, length, epoch timestamp, brain tag, action tag
+    RECORD_SLOTTED = struct.Struct('<QIHdQQ')  # offset, length, slot in block, timestamp, brain tag, action tag
+    
+    def __init__(self, index_file_path: Path, encryption_key: bytes, logger: logging.Logger,
+                 with_slots: bool = False):
+        self.index_file_path = index_file_path
+        self.logger = logger
+        self.with_slots = with_slots
+        self.record = self.RECORD_SLOTTED if with_slots else self.RECORD
+        self._tag_key = hashlib.sha256(b"zia-memory-index:" + encryption_key).digest()
+        self._lock = threading.RLock()
+        self._handle = None
+        self._reset_memory()
+    
+    def _reset_memory(self) -> None:
+        self.offsets: List[int] = []
+        self.lengths: List[int] = []
+        self.slots: List[int] = []
+        self.timestamps: List[float] = []
+        self.brain_tags: List[int] = []
+        self.action_tags: List[int] = []
+        self._by_brain: Dict[int, List[int]] = {}
+        self._by_action: Dict[int, List[int]] = {}
+        self._sorted = True
+    
+    @property
+    def covered_bytes(self) -> int:
+        """Number of segment bytes described by the index."""
+        with self._lock:
+            if not self.offsets:
+                return 0
+            return self.offsets[-1] + self.lengths[-1]
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def tag(self, value: str) -> int:
+        """Keyed 64-bit tag for a brain or action name."""
+        digest = hmac.new(self._tag_key, value.encode('utf-8'), hashlib.sha256).digest()
+        return int.from_bytes(digest[:8], 'little')
+    
+    @staticmethod
+    def to_epoch(value: Union[str, float, int, datetime.datetime, None]) -> float:
+        """Convert an ISO timestamp, datetime or number to epoch seconds (0.0 if unknown)."""
+        if value is None:
+            return 0.0
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            if isinstance(value, str):
+                value = datetime.datetime.fromisoformat(value)
+            return value.timestamp()
+        except (ValueError, TypeError, OverflowError, OSError):
+            return 0.0
+    
+    def _add(self, offset: int, length: int, slot: int, timestamp: float, brain_tag: int, action_tag: int) -> None:
+        position = len(self.offsets)
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            self._sorted = False
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.slots.append(slot)
+        self.timestamps.append(timestamp)
+        self.brain_tags.append(brain_tag)
+        self.action_tags.append(action_tag)
+        self._by_brain.setdefault(brain_tag, []).append(position)
+        self._by_action.setdefault(action_tag, []).append(position)
+    
+    def _pack(self, fields: Tuple[int, int, int, float, int, int]) -> bytes:
+        if self.with_slots:
+            return self.record.pack(*fields)
+        offset, length, _, timestamp, brain_tag, action_tag = fields
+        return self.record.pack(offset, length, timestamp, brain_tag, action_tag)
+    
+    def _unpack(self, fields: tuple) -> Tuple[int, int, int, float, int, int]:
+        if self.with_slots:
+            return fields
+        offset, length, timestamp, brain_tag, action_tag = fields
+        return offset, length, 0, timestamp, brain_tag, action_tag
+    
+    def append(self, records: List[Tuple[int, int, int, str, str, str]]) -> None:
+        """
+        Append index records for freshly written entries.
+        
+        Args:
+            records: (offset, length, slot, timestamp, brain, action) per entry
+        """
+        with self._lock:
+            packed = []
+            for offset, length, slot, timestamp, brain, action in records:
+                fields = (offset, length, slot, self.to_epoch(timestamp), self.tag(brain), self.tag(action))
+                self._add(*fields)
+                packed.append(self._pack(fields))
+            if self._handle is None:
+                self._handle = open(self.index_file_path, 'ab')
+            self._handle.write(b''.join(packed))
+            self._handle.flush()
+    
+    def close(self) -> None:
+        """Close the append handle; it is reopened on the next append."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+    
+    def load(self, segment_size: int, scanner: Callable[[int], List[tuple]]) -> None:
+        """
+        Load the index from disk and bring it in line with its segment.
+        
+        Args:
+            segment_size (int): Current size of the segment file in bytes
+            scanner: Callable returning index records for the segment from a byte offset onwards
+        """
+        with self._lock:
+            self.close()
+            self._reset_memory()
+            
+            if self.index_file_path.exists():
+                data = self.index_file_path.read_bytes()
+                whole = len(data) - len(data) % self.record.size
+                if whole != len(data):
+                    self.logger.warning("Memory index has a torn tail record - truncating it")
+                    with open(self.index_file_path, 'r+b') as index_file:
+                        index_file.truncate(whole)
+                for fields in self.record.iter_unpack(data[:whole]):
+                    self._add(*self._unpack(fields))
+            
+            covered = self.covered_bytes
+            if covered > segment_size:
+                self.logger.warning("Memory index is ahead of its segment - rebuilding")
+                self.rebuild(scanner)
+            elif covered < segment_size:
+                records = scanner(covered)
+                if records:
+                    self.append(records)
+                    self.logger.info(f"Indexed {len(records)} memory log entries from byte {covered}")
+    
+    def rebuild(self, scanner: Callable[[int], List[tuple]]) -> int:
+        """
+        Discard the current index and rebuild it from the whole segment.
+        
+        Returns:
+            int: Number of entries indexed
+        """
+        with self._lock:
+            self.close()
+            self._reset_memory()
+            if self.index_file_path.exists():
+                self.index_file_path.unlink()
+            records = scanner(0)
+            if records:
+                self.append(records)
+            self.logger.info(f"Memory index rebuilt with {len(self)} entries")
+            return len(self)
+    
+    def positions(self, brain: Optional[str] = None, action: Optional[str] = None,
+                  since: Optional[float] = None, until: Optional[float] = None) -> List[int]:
+        """
+        Return the ascending index positions of entries matching every given filter.
+        
+        Brain/action matches are by tag, so callers must confirm them after decryption.
+        """
+        with self._lock:
+            candidates = None
+            for tags, value in ((self._by_brain, brain), (self._by_action, action)):
+                if value is None:
+                    continue
+                found = tags.get(self.tag(value), [])
+                if candidates is None or len(found) < len(candidates):
+                    candidates = found
+            
+            if candidates is None:
+                # No tag filter - narrow by time with bisect when the log is in order
+                lo, hi = 0, len(self.offsets)
+                if self._sorted:
+                    if since is not None:
+                        lo = bisect.bisect_left(self.timestamps, since)
+                    if until is not None:
+                        hi = bisect.bisect_right(self.timestamps, until)
+                candidates = range(lo, hi)
+            
+            brain_tag = self.tag(brain) if brain is not None else None
+            action_tag = self.tag(action) if action is not None else None
+            return [
+                pos for pos in candidates
+                if (brain_tag is None or self.brain_tags[pos] == brain_tag)
+                and (action_tag is None or self.action_tags[pos] == action_tag)
+                and (since is None or self.timestamps[pos] >= since)
+                and (until is None or self.timestamps[pos] <= until)
+            ]
+    
+    def location(self, position: int) -> Tuple[int, int, int]:
+        """(offset, length, slot) of the entry at an index position."""
+        with self._lock:
+            return self.offsets[position], self.lengths[position], self.slots[position]
+    
+    def time_range(self) -> Tuple[Optional[float], Optional[float]]:
+        """(oldest, newest) known entry timestamps, ignoring entries without one."""
+        with self._lock:
+            if not self.timestamps:
+                return None, None
+            if self._sorted and self.timestamps[0] > 0:
+                return self.timestamps[0], self.timestamps[-1]
+            known = [ts for ts in self.timestamps if ts > 0]
+            return (min(known), max(known)) if known else (None, None)
+
+
+def _corrupted_placeholder(error: Any, segment: Optional[int], line_number: Optional[int] = None,
+                           byte_offset: Optional[int] = None) -> Dict[str, Any]:
+    """Placeholder entry returned in place of data that could not be decrypted or parsed."""
+    return {
+        "timestamp": "unknown",
+        "brain": "MEMORY_BRAIN",
+        "action": "CORRUPTED_ENTRY",
+        "details": {
+            "segment": segment,
+            "line_number": line_number,
+            "byte_offset": byte_offset,
+            "error": str(error),
+            "status": "data_corruption_detected"
+        }
+    }
+
+
+def _decode_entry(cipher_suite: Fernet, line: bytes, logger: logging.Logger,
+                  line_number: Optional[int], byte_offset: int,
+                  segment: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Decrypt and parse one log line, returning a placeholder entry if it is corrupted.
+    
+    Args:
+        cipher_suite (Fernet): Cipher used to decrypt the line
+        line (bytes): The stripped Fernet token
+        logger (logging.Logger): Logger that receives corruption warnings
+        line_number (Optional[int]): 1-based line number within its segment, if known
+        byte_offset (int): Byte offset of the line within its segment file
+        segment (Optional[int]): Id of the segment holding the line
+        
+    Returns:
+        Dict[str, Any]: The decrypted entry or a CORRUPTED_ENTRY placeholder
+    """
+    try:
+        # Decrypt the line using Fernet cipher
+        decrypted_data = cipher_suite.decrypt(line)
+        
+        # Parse JSON back to dictionary
+        return json.loads(decrypted_data.decode('utf-8'))
+        
+    except Exception as line_error:
+        # Log corrupted entry but continue processing other entries
+        location = f"line {line_number}" if line_number is not None else f"byte {byte_offset}"
+        logger.warning(f"Corrupted log entry in segment {segment} at {location}: {line_error}")
+        return _corrupted_placeholder(line_error, segment, line_number, byte_offset)
+
+
+class _LogAggregates:
+    """
+    Rolling counters over the memory log, maintained as entries are appended.
+    
+    Every entry bumps a [total, success, failure] triple keyed by "BRAIN|ACTION",
+    once for all time and once in its hour and day buckets. Per-brain, per-action
+    and overall figures are summed from those keys on demand, which keeps the
+    snapshot small (there are only a few dozen brain/action pairs). An entry
+    counts as a success or failure when its details carry a boolean "success".
+    
+    The counters are saved as a small Fernet-encrypted snapshot together with the
+    number of entries they cover per segment. Anything appended after the last
+    save (e.g. before a crash) is recounted from the segments on the next start.
+    
+    All-time counters describe everything ever logged, so they survive retention
+    and compaction; only clear_log() resets them. Hour and day buckets are pruned
+    to `hours_kept` / `days_kept`.
+    """
+    
+    SNAPSHOT_VERSION = 1
+    GROUPS = ("brain", "action", "brain_action", "hour", "day")
+    
+    def __init__(self, snapshot_path: Path, cipher_suite: Fernet, logger: logging.Logger,
+                 save_interval: float = 30.0, hours_kept: int = 168, days_kept: int = 400):
+        self.snapshot_path = snapshot_path
+        self.cipher_suite = cipher_suite
+        self.logger = logger
+        self.save_interval = save_interval
+        self.hours_kept = hours_kept
+        self.days_kept = days_kept
+        self._lock = threading.RLock()
+        self._last_save = time.monotonic()
+        self._dirty = False
+        self.reset()
+    
+    def reset(self) -> None:
+        """Forget every counter."""
+        with self._lock:
+            self.all_time: Dict[str, List[int]] = {}
+            self.hours: Dict[str, Dict[str, List[int]]] = {}
+            self.days: Dict[str, Dict[str, List[int]]] = {}
+            # segment id -> number of entries of that segment already counted
+            self.covered: Dict[int, int] = {}
+            self._dirty = True
+    
+    @staticmethod
+    def _bump(counters: Dict[str, List[int]], key: str, success: Optional[bool]) -> None:
+        triple = counters.get(key)
+        if triple is None:
+            triple = counters[key] = [0, 0, 0]
+        triple[0] += 1
+        if success is True:
+            triple[1] += 1
+        elif success is False:
+            triple[2] += 1
+    
+    def add(self, timestamp: Any, brain: str, action: str, success: Optional[bool]) -> None:
+        """Count one entry."""
+        key = f"{brain}|{action}"
+        stamp = timestamp if isinstance(timestamp, str) else ""
+        with self._lock:
+            self._bump(self.all_time, key, success)
+            if len(stamp) >= 13:
+                self._bump(self.hours.setdefault(stamp[:13], {}), key, success)
+                self._bump(self.days.setdefault(stamp[:10], {}), key, success)
+            self._dirty = True
+    
+    def add_entry(self, entry: Dict[str, Any]) -> None:
+        """Count one decrypted log entry."""
+        details = entry.get("details")
+        success = details.get("success") if isinstance(details, dict) else None
+        self.add(entry.get("timestamp"), str(entry.get("brain", "")), str(entry.get("action", "")),
+                 success if isinstance(success, bool) else None)
+    
+    def mark_covered(self, segment_id: int, entries: int) -> None:
+        with self._lock:
+            self.covered[segment_id] = entries
+            self._dirty = True
+    
+    def load(self) -> bool:
+        """Load the saved snapshot. Returns False (and starts empty) if there is none or it is unreadable."""
+        with self._lock:
+            self.reset()
+            if not self.snapshot_path.exists():
+                return False
+            try:
+                snapshot = json.loads(self.cipher_suite.decrypt(self.snapshot_path.read_bytes()).decode('utf-8'))
+                self.all_time = snapshot["all_time"]
+                self.hours = snapshot["hours"]
+                self.days = snapshot["days"]
+                self.covered = {int(segment_id): count for segment_id, count in snapshot["covered"].items()}
+                self._dirty = False
+                return True
+            except Exception as e:
+                self.logger.warning(f"Memory aggregates snapshot unreadable, recounting: {e}")
+                self.reset()
+                return False
+    
+    def save(self, live_segment_ids: Optional[List[int]] = None) -> None:
+        """Prune old buckets and write the encrypted snapshot atomically."""
+        with self._lock:
+            if live_segment_ids is not None:
+                self.covered = {sid: n for sid, n in self.covered.items() if sid in set(live_segment_ids)}
+            for buckets, kept in ((self.hours, self.hours_kept), (self.days, self.days_kept)):
+                for old_key in sorted(buckets)[:-kept] if kept and len(buckets) > kept else []:
+                    del buckets[old_key]
+            snapshot = {"version": self.SNAPSHOT_VERSION, "all_time": self.all_time, "hours": self.hours,
+                        "days": self.days, "covered": {str(sid): n for sid, n in self.covered.items()}}
+            data = self.cipher_suite.encrypt(json.dumps(snapshot, separators=(',', ':')).encode('utf-8'))
+            temp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(temp_path, 'wb') as snapshot_file:
+                snapshot_file.write(data)
+            os.replace(temp_path, self.snapshot_path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+    
+    def save_due(self) -> bool:
+        """True when there are unsaved counts and `save_interval` seconds have passed."""
+        return self._dirty and time.monotonic() - self._last_save >= self.save_interval
+    
+    def query(self, group_by: Optional[str] = None, brain: Optional[str] = None,
+              action: Optional[str] = None, since: Optional[str] = None,
+              until: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Sum counters, optionally restricted to a brain/action and a time window, grouped by one dimension.
+        
+        `since`/`until` are ISO timestamps compared at bucket granularity: hour
+        buckets when the window starts within the kept hours, day buckets otherwise.
+        """
+        if group_by is not None and group_by not in self.GROUPS:
+            raise ValueError(f"Unknown aggregate grouping '{group_by}' (expected one of {self.GROUPS})")
+        
+        with self._lock:
+            if since is None and until is None and group_by not in ("hour", "day"):
+                sources = [(None, self.all_time)]
+            else:
+                use_hours = group_by == "hour" or (
+                    group_by != "day" and since is not None and self.hours and since[:13] >= min(self.hours))
+                buckets, width = (self.hours, 13) if use_hours else (self.days, 10)
+                low = since[:width] if since else None
+                high = until[:width] if until else None
+                sources = [(bucket, counters) for bucket, counters in sorted(buckets.items())
+                           if (low is None or bucket >= low) and (high is None or bucket <= high)]
+            
+            result = {"total": 0, "success": 0, "failure": 0}
+            groups: Dict[str, List[int]] = {}
+            for bucket, counters in sources:
+                for key, (total, successes, failures) in counters.items():
+                    entry_brain, _, entry_action = key.partition("|")
+                    if (brain is not None and entry_brain != brain) or (action is not None and entry_action != action):
+                        continue
+                    result["total"] += total
+                    result["success"] += successes
+                    result["failure"] += failures
+                    if group_by is None:
+                        continue
+                    group = {"brain": entry_brain, "action": entry_action, "brain_action": key,
+                             "hour": bucket, "day": bucket}[group_by]
+                    triple = groups.setdefault(group, [0, 0, 0])
+                    triple[0] += total
+                    triple[1] += successes
+                    triple[2] += failures
+            
+            if group_by is not None:
+                # Time buckets in chronological order, everything else busiest first
+                order = (lambda item: item[0]) if group_by in ("hour", "day") else (lambda item: -item[1][0])
+                result["groups"] = {group: {"total": t, "success": s, "failure": f}
+                                    for group, (t, s, f) in sorted(groups.items(), key=order)}
+            return result
+
+
+class _TextIndex:
+    """
+    Per-segment inverted index over the text in entries' `details` payloads.
+    
+    Entries are identified by their ordinal in the segment (the sidecar index
+    position for log segments, the entry number for archives). For each token
+    the index keeps a flat [ordinal, term frequency, ...] posting list, plus
+    per-entry timestamps and token counts for time filtering and BM25 ranking.
+    
+    The index is saved as one zlib-compressed, Fernet-encrypted file next to its
+    segment, so no plaintext words ever reach the disk. Sealed segments' text
+    indexes never change; the active one is extended as entries are appended
+    and saved along with the aggregates snapshot.
+    """
+    
+    TOKEN_PATTERN = re.compile(r"[^\W_]{2,}")
+    STOPWORDS = frozenset((
+        "the", "and", "for", "are", "was", "were", "you", "your", "with", "this", "that", "from",
+        "have", "has", "had", "not", "but", "all", "any", "can", "into", "about", "what", "when",
+        "who", "how", "its", "our", "out", "per", "true", "false", "none", "null",
+    ))
+    
+    def __init__(self, index_file_path: Path, cipher_suite: Fernet, logger: logging.Logger):
+        self.index_file_path = index_file_path
+        self.cipher_suite = cipher_suite
+        self.logger = logger
+        self._lock = threading.RLock()
+        self.timestamps: List[float] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.total_length = 0
+        self.dirty = False
+    
+    @classmethod
+    def tokenize(cls, value: Any) -> List[str]:
+        """Lower-cased word tokens from every string (and dict key) inside a details payload."""
+        tokens: List[str] = []
+        pending = [value]
+        while pending:
+            item = pending.pop()
+            if isinstance(item, str):
+                tokens.extend(token for token in cls.TOKEN_PATTERN.findall(item.lower())
+                              if token not in cls.STOPWORDS)
+            elif isinstance(item, dict):
+                pending.extend(item.values())
+                pending.extend(key for key in item if isinstance(key, str))
+            elif isinstance(item, (list, tuple)):
+                pending.extend(item)
+        return tokens
+    
+    @property
+    def covered(self) -> int:
+        """Number of segment entries already indexed (including skipped ones)."""
+        return len(self.timestamps)
+    
+    def add(self, ordinal: int, entry: Optional[Dict[str, Any]]) -> None:
+        """
+        Index one entry at its segment ordinal (None records an unindexable entry).
+        """
+        with self._lock:
+            while len(self.timestamps) < ordinal:
+                self.timestamps.append(0.0)
+                self.lengths.append(0)
+            if ordinal < len(self.timestamps):
+                return  # Already indexed
+            tokens = self.tokenize(entry.get("details")) if entry is not None else []
+            self.timestamps.append(_LogIndex.to_epoch(entry.get("timestamp")) if entry is not None else 0.0)
+            self.lengths.append(len(tokens))
+            self.total_length += len(tokens)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, frequency in counts.items():
+                self.postings.setdefault(token, []).extend((ordinal, frequency))
+            self.dirty = True
+    
+    def load(self) -> bool:
+        """Load the saved index. Returns False (leaving it empty) if it is missing or unreadable."""
+        with self._lock:
+            if not self.index_file_path.exists():
+                return False
+            try:
+                data = json.loads(zlib.decompress(self.cipher_suite.decrypt(self.index_file_path.read_bytes())))
+                self.timestamps = data["timestamps"]
+                self.lengths = data["lengths"]
+                self.postings = data["postings"]
+                self.total_length = sum(self.lengths)
+                self.dirty = False
+                return True
+            except Exception as e:
+                self.logger.warning(f"Memory text index {self.index_file_path.name} unreadable, rebuilding: {e}")
+                self.timestamps, self.lengths, self.postings, self.total_length = [], [], {}, 0
+                return False
+    
+    def save(self) -> None:
+        with self._lock:
+            data = json.dumps({"timestamps": self.timestamps, "lengths": self.lengths, "postings": self.postings},
+                              separators=(',', ':')).encode('utf-8')
+            token = self.cipher_suite.encrypt(zlib.compress(data, 6))
+            temp_path = self.index_file_path.with_suffix(".tmp")
+            with open(temp_path, 'wb') as index_file:
+                index_file.write(token)
+            os.replace(temp_path, self.index_file_path)
+            self.dirty = False
+    
+    def matches(self, terms: List[str], since: Optional[float] = None,
+                until: Optional[float] = None) -> Dict[int, Dict[str, int]]:
+        """Map ordinal -> {term: frequency} for entries in the time window containing any of the terms."""
+        with self._lock:
+            found: Dict[int, Dict[str, int]] = {}
+            for term in terms:
+                postings = self.postings.get(term, [])
+                for i in range(0, len(postings), 2):
+                    ordinal = postings[i]
+                    timestamp = self.timestamps[ordinal]
+                    if (since is not None and timestamp < since) or (until is not None and timestamp > until):
+                        continue
+                    found.setdefault(ordinal, {})[term] = postings[i + 1]
+            return found
+
+
+class _BlockCodec:
+    """
+    Framed block format for memory segments.
+    
+    Instead of one Fernet token per entry, a whole write batch becomes one block:
+    the entries' JSON lines are zlib-compressed and sealed with AES-256-GCM. On
+    disk a block segment is an 8-byte magic header followed by frames of
+    
+        [4-byte big-endian body length][12-byte nonce][ciphertext + 16-byte GCM tag]
+    
+    The segment id and the frame's byte offset are bound in as associated data,
+    so a modified, swapped or transplanted block fails authentication, and a
+    frame whose body runs past the end of the file is reported as truncated.
+    
+    The AES key is derived from the memory key with HKDF, so no extra key file
+    is needed.
+    """
+    
+    MAGIC = b"ZIAMEMB1"
+    FRAME_HEADER = struct.Struct('>I')
+    NONCE_SIZE = 12
+    
+    _instances: Dict[bytes, "_BlockCodec"] = {}
+    _instances_lock = threading.Lock()
+    
+    @classmethod
+    def for_key(cls, encryption_key: bytes) -> "_BlockCodec":
+        """Shared codec for a memory key, so the HKDF derivation runs once per process."""
+        with cls._instances_lock:
+            codec = cls._instances.get(encryption_key)
+            if codec is None:
+                codec = cls._instances[encryption_key] = cls(encryption_key)
+            return codec
+    
+    def __init__(self, encryption_key: bytes):
+        block_key = HKDF(algorithm=hashes.SHA256(), length=32, salt=None,
+                         info=b"zia-memory-block-v1").derive(base64.urlsafe_b64decode(encryption_key))
+        self._aead = AESGCM(block_key)
+    
+    @staticmethod
+    def _associated_data(segment_id: int, offset: int) -> bytes:
+        return b"ZIAB" + struct.pack('>QQ', segment_id, offset)
+    
+    def encode(self, segment_id: int, offset: int, payloads: List[bytes]) -> bytes:
+        """Build the frame for a block of serialized entries written at `offset`."""
+        nonce = os.urandom(self.NONCE_SIZE)
+        sealed = self._aead.encrypt(nonce, zlib.compress(b'\n'.join(payloads), 6),
+                                    self._associated_data(segment_id, offset))
+        return self.FRAME_HEADER.pack(len(nonce) + len(sealed)) + nonce + sealed
+    
+    def decode(self, segment_id: int, offset: int, body: bytes) -> List[bytes]:
+        """Authenticate, decrypt and decompress a frame body back into serialized entries."""
+        nonce, sealed = body[:self.NONCE_SIZE], body[self.NONCE_SIZE:]
+        plain = self._aead.decrypt(nonce, sealed, self._associated_data(segment_id, offset))
+        return zlib.decompress(plain).split(b'\n')
+    
+    def iter_frames(self, log_file, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int, Optional[bytes]]]:
+        """
+        Yield (offset, frame length, body) for the frames in [start, end).
+        
+        A truncated final frame is yielded once with a body of None.
+        """
+        if end is None:
+            log_file.seek(0, os.SEEK_END)
+            end = log_file.tell()
+        if end == 0:
+            return
+        log_file.seek(0)
+        if log_file.read(len(self.MAGIC)) != self.MAGIC:
+            raise ValueError("not a ZIA block-format memory segment")
+        offset = max(start, len(self.MAGIC))
+        log_file.seek(offset)
+        while offset < end:
+            header = log_file.read(self.FRAME_HEADER.size)
+            if len(header) < self.FRAME_HEADER.size:
+                yield offset, end - offset, None
+                return
+            (length,) = self.FRAME_HEADER.unpack(header)
+            body = log_file.read(length)
+            if len(body) < length:
+                yield offset, end - offset, None
+                return
+            yield offset, self.FRAME_HEADER.size + length, body
+            offset += self.FRAME_HEADER.size + length
+
+
+# Process-wide cache of memory keys and their Fernet ciphers: key file path -> (mtime_ns, key, cipher)
+_KEY_CACHE: Dict[str, Tuple[int, bytes, Fernet]] = {}
+_KEY_CACHE_LOCK = threading.Lock()
+
+# Per-process ciphers for parallel reads, created once by the pool initializer
+_worker_cipher: Optional[Fernet] = None
+_worker_codec: Optional[_BlockCodec] = None
+
+
+def _init_decrypt_worker(encryption_key: bytes) -> None:
+    """Process pool initializer: build the ciphers once per worker process."""
+    global _worker_cipher, _worker_codec
+    _worker_cipher = Fernet(encryption_key)
+    _worker_codec = _BlockCodec(encryption_key)
+
+
+def _decrypt_chunk(task: Tuple[str, int, int, int, str]) -> Tuple[List[Tuple[float, Dict[str, Any]]], int]:
+    """
+    Decrypt and parse one line- or frame-aligned byte range of a segment (runs in a worker process).
+    
+    Args:
+        task: (segment file path, start offset, end offset, segment id, segment format)
+        
+    Returns:
+        ((sort_key, entry) pairs in file order, number of lines in the chunk). Corrupted
+        entries carry chunk-relative line numbers and inherit the previous entry's
+        sort key so they stay in place when chunks are merged.
+    """
+    path, start, end, segment_id, segment_format = task
+    logger = logging.getLogger(__name__)
+    results: List[Tuple[float, Dict[str, Any]]] = []
+    last_key = 0.0
+    
+    if segment_format == "block":
+        with open(path, 'rb') as log_file:
+            for entry in _SegmentStore.decode_frames(_worker_codec, log_file, segment_id, logger, start, end):
+                last_key = _LogIndex.to_epoch(entry.get("timestamp")) or last_key
+                results.append((last_key, entry))
+        return results, 0
+    
+    line_number = 0
+    with open(path, 'rb') as log_file:
+        log_file.seek(start)
+        data = log_file.read(end - start)
+    byte_offset = start
+    for raw_line in data.split(b'\n'):
+        line_number += 1
+        line = raw_line.strip()
+        if line:
+            entry = _decode_entry(_worker_cipher, line, logger, line_number, byte_offset, segment_id)
+            last_key = _LogIndex.to_epoch(entry.get("timestamp")) or last_key
+            results.append((last_key, entry))
+        byte_offset += len(raw_line) + 1
+    # A chunk ending in a newline produces one empty trailing piece that is not a line
+    return results, line_number - (1 if data.endswith(b'\n') else 0)
+
+
+class _SegmentStore:
+    """
+    Segmented on-disk layout for the memory black box.
+    
+    Entries are appended to an active segment file with its own sidecar index.
+    Segments come in two on-disk formats: "line" (one Fernet token per entry per
+    line, the original format) and "block" (one AES-GCM frame per write batch, see
+    _BlockCodec). New segments use the configured format; existing segments keep
+    theirs until migrated. The manifest records the format too, so a store that
+    was migrated to blocks keeps writing blocks even if the configuration still
+    says "line". When the active segment grows past `max_segment_bytes`
+    or is older than `max_segment_age` seconds it is sealed and a new one is
+    started. An encrypted manifest records, per sealed segment, its entry count,
+    byte size and time range, so statistics and retention decisions never have
+    to touch the segment files themselves.
+    
+    Old sealed segments can be compacted into a single archive segment: the
+    decrypted entries are written as JSON lines, zlib-compressed and encrypted as
+    one token. Archives are smaller but can only be read as a whole.
+    
+    A pre-segmentation `memory_log.json.encrypted` file is adopted as the first
+    (sealed) segment on first start.
+    
+    Durability is configurable: "none" leaves flushing to the OS, "batch" fsyncs
+    the active segment every `fsync_batch_entries` entries or
+    `fsync_batch_interval` seconds, and "entry" fsyncs after every write. Whatever
+    the mode, the tail of the active segment is checked on open and a record
+    torn by a crash is cut off before anything else is appended.
+    """
+    
+    MANIFEST_VERSION = 1
+    FORMATS = ("line", "block")
+    TEXT_CACHE_SIZE = 8  # Sealed segments' text indexes kept in memory between searches
+    DURABILITY_MODES = ("none", "batch", "entry")
+    
+    def __init__(self, directory: Path, cipher_suite: Fernet, encryption_key: bytes,
+                 logger: logging.Logger, max_segment_bytes: int = 8 * 1024 * 1024,
+                 max_segment_age: Optional[float] = 24 * 3600,
+                 retention_max_age: Optional[float] = None,
+                 retention_max_bytes: Optional[int] = None,
+                 compact_after: Optional[float] = None,
+                 log_format: str = "line",
+                 aggregate_save_interval: float = 30.0,
+                 durability: str = "none",
+                 fsync_batch_entries: int = 256,
+                 fsync_batch_interval: float = 1.0):
+        if log_format not in self.FORMATS:
+            raise ValueError(f"Unknown memory log format '{log_format}' (expected one of {self.FORMATS})")
+        if durability not in self.DURABILITY_MODES:
+            raise ValueError(f"Unknown memory durability mode '{durability}' (expected one of {self.DURABILITY_MODES})")
+        self.directory = directory
+        self.manifest_path = directory / "manifest.encrypted"
+        self.cipher_suite = cipher_suite
+        self.codec = _BlockCodec.for_key(encryption_key)
+        self.encryption_key = encryption_key
+        self.logger = logger
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.retention_max_age = retention_max_age
+        self.retention_max_bytes = retention_max_bytes
+        self.compact_after = compact_after
+        self.log_format = log_format
+        self.durability = durability
+        self.fsync_batch_entries = max(1, int(fsync_batch_entries))
+        self.fsync_batch_interval = fsync_batch_interval
+        
+        self._lock = threading.RLock()
+        self._handle = None
+        self._unsynced = 0  # Entries written to the active segment but not yet fsynced
+        self._last_sync = time.monotonic()
+        self._indexes: Dict[int, _LogIndex] = {}
+        self.segments: List[Dict[str, Any]] = []
+        self.next_id = 1
+        self._texts: "OrderedDict[int, _TextIndex]" = OrderedDict()
+        self.aggregates = _LogAggregates(directory / "aggregates.encrypted", cipher_suite, logger,
+                                         save_interval=aggregate_save_interval)
+    
+    # ------------------------------------------------------------------ setup
+    
+    def open(self, legacy_log_path: Path, legacy_index_path: Path) -> None:
+        """Load the manifest, migrating a legacy single-file log if there is no manifest yet."""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if self.manifest_path.exists():
+                manifest = json.loads(self.cipher_suite.decrypt(self.manifest_path.read_bytes()).decode('utf-8'))
+                self.segments = manifest.get("segments", [])
+                self.next_id = manifest.get("next_id", len(self.segments) + 1)
+                if manifest.get("log_format") == "block":
+                    self.log_format = "block"  # Migrated (or configured) once - never go back to line
+            elif legacy_log_path.exists():
+                self._adopt_legacy_log(legacy_log_path, legacy_index_path)
+            
+            if not self.segments or self.segments[-1].get("sealed"):
+                self._start_segment()
+            else:
+                self._repair_tail(self.active)
+                # Bring the active segment's index up to date with its file
+                self._index_for(self.active)
+            
+            self.aggregates.load()
+            self._catch_up_aggregates()
+    
+    def _catch_up_aggregates(self) -> None:
+        """Count entries that the aggregates snapshot does not cover yet (first start, or after a crash)."""
+        recounted = 0
+        for segment in self.segments:
+            entries = self._live_stats(segment)["entries"]
+            counted = self.aggregates.covered.get(segment["id"], 0)
+            if entries <= counted or not self.path_of(segment).exists():
+                continue
+            readable = (entry for entry in self.iter_entries(segment) if entry.get("action") != "CORRUPTED_ENTRY")
+            for entry in itertools.islice(readable, counted, None):
+                self.aggregates.add_entry(entry)
+                recounted += 1
+            self.aggregates.mark_covered(segment["id"], entries)
+        if recounted:
+            self.logger.info(f"Memory aggregates caught up with {recounted} entries")
+            self.checkpoint()
+    
+    def checkpoint(self) -> None:
+        """Persist the aggregates snapshot and every text index with unsaved entries."""
+        with self._lock:
+            self.aggregates.save([segment["id"] for segment in self.segments])
+            for text_index in self._texts.values():
+                if text_index.dirty:
+                    text_index.save()
+    
+    def _adopt_legacy_log(self, legacy_log_path: Path, legacy_index_path: Path) -> None:
+        """Move the old single log file (and its index) in as a sealed first segment."""
+        segment = self._new_segment_record("line")
+        # The legacy file was the one being appended to, so it may end in a torn line
+        self._repair_line_tail(legacy_log_path, "legacy")
+        os.replace(legacy_log_path, self.directory / segment["file"])
+        if legacy_index_path.exists():
+            os.replace(legacy_index_path, self.directory / segment["index"])
+        self.segments.append(segment)
+        self._seal(segment)
+        self.logger.info(f"Adopted legacy memory log as segment {segment['id']} ({segment['entries']} entries)")
+    
+    def _new_segment_record(self, segment_format: Optional[str] = None) -> Dict[str, Any]:
+        segment_format = segment_format or self.log_format
+        segment_id = self.next_id
+        self.next_id += 1
+        stem = f"segment_{segment_id:06d}"
+        return {
+            "id": segment_id,
+            "kind": "log",
+            "format": segment_format,
+            "file": f"{stem}.log.encrypted" if segment_format == "line" else f"{stem}.blk.encrypted",
+            "index": f"{stem}.index" if segment_format == "line" else f"{stem}.bindex",
+            "created": time.time(),
+            "sealed": False,
+            "entries": 0,
+            "bytes": 0,
+            "first_ts": None,
+            "last_ts": None,
+        }
+    
+    def _start_segment(self) -> Dict[str, Any]:
+        segment = self._new_segment_record()
+        self.segments.append(segment)
+        # Record the segment in the manifest before its file exists
+        self._save_manifest()
+        self.logger.debug(f"Started memory segment {segment['id']} ({segment['format']} format)")
+        return segment
+    
+    def _save_manifest(self) -> None:
+        manifest = {"version": self.MANIFEST_VERSION, "next_id": self.next_id, "segments": self.segments,
+                    "log_format": self.log_format}
+        data = self.cipher_suite.encrypt(json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        with open(temp_path, 'wb') as manifest_file:
+            manifest_file.write(data)
+            if self.durability != "none":
+                manifest_file.flush()
+                os.fsync(manifest_file.fileno())
+        os.replace(temp_path, self.manifest_path)
+    
+    def _repair_tail(self, segment: Dict[str, Any]) -> None:
+        """Cut a record torn by a crash off the end of a segment so appends start on a clean boundary."""
+        path = self.path_of(segment)
+        if not path.exists():
+            return
+        if segment.get("format", "line") == "line":
+            self._repair_line_tail(path, segment["id"])
+            return
+        with open(path, 'r+b') as log_file:
+            size = os.fstat(log_file.fileno()).st_size
+            good_end = 0  # A header cut short by a crash is dropped entirely
+            try:
+                for offset, length, body in self.codec.iter_frames(log_file):
+                    if body is None:
+                        break
+                    good_end = offset + length
+                else:
+                    good_end = size
+            except ValueError as header_error:
+                if size >= len(_BlockCodec.MAGIC):
+                    # Not something we can append to - keep it for inspection and move on
+                    self.logger.error(f"Memory segment {segment['id']} has a damaged header, sealing it: {header_error}")
+                    log_file.close()
+                    self._seal(segment)
+                    self._start_segment()
+                    return
+            if good_end < size:
+                log_file.truncate(good_end)
+                self.logger.warning(f"Truncated {size - good_end} torn bytes from memory segment {segment['id']}")
+    
+    def _repair_line_tail(self, path: Path, segment_id: Any) -> None:
+        """Line segments: every complete entry ends in a newline, so anything after the last one is torn."""
+        with open(path, 'r+b') as log_file:
+            size = os.fstat(log_file.fileno()).st_size
+            if size == 0:
+                return
+            log_file.seek(size - 1)
+            if log_file.read(1) == b'\n':
+                return
+            # Walk back block by block to the last newline
+            position = size
+            good_end = 0
+            while position > 0:
+                read_size = min(64 * 1024, position)
+                position -= read_size
+                log_file.seek(position)
+                newline = log_file.read(read_size).rfind(b'\n')
+                if newline != -1:
+                    good_end = position + newline + 1
+                    break
+            log_file.truncate(good_end)
+            self.logger.warning(f"Truncated {size - good_end} torn bytes from memory segment {segment_id}")
+    
+    # ---------------------------------------------------------------- helpers
+    
+    @property
+    def active(self) -> Dict[str, Any]:
+        return self.segments[-1]
+    
+    def path_of(self, segment: Dict[str, Any]) -> Path:
+        return self.directory / segment["file"]
+    
+    def _index_for(self, segment: Dict[str, Any]) -> _LogIndex:
+        """Sidecar index of a log segment, loaded (and caught up) on first use."""
+        with self._lock:
+            index = self._indexes.get(segment["id"])
+            if index is None:
+                index = _LogIndex(self.directory / segment["index"], self.encryption_key, self.logger,
+                                  with_slots=segment.get("format") == "block")
+                path = self.path_of(segment)
+                size = path.stat().st_size if path.exists() else 0
+                scanner = lambda start, segment=segment: self._scan_records(segment, start)
+                try:
+                    index.load(size, scanner)
+                except Exception as e:
+                    self.logger.error(f"Failed to load index of segment {segment['id']}, rebuilding: {e}")
+                    index.rebuild(scanner)
+                self._indexes[segment["id"]] = index
+            return index
+    
+    def text_path_of(self, segment: Dict[str, Any]) -> Path:
+        return self.directory / (segment["file"].split(".", 1)[0] + ".tindex")
+    
+    def text_index_for(self, segment: Dict[str, Any]) -> _TextIndex:
+        """
+        Full-text index of a segment, loaded on first use and brought up to date
+        with the segment (sealed segments that were never indexed are indexed now).
+        """
+        with self._lock:
+            text_index = self._texts.get(segment["id"])
+            if text_index is not None:
+                self._texts.move_to_end(segment["id"])
+            else:
+                text_index = _TextIndex(self.text_path_of(segment), self.cipher_suite, self.logger)
+                text_index.load()
+                self._texts[segment["id"]] = text_index
+                # Keep the active segment's index; evict the least recently searched sealed ones
+                while len(self._texts) > self.TEXT_CACHE_SIZE:
+                    victim = next(sid for sid in self._texts if sid != self.active["id"])
+                    evicted = self._texts.pop(victim)
+                    if evicted.dirty:
+                        evicted.save()
+            
+            start = text_index.covered
+            if segment["kind"] == "archive":
+                if start < segment["entries"]:
+                    for ordinal, entry in enumerate(self.iter_archive(segment)):
+                        if ordinal >= start:
+                            text_index.add(ordinal, None if entry.get("action") == "CORRUPTED_ENTRY" else entry)
+            elif self.path_of(segment).exists():
+                index = self._index_for(segment)
+                if start < len(index):
+                    for position, entry in self.read_positions(segment, index, range(start, len(index))):
+                        text_index.add(position, entry)
+            if text_index.dirty and segment.get("sealed"):
+                text_index.save()
+            return text_index
+    
+    def _scan_records(self, segment: Dict[str, Any], start: int) -> List[Tuple[int, int, int, Any, str, str]]:
+        """Decrypt a segment from `start` onwards and produce index records for it."""
+        records = []
+        path = self.path_of(segment)
+        if not path.exists():
+            return records
+        
+        def record_for(payload: bytes, offset: int, length: int, slot: int) -> None:
+            entry = json.loads(payload.decode('utf-8'))
+            records.append((offset, length, slot, entry.get('timestamp'),
+                            str(entry.get('brain', '')), str(entry.get('action', ''))))
+        
+        with open(path, 'rb') as log_file:
+            if segment.get("format") == "block":
+                try:
+                    frames = list(self.codec.iter_frames(log_file, start))
+                except ValueError as header_error:
+                    self.logger.warning(f"Cannot index memory segment {segment['id']}: {header_error}")
+                    return records
+                for offset, length, body in frames:
+                    try:
+                        if body is None:
+                            raise ValueError("truncated block")
+                        for slot, payload in enumerate(self.codec.decode(segment["id"], offset, body)):
+                            record_for(payload, offset, length, slot)
+                    except Exception as block_error:
+                        error = str(block_error) or type(block_error).__name__
+                        self.logger.warning(f"Skipping unreadable block at byte {offset} of segment {segment['id']} while indexing: {error}")
+                return records
+            
+            log_file.seek(start)
+            offset = start
+            for raw_line in log_file:
+                line = raw_line.strip()
+                if line:
+                    try:
+                        record_for(self.cipher_suite.decrypt(line), offset, len(raw_line), 0)
+                    except Exception as line_error:
+                        self.logger.warning(f"Skipping unreadable log entry at byte {offset} of segment {segment['id']} while indexing: {line_error}")
+                offset += len(raw_line)
+        return records
+    
+    def _live_stats(self, segment: Dict[str, Any]) -> Dict[str, Any]:
+        """Manifest record for sealed segments, index-derived figures for the active one."""
+        if segment.get("sealed"):
+            return segment
+        index = self._index_for(segment)
+        first_ts, last_ts = index.time_range()
+        return {**segment, "entries": len(index), "bytes": index.covered_bytes,
+                "first_ts": first_ts, "last_ts": last_ts}
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Copy of the segment list (oldest first) with up-to-date stats."""
+        with self._lock:
+            return [dict(self._live_stats(segment)) for segment in self.segments]
+    
+    # ---------------------------------------------------------------- writing
+    
+    def append_entries(self, payloads: List[bytes], metas: List[Tuple[str, str, str, Optional[bool]]]) -> None:
+        """
+        Encrypt and append serialized entries to the active segment.
+        
+        Rotates first if the active segment is full or too old. Line segments get
+        one Fernet token per entry; block segments get the whole batch as one frame.
+        """
+        with self._lock:
+            if self._should_rotate():
+                self.rotate()
+            segment = self.active
+            # Resolve the indexes before writing so a first-time load doesn't pick up these entries
+            index = self._index_for(segment)
+            text_index = self.text_index_for(segment)
+            if self._handle is None:
+                self._handle = open(self.path_of(segment), 'ab')
+            offset = self._handle.tell()
+            
+            records = []
+            if segment.get("format") == "block":
+                if offset == 0:
+                    self._handle.write(_BlockCodec.MAGIC)
+                    offset = len(_BlockCodec.MAGIC)
+                frame = self.codec.encode(segment["id"], offset, payloads)
+                self._handle.write(frame)
+                for slot, (timestamp, brain, action, _) in enumerate(metas):
+                    records.append((offset, len(frame), slot, timestamp, brain, action))
+            else:
+                lines = [self.cipher_suite.encrypt(payload) + b'\n' for payload in payloads]
+                self._handle.write(b''.join(lines))
+                for line, (timestamp, brain, action, _) in zip(lines, metas):
+                    records.append((offset, len(line), 0, timestamp, brain, action))
+                    offset += len(line)
+            self._handle.flush()
+            self._unsynced += len(payloads)
+            if self.durability == "entry" or (self.durability == "batch" and self._sync_due()):
+                self.sync()
+            first_position = len(index)
+            index.append(records)
+            
+            for position, payload in enumerate(payloads, first_position):
+                text_index.add(position, json.loads(payload))
+            for timestamp, brain, action, success in metas:
+                self.aggregates.add(timestamp, brain, action, success)
+            self.aggregates.mark_covered(segment["id"], len(index))
+            if self.aggregates.save_due():
+                self.checkpoint()
+    
+    def _sync_due(self) -> bool:
+        return (self._unsynced >= self.fsync_batch_entries
+                or time.monotonic() - self._last_sync >= self.fsync_batch_interval)
+    
+    def sync(self) -> None:
+        """fsync the active segment if anything was written to it since the last sync."""
+        with self._lock:
+            if self._handle is not None and self._unsynced:
+                os.fsync(self._handle.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+    
+    def sync_if_due(self) -> None:
+        """Called by the idle writer thread: sync in "batch" mode once the time bound has passed."""
+        with self._lock:
+            if self.durability == "batch" and self._unsynced and self._sync_due():
+                self.sync()
+    
+    def _should_rotate(self) -> bool:
+        segment = self.active
+        index = self._index_for(segment)
+        if len(index) == 0:
+            return False
+        if self.max_segment_bytes and index.covered_bytes >= self.max_segment_bytes:
+            return True
+        if self.max_segment_age and time.time() - segment["created"] >= self.max_segment_age:
+            return True
+        return False
+    
+    def _seal(self, segment: Dict[str, Any]) -> None:
+        """Freeze a log segment's stats into its manifest record."""
+        segment.update(self._live_stats({**segment, "sealed": False}))
+        segment["sealed"] = True
+        index = self._indexes.pop(segment["id"], None)
+        if index is not None:
+            index.close()
+    
+    def rotate(self) -> None:
+        """Seal the active segment and start a new one, then apply retention and compaction."""
+        with self._lock:
+            self.release()
+            self._seal(self.active)
+            self._start_segment()
+            self.logger.info(f"Memory log rotated to segment {self.active['id']}")
+            if self.retention_max_age or self.retention_max_bytes:
+                self.apply_retention()
+            if self.compact_after:
+                self.compact(self.compact_after)
+            self.checkpoint()
+    
+    def release(self) -> None:
+        """Close the active segment's append handle; it is reopened on the next write."""
+        with self._lock:
+            if self._handle is not None:
+                try:
+                    if self.durability != "none":
+                        self.sync()
+                    self._handle.close()
+                finally:
+                    self._handle = None
+    
+    def close(self) -> None:
+        with self._lock:
+            self.release()
+            if self.aggregates._dirty or any(text_index.dirty for text_index in self._texts.values()):
+                self.checkpoint()
+            for index in self._indexes.values():
+                index.close()
+            self._indexes.clear()
+    
+    def _delete_segment_files(self, segment: Dict[str, Any]) -> None:
+        index = self._indexes.pop(segment["id"], None)
+        if index is not None:
+            index.close()
+        self._texts.pop(segment["id"], None)
+        for name in (segment.get("file"), segment.get("index"), self.text_path_of(segment).name):
+            if name and (self.directory / name).exists():
+                (self.directory / name).unlink()
+    
+    def clear(self) -> None:
+        """Delete every segment and start over with an empty active segment."""
+        with self._lock:
+            self.release()
+            for segment in self.segments:
+                self._delete_segment_files(segment)
+            self.segments = []
+            self._start_segment()
+            self.aggregates.reset()
+            self.checkpoint()
+    
+    def rebuild_indexes(self) -> int:
+        """Rebuild the sidecar index of every log segment. Returns the number of entries indexed."""
+        with self._lock:
+            total = 0
+            for segment in self.segments:
+                if segment["kind"] == "log":
+                    total += self._index_for(segment).rebuild(
+                        lambda start, segment=segment: self._scan_records(segment, start))
+                    # Text index ordinals follow index positions - rebuild it lazily from scratch
+                    self._texts.pop(segment["id"], None)
+                    if self.text_path_of(segment).exists():
+                        self.text_path_of(segment).unlink()
+            return total
+    
+    # -------------------------------------------------------------- retention
+    
+    def apply_retention(self, max_age: Optional[float] = None, max_bytes: Optional[int] = None) -> int:
+        """
+        Delete whole sealed segments that fall outside the retention policy.
+        
+        Args:
+            max_age (Optional[float]): Drop segments whose newest entry is older than this many seconds
+            max_bytes (Optional[int]): Drop oldest segments until the total size fits
+            
+        Returns:
+            int: Number of segments removed
+        """
+        max_age = max_age if max_age is not None else self.retention_max_age
+        max_bytes = max_bytes if max_bytes is not None else self.retention_max_bytes
+        with self._lock:
+            doomed = []
+            if max_age:
+                cutoff = time.time() - max_age
+                doomed = [seg for seg in self.segments[:-1]
+                          if seg.get("sealed") and seg.get("last_ts") is not None and seg["last_ts"] < cutoff]
+            if max_bytes:
+                total = sum(self._live_stats(seg)["bytes"] for seg in self.segments if seg not in doomed)
+                for seg in self.segments[:-1]:
+                    if total <= max_bytes:
+                        break
+                    if seg not in doomed:
+                        doomed.append(seg)
+                        total -= seg["bytes"]
+            
+            for segment in doomed:
+                self._delete_segment_files(segment)
+                self.segments.remove(segment)
+            if doomed:
+                self._save_manifest()
+                self.logger.info(f"Memory retention removed {len(doomed)} segment(s)")
+            return len(doomed)
+    
+    # ------------------------------------------------------------- compaction
+    
+    def compact(self, older_than: float = 7 * 24 * 3600) -> int:
+        """
+        Merge consecutive sealed log segments older than `older_than` seconds into one archive.
+        
+        Returns:
+            int: Number of segments merged (0 if nothing qualified)
+        """
+        with self._lock:
+            cutoff = time.time() - older_than
+            start = next((i for i, seg in enumerate(self.segments) if seg["kind"] == "log"), None)
+            if start is None:
+                return 0
+            run = []
+            for segment in self.segments[start:-1]:
+                if segment["kind"] != "log" or not segment.get("sealed"):
+                    break
+                if segment.get("last_ts") is not None and segment["last_ts"] >= cutoff:
+                    break
+                run.append(segment)
+            if not run:
+                return 0
+            
+            archive = {
+                "id": run[0]["id"],
+                "kind": "archive",
+                "file": f"archive_{run[0]['id']:06d}_{run[-1]['id']:06d}.log.encrypted",
+                "index": None,
+                "created": time.time(),
+                "sealed": True,
+                "entries": 0,
+                "bytes": 0,
+                "first_ts": run[0].get("first_ts"),
+                "last_ts": run[-1].get("last_ts"),
+                "merged": [seg["id"] for seg in run],
+            }
+            compressor = zlib.compressobj(9)
+            chunks = []
+            archive_text = _TextIndex(self.text_path_of(archive), self.cipher_suite, self.logger)
+            for segment in run:
+                for entry in self.iter_entries(segment):
+                    chunks.append(compressor.compress(
+                        json.dumps(entry, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'))
+                    archive_text.add(archive["entries"], None if entry.get("action") == "CORRUPTED_ENTRY" else entry)
+                    archive["entries"] += 1
+            chunks.append(compressor.flush())
+            
+            token = self.cipher_suite.encrypt(b''.join(chunks))
+            temp_path = (self.directory / archive["file"]).with_suffix(".tmp")
+            with open(temp_path, 'wb') as archive_file:
+                archive_file.write(token)
+            os.replace(temp_path, self.directory / archive["file"])
+            archive["bytes"] = len(token)
+            archive_text.save()
+            
+            # Swap the run for the archive in the manifest before deleting anything
+            position = self.segments.index(run[0])
+            self.segments[position:position + len(run)] = [archive]
+            self._save_manifest()
+            self.aggregates.mark_covered(archive["id"], sum(self.aggregates.covered.get(seg["id"], 0) for seg in run))
+            self.checkpoint()
+            for segment in run:
+                self._delete_segment_files(segment)
+            
+            self.logger.info(f"Compacted {len(run)} memory segments into archive ({archive['entries']} entries, {archive['bytes']} bytes)")
+            return len(run)
+    
+    # -------------------------------------------------------------- migration
+    
+    def migrate_to_block(self, block_entries: int = 256) -> Dict[str, int]:
+        """
+        Rewrite every line-format log segment in block format.
+        
+        The active segment is sealed first if it is in line format, and the store
+        switches to block format for new segments. Entries (including corrupted
+        entry placeholders) are carried over unchanged and in order.
+        
+        Args:
+            block_entries (int): Entries per block in the rewritten segments
+            
+        Returns:
+            Dict[str, int]: Segments migrated, entries moved and bytes before/after
+        """
+        with self._lock:
+            self.log_format = "block"
+            self._save_manifest()
+            if self.active.get("format", "line") == "line" and len(self._index_for(self.active)):
+                self.rotate()
+            elif self.active.get("format", "line") == "line":
+                # Empty line-format active segment - just replace it with a block one
+                self.release()
+                self._delete_segment_files(self.segments.pop())
+                self._start_segment()
+            
+            summary = {"segments": 0, "entries": 0, "bytes_before": 0, "bytes_after": 0}
+            for position, old in enumerate(list(self.segments)):
+                if old["kind"] != "log" or old.get("format", "line") != "line" or not old.get("sealed"):
+                    continue
+                new = self._new_segment_record("block")
+                new_path = self.path_of(new)
+                index = _LogIndex(self.directory / new["index"], self.encryption_key, self.logger, with_slots=True)
+                new_text = _TextIndex(self.text_path_of(new), self.cipher_suite, self.logger)
+                
+                with open(new_path, 'wb') as block_file:
+                    block_file.write(_BlockCodec.MAGIC)
+                    batch: List[Dict[str, Any]] = []
+                    
+                    def write_batch() -> None:
+                        offset = block_file.tell()
+                        frame = self.codec.encode(new["id"], offset, [
+                            json.dumps(e, ensure_ascii=False, separators=(',', ':')).encode('utf-8') for e in batch])
+                        block_file.write(frame)
+                        index.append([(offset, len(frame), slot, e.get("timestamp"),
+                                       str(e.get("brain", "")), str(e.get("action", ""))) for slot, e in enumerate(batch)])
+                        batch.clear()
+                    
+                    for entry in self.iter_entries(old):
+                        new_text.add(new_text.covered, None if entry.get("action") == "CORRUPTED_ENTRY" else entry)
+                        batch.append(entry)
+                        summary["entries"] += 1
+                        if len(batch) >= block_entries:
+                            write_batch()
+                    if batch:
+                        write_batch()
+                index.close()
+                new_text.save()
+                
+                first_ts, last_ts = index.time_range()
+                new.update({"sealed": True, "created": old.get("created", new["created"]),
+                            "entries": len(index), "bytes": new_path.stat().st_size,
+                            "first_ts": first_ts, "last_ts": last_ts})
+                self.segments[self.segments.index(old)] = new
+                self._save_manifest()
+                self.aggregates.mark_covered(new["id"], self.aggregates.covered.get(old["id"], 0))
+                self.checkpoint()
+                summary["segments"] += 1
+                summary["bytes_before"] += old.get("bytes", 0)
+                summary["bytes_after"] += new["bytes"]
+                self._delete_segment_files(old)
+            
+            self.logger.info(f"Migrated {summary['segments']} memory segments to block format "
+                             f"({summary['bytes_before']} -> {summary['bytes_after']} bytes)")
+            return summary
+    
+    # ---------------------------------------------------------------- reading
+    
+    @staticmethod
+    def decode_frames(codec: _BlockCodec, log_file, segment_id: int, logger: logging.Logger,
+                      start: int = 0, end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Decode the entries of every frame in [start, end), with placeholders for bad blocks."""
+        try:
+            frames = list(codec.iter_frames(log_file, start, end))
+        except ValueError as header_error:
+            logger.warning(f"Corrupted memory segment {segment_id}: {header_error}")
+            yield _corrupted_placeholder(header_error, segment_id, byte_offset=0)
+            return
+        for offset, _, body in frames:
+            try:
+                if body is None:
+                    raise ValueError("block truncated")
+                payloads = codec.decode(segment_id, offset, body)
+            except Exception as block_error:
+                # InvalidTag (tamper) has an empty message - name the failure instead
+                error = str(block_error) or type(block_error).__name__
+                logger.warning(f"Corrupted memory block in segment {segment_id} at byte {offset}: {error}")
+                yield _corrupted_placeholder(error, segment_id, byte_offset=offset)
+                continue
+            for payload in payloads:
+                try:
+                    yield json.loads(payload.decode('utf-8'))
+                except Exception as entry_error:
+                    yield _corrupted_placeholder(entry_error, segment_id, byte_offset=offset)
+    
+    def iter_entries(self, segment: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the decoded entries of any segment, oldest first."""
+        if segment["kind"] == "archive":
+            yield from self.iter_archive(segment)
+        elif segment.get("format") == "block":
+            with open(self.path_of(segment), 'rb') as log_file:
+                yield from self.decode_frames(self.codec, log_file, segment["id"], self.logger)
+        else:
+            for line_number, byte_offset, line in self.iter_lines(segment):
+                yield _decode_entry(self.cipher_suite, line, self.logger, line_number, byte_offset, segment["id"])
+    
+    def iter_entries_reversed(self, segment: Dict[str, Any], block_size: int) -> Iterator[Dict[str, Any]]:
+        """Yield the decoded entries of any segment, newest first."""
+        if segment["kind"] == "archive":
+            yield from reversed(list(self.iter_archive(segment)))
+        elif segment.get("format") == "block":
+            with open(self.path_of(segment), 'rb') as log_file:
+                try:
+                    frames = [(offset, length) for offset, length, _ in self.codec.iter_frames(log_file)]
+                except ValueError:
+                    # Damaged header - let the forward decoder report it
+                    yield from self.decode_frames(self.codec, log_file, segment["id"], self.logger)
+                    return
+                for offset, length in reversed(frames):
+                    block = list(self.decode_frames(self.codec, log_file, segment["id"], self.logger,
+                                                    offset, offset + length))
+                    yield from reversed(block)
+        else:
+            for byte_offset, line in self.iter_lines_reversed(segment, block_size):
+                yield _decode_entry(self.cipher_suite, line, self.logger, None, byte_offset, segment["id"])
+    
+    def read_positions(self, segment: Dict[str, Any], index: _LogIndex,
+                       positions: Iterable[int]) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Seek to and decode the entries at the given index positions, yielding (position, entry or None if corrupted)."""
+        block_format = segment.get("format") == "block"
+        cached_offset, cached_payloads = None, None
+        with open(self.path_of(segment), 'rb') as log_file:
+            for position in positions:
+                offset, length, slot = index.location(position)
+                try:
+                    if block_format:
+                        if offset != cached_offset:
+                            log_file.seek(offset + _BlockCodec.FRAME_HEADER.size)
+                            body = log_file.read(length - _BlockCodec.FRAME_HEADER.size)
+                            cached_offset, cached_payloads = offset, self.codec.decode(segment["id"], offset, body)
+                        entry = json.loads(cached_payloads[slot].decode('utf-8'))
+                    else:
+                        log_file.seek(offset)
+                        line = log_file.read(length).strip()
+                        entry = json.loads(self.cipher_suite.decrypt(line).decode('utf-8'))
+                except Exception as entry_error:
+                    self.logger.warning(f"Corrupted log entry in segment {segment['id']} at byte {offset}: {entry_error}")
+                    entry = None
+                yield position, entry
+    
+    def iter_lines(self, segment: Dict[str, Any]) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield (line_number, byte_offset, token) for every non-empty line of a line segment."""
+        with open(self.path_of(segment), 'rb') as log_file:
+            line_number = 0
+            byte_offset = 0
+            for raw_line in log_file:
+                line_number += 1
+                line = raw_line.strip()
+                if line:  # Skip empty lines
+                    yield line_number, byte_offset, line
+                byte_offset += len(raw_line)
+    
+    def iter_lines_reversed(self, segment: Dict[str, Any], block_size: int) -> Iterator[Tuple[int, bytes]]:
+        """Yield (byte_offset, token) for the lines of a line segment, last line first."""
+        with open(self.path_of(segment), 'rb') as log_file:
+            log_file.seek(0, os.SEEK_END)
+            position = log_file.tell()
+            carry = b''  # Start of a line whose beginning lies in an earlier block
+            
+            while position > 0:
+                read_size = min(block_size, position)
+                position -= read_size
+                log_file.seek(position)
+                chunk = log_file.read(read_size) + carry
+                
+                lines = chunk.split(b'\n')
+                # The first piece may be cut mid-line unless we reached the start of the file
+                carry = lines.pop(0) if position > 0 else b''
+                
+                line_end = position + len(chunk)
+                for raw_line in reversed(lines):
+                    line_start = line_end - len(raw_line)
+                    line_end = line_start - 1  # skip the separating newline
+                    line = raw_line.strip()
+                    if line:
+                        yield line_start, line
+    
+    def chunk_ranges(self, segment: Dict[str, Any], chunk_bytes: int) -> List[Tuple[int, int]]:
+        """Split a log segment into (start, end) byte ranges aligned to line or frame boundaries."""
+        path = self.path_of(segment)
+        size = path.stat().st_size
+        ranges = []
+        with open(path, 'rb') as log_file:
+            if segment.get("format") == "block":
+                try:
+                    frames = list(self.codec.iter_frames(log_file))
+                except ValueError:
+                    return [(0, size)]  # Damaged header - one chunk, reported by the worker
+                start = None
+                for offset, length, _ in frames:
+                    if start is None:
+                        start = offset
+                    if offset + length - start >= chunk_bytes:
+                        ranges.append((start, offset + length))
+                        start = None
+                if start is not None:
+                    ranges.append((start, size))
+                return ranges
+            
+            start = 0
+            while start < size:
+                end = min(start + chunk_bytes, size)
+                if end < size:
+                    log_file.seek(end)
+                    log_file.readline()  # Extend to the end of the line we landed in
+                    end = log_file.tell()
+                ranges.append((start, end))
+                start = end
+        return ranges
+    
+    def iter_archive(self, segment: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Decrypt, decompress and parse an archive segment."""
+        token = self.path_of(segment).read_bytes()
+        try:
+            data = zlib.decompress(self.cipher_suite.decrypt(token))
+        except Exception as archive_error:
+            self.logger.warning(f"Corrupted memory archive segment {segment['id']}: {archive_error}")
+            yield _corrupted_placeholder(archive_error, segment["id"])
+            return
+        for line in data.splitlines():
+            if line:
+                yield json.loads(line.decode('utf-8'))
+
+
 class MemoryBrain:
     """
     ZIA's Secure Memory Brain - The Black Box Recorder
@@ -56,27 +1803,96 @@ class MemoryBrain:
         # Setup logging for the memory brain itself
         self.logger = logging.getLogger(__name__)
         
+        # Memory brain settings live under the "memory_brain" section of the CNS config
+        self.memory_config = config.get('memory_brain', {}) if isinstance(config, dict) else getattr(config, 'memory_brain', {})
+        self.write_behind = self.memory_config.get('write_behind', True)
+        self.flush_interval = self.memory_config.get('flush_interval', 0.5)
+        self.flush_size = self.memory_config.get('flush_size', 64)
+        self.max_queue_size = self.memory_config.get('max_queue_size', 10000)
+        self.segment_max_bytes = self.memory_config.get('segment_max_bytes', 8 * 1024 * 1024)
+        self.segment_max_age_hours = self.memory_config.get('segment_max_age_hours', 24)
+        self.retention_max_age_days = self.memory_config.get('retention_max_age_days', None)
+        self.retention_max_bytes = self.memory_config.get('retention_max_bytes', None)
+        self.compact_after_days = self.memory_config.get('compact_after_days', None)
+        self.parallel_read_workers = self.memory_config.get('parallel_read_workers', None)
+        self.parallel_read_min_bytes = self.memory_config.get('parallel_read_min_bytes', 4 * 1024 * 1024)
+        self.log_format = self.memory_config.get('log_format', 'line')
+        self.aggregate_save_interval = self.memory_config.get('aggregate_save_interval', 30.0)
+        self.durability = self.memory_config.get('durability', 'none')
+        self.fsync_batch_entries = self.memory_config.get('fsync_batch_entries', 256)
+        self.fsync_batch_ms = self.memory_config.get('fsync_batch_ms', 1000)
+        
         # Define secure storage paths with emojis as specified
         self.key_file_path = Path("config/memory.key")  # ⚙️ config/memory.key
-        self.log_file_path = Path("database/memory_log.json.encrypted")  # 🗄️ database/memory_log.json.encrypted
+        self.segments_dir = Path("database/memory_segments")  # 🗄️ database/memory_segments/ (segments + manifest)
+        # Pre-segmentation single-file log, adopted as the first segment if present
+        self.log_file_path = Path("database/memory_log.json.encrypted")
+        self.index_file_path = Path("database/memory_log.index")
+        
+        # Storage, encryption and the writer are set up on first use (see _ensure_ready),
+        # so constructing a brain costs no disk I/O or crypto work
+        self.encryption_key: Optional[bytes] = None
+        self.cipher_suite: Optional[Fernet] = None
+        self._store: Optional[_SegmentStore] = None
+        self._writer: Optional[_BufferedLogWriter] = None
+        self._ready_lock = threading.Lock()
+        self._created_at = datetime.datetime.now()
+        self._initialized_logged = False
         
+        self.logger.info("ZIA Memory Brain created (storage opens on first use)")
+    
+    def _ensure_ready(self) -> None:
+        """
+        Open encrypted storage on first use: directories, key and cipher, segment
+        store and writer. Safe to call from several threads; only the first call
+        does any work.
+        """
+        if self._writer is not None:
+            return
+        with self._ready_lock:
+            if self._writer is not None:
+                return
+            self._open_storage()
+    
+    def _open_storage(self) -> None:
         # Ensure directories exist
         self._ensure_directories()
         
-        # Initialize encryption system
-        self.encryption_key = self._load_or_generate_key()
-        self.cipher_suite = Fernet(self.encryption_key)
+        # Initialize encryption system (shared with other brains using the same key file)
+        self.encryption_key, self.cipher_suite = self._load_cipher()
+        
+        # Segmented storage (loads the manifest, or migrates the legacy single-file log)
+        store = _SegmentStore(
+            self.segments_dir, self.cipher_suite, self.encryption_key, self.logger,
+            max_segment_bytes=self.segment_max_bytes,
+            max_segment_age=self.segment_max_age_hours * 3600 if self.segment_max_age_hours else None,
+            retention_max_age=self.retention_max_age_days * 86400 if self.retention_max_age_days else None,
+            retention_max_bytes=self.retention_max_bytes,
+            compact_after=self.compact_after_days * 86400 if self.compact_after_days else None,
+            log_format=self.log_format,
+            aggregate_save_interval=self.aggregate_save_interval,
+            durability=self.durability,
+            fsync_batch_entries=self.fsync_batch_entries,
+            fsync_batch_interval=self.fsync_batch_ms / 1000.0
+        )
+        store.open(self.log_file_path, self.index_file_path)
+        self._store = store
+        self.log_format = store.log_format  # The manifest keeps a migrated store in block format
+        
+        # Buffered writer batches appends off the command path (published last - it marks the brain ready).
+        # Per-entry durability means log_action may only return once its entry is synced, so it writes directly.
+        write_behind = self.write_behind and self.durability != "entry"
+        if self.write_behind and not write_behind:
+            self.logger.info("Memory durability 'entry' writes synchronously; write-behind disabled")
+        self._writer = _BufferedLogWriter(
+            self._store, self.logger,
+            write_behind=write_behind, flush_interval=self.flush_interval,
+            flush_size=self.flush_size, max_queue_size=self.max_queue_size,
+            sync_interval=self.fsync_batch_ms / 1000.0 if self.durability == "batch" else None
+        )
         
         # Log successful initialization
         self.logger.info("ZIA Memory Brain initialized successfully")
-        
-        # Record the brain activation in its own log
-        self.log_action("MEMORY_BRAIN", "INITIALIZED", {
-            "timestamp": datetime.datetime.now().isoformat(),
-            "status": "operational",
-            "encryption": "active",
-            "boss_greeting": "Memory Brain online and ready to serve, Boss!"
-        })
     
     def _ensure_directories(self) -> None:
         """
@@ -85,12 +1901,37 @@ class MemoryBrain:
         """
         try:
             self.key_file_path.parent.mkdir(parents=True, exist_ok=True)
-            self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
+            self.segments_dir.mkdir(parents=True, exist_ok=True)
             self.logger.debug("Storage directories verified/created")
         except Exception as e:
             self.logger.error(f"Failed to create storage directories: {e}")
             raise
     
+    def _load_cipher(self) -> Tuple[bytes, Fernet]:
+        """
+        Return the memory key and its Fernet cipher, reusing them across instances.
+        
+        Keys are cached per key file for the whole process and revalidated against
+        the file's modification time, so only the first brain pays for reading and
+        validating the key.
+        
+        Returns:
+            Tuple[bytes, Fernet]: The encryption key and a cipher built from it
+        """
+        cache_key = str(self.key_file_path.resolve())
+        with _KEY_CACHE_LOCK:
+            cached = _KEY_CACHE.get(cache_key)
+            if cached is not None:
+                try:
+                    if self.key_file_path.stat().st_mtime_ns == cached[0]:
+                        return cached[1], cached[2]
+                except OSError:
+                    pass  # Key file vanished - fall through and regenerate
+            key = self._load_or_generate_key()
+            cipher = Fernet(key)
+            _KEY_CACHE[cache_key] = (self.key_file_path.stat().st_mtime_ns, key, cipher)
+            return key, cipher
+    
     def _load_or_generate_key(self) -> bytes:
         """
         Load existing encryption key or generate a new one.
@@ -158,6 +1999,10 @@ class MemoryBrain:
             })
         """
         try:
+            self._ensure_ready()
+            if not self._initialized_logged:
+                self._log_initialized()
+            
             # Create comprehensive log entry with all required fields
             log_entry = {
                 "timestamp": datetime.datetime.now().isoformat(),
@@ -171,12 +2016,12 @@ class MemoryBrain:
             # Serialize to JSON with compact formatting
             json_data = json.dumps(log_entry, ensure_ascii=False, separators=(',', ':'))
             
-            # Encrypt the JSON data using Fernet cipher
-            encrypted_data = self.cipher_suite.encrypt(json_data.encode('utf-8'))
-            
-            # Append to encrypted log file (each entry on new line for easy parsing)
-            with open(self.log_file_path, 'ab') as log_file:
-                log_file.write(encrypted_data + b'\n')
+            # Hand off to the writer - encryption and the append happen in batches
+            # on the writer thread, in the active segment's format
+            success = details.get('success') if isinstance(details, dict) else None
+            self._writer.append(json_data.encode('utf-8'), (
+                log_entry["timestamp"], brain, action, success if isinstance(success, bool) else None
+            ))
             
             self.logger.debug(f"Action logged successfully: {brain}.{action}")
             
@@ -187,61 +2032,93 @@ class MemoryBrain:
             # But ensure Boss is informed of critical failure
             print(f"⚠️  ZIA MEMORY BRAIN CRITICAL ERROR: Unable to log action - {e}")
     
-    def read_log(self) -> List[Dict[str, Any]]:
+    def _log_initialized(self) -> None:
+        """Record the brain activation in its own log, just ahead of the first real entry."""
+        with self._ready_lock:
+            if self._initialized_logged:
+                return
+            self._initialized_logged = True
+        self.log_action("MEMORY_BRAIN", "INITIALIZED", {
+            "timestamp": self._created_at.isoformat(),
+            "status": "operational",
+            "encryption": "active",
+            "boss_greeting": "Memory Brain online and ready to serve, Boss!"
+        })
+    
+    def iter_log(self) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily decrypt logged actions in chronological order, segment by segment.
+        
+        Only one line (one block in block-format segments, a whole archive segment
+        when reading compacted history) is held in memory at a time, so callers that stop early or aggregate on the
+        fly run in bounded memory regardless of log size.
+        
+        Yields:
+            Dict[str, Any]: Decrypted log entries (or CORRUPTED_ENTRY placeholders)
+        """
+        self._ensure_ready()
+        # Make sure everything still sitting in the write-behind queue is on disk
+        self.flush()
+        
+        for segment in self._store.snapshot():
+            if not self._store.path_of(segment).exists():
+                continue  # Removed by retention or never written to
+            yield from self._store.iter_entries(segment)
+    
+    def iter_log_reversed(self, block_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily decrypt logged actions newest first, reading each segment backwards in blocks.
+        
+        Useful for "last N actions" views, e.g.
+        ``list(itertools.islice(memory_brain.iter_log_reversed(), 10))``.
+        Line numbers are not known when reading from the tail, so corrupted-entry
+        placeholders carry only the byte offset. Block-format segments are walked
+        frame by frame and each block is decrypted once.
+        
+        Args:
+            block_size (int): Number of bytes read per backwards step
+            
+        Yields:
+            Dict[str, Any]: Decrypted log entries (or CORRUPTED_ENTRY placeholders)
+        """
+        self._ensure_ready()
+        self.flush()
+        
+        for segment in reversed(self._store.snapshot()):
+            if not self._store.path_of(segment).exists():
+                continue
+            yield from self._store.iter_entries_reversed(segment, block_size)
+    
+    def read_log(self, parallel: bool = False, workers: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Read and decrypt all logged actions from ZIA's memory.
         
-        This method decrypts and parses the entire memory log, returning
-        a chronological list of all actions performed by ZIA.
+        By default this is a thin wrapper over iter_log() returning a chronological
+        list of all actions performed by ZIA. Prefer iter_log()/iter_log_reversed()
+        on large logs.
+        
+        With `parallel=True` the segments are split into line- or block-aligned chunks that are
+        decrypted and parsed in a process pool, then merged in timestamp order.
+        This is meant for audits over months of history; logs smaller than
+        `parallel_read_min_bytes` are still read serially since the pool would
+        cost more than it saves.
+        
+        Args:
+            parallel (bool): Use multi-process decryption
+            workers (Optional[int]): Worker processes (defaults to `parallel_read_workers` or the CPU count)
         
         Returns:
             List[Dict[str, Any]]: List of decrypted log entry dictionaries
             
         Note:
             This method includes robust error handling for corrupted entries.
-            Corrupted lines are logged but skipped to maintain system stability.
+            Corrupted lines are logged and replaced by a placeholder entry.
         """
-        log_entries = []
-        
         try:
-            if not self.log_file_path.exists():
-                self.logger.info("No memory log file found - returning empty log")
-                return log_entries
-            
-            with open(self.log_file_path, 'rb') as log_file:
-                line_number = 0
-                for line in log_file:
-                    line_number += 1
-                    line = line.strip()
-                    
-                    if not line:  # Skip empty lines
-                        continue
-                    
-                    try:
-                        # Decrypt the line using Fernet cipher
-                        decrypted_data = self.cipher_suite.decrypt(line)
-                        
-                        # Parse JSON back to dictionary
-                        log_entry = json.loads(decrypted_data.decode('utf-8'))
-                        log_entries.append(log_entry)
-                        
-                    except Exception as line_error:
-                        # Log corrupted entry but continue processing other entries
-                        self.logger.warning(
-                            f"Corrupted log entry at line {line_number}: {line_error}"
-                        )
-                        # Optionally add a placeholder entry for corrupted data
-                        log_entries.append({
-                            "timestamp": "unknown",
-                            "brain": "MEMORY_BRAIN",
-                            "action": "CORRUPTED_ENTRY",
-                            "details": {
-                                "line_number": line_number,
-                                "error": str(line_error),
-                                "status": "data_corruption_detected"
-                            }
-                        })
-            
+            if parallel:
+                log_entries = self._read_log_parallel(workers or self.parallel_read_workers)
+            else:
+                log_entries = list(self.iter_log())
             self.logger.info(f"Successfully read {len(log_entries)} log entries from encrypted storage")
             return log_entries
             
@@ -249,6 +2126,372 @@ class MemoryBrain:
             self.logger.error(f"Failed to read memory log: {e}")
             raise RuntimeError(f"Memory Brain log reading failure: {e}") from e
     
+    def _read_log_parallel(self, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Decrypt all segments in a process pool and merge the chunks in timestamp order."""
+        self._ensure_ready()
+        self.flush()
+        
+        segments = [segment for segment in self._store.snapshot() if self._store.path_of(segment).exists()]
+        log_bytes = sum(self._store.path_of(seg).stat().st_size for seg in segments if seg["kind"] == "log")
+        if log_bytes < self.parallel_read_min_bytes:
+            return list(self.iter_log())
+        
+        workers = workers or os.cpu_count() or 1
+        # Aim for a few chunks per worker so stragglers don't dominate
+        chunk_bytes = max(256 * 1024, log_bytes // (workers * 4) + 1)
+        
+        tasks = []
+        plan = []  # (segment, first task, last task) - archives have no tasks
+        for segment in segments:
+            if segment["kind"] == "log":
+                ranges = self._store.chunk_ranges(segment, chunk_bytes)
+                plan.append((segment, len(tasks), len(tasks) + len(ranges)))
+                path = str(self._store.path_of(segment))
+                segment_format = segment.get("format", "line")
+                tasks.extend((path, start, end, segment["id"], segment_format) for start, end in ranges)
+            else:
+                plan.append((segment, None, None))
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_decrypt_worker,
+                                 initargs=(self.encryption_key,)) as pool:
+            chunk_results = list(pool.map(_decrypt_chunk, tasks))
+        
+        streams: List[List[Tuple[float, Dict[str, Any]]]] = []
+        for segment, first, last in plan:
+            if first is None:
+                last_key = 0.0
+                stream = []
+                for entry in self._store.iter_archive(segment):
+                    last_key = _LogIndex.to_epoch(entry.get("timestamp")) or last_key
+                    stream.append((last_key, entry))
+                streams.append(stream)
+                continue
+            # Turn chunk-relative line numbers of corrupted entries into segment line numbers
+            base = 0
+            for pairs, line_count in chunk_results[first:last]:
+                if base:
+                    for _, entry in pairs:
+                        if entry.get("action") == "CORRUPTED_ENTRY" and entry["details"].get("line_number"):
+                            entry["details"]["line_number"] += base
+                base += line_count
+                streams.append(pairs)
+        
+        # heapq.merge is stable, so equal timestamps keep their file order
+        return [entry for _, entry in heapq.merge(*streams, key=lambda pair: pair[0])]
+    
+    def query(self, brain: Optional[str] = None, action: Optional[str] = None,
+              since: Union[str, datetime.datetime, float, None] = None,
+              until: Union[str, datetime.datetime, float, None] = None,
+              limit: Optional[int] = None, newest_first: bool = False) -> List[Dict[str, Any]]:
+        """
+        Look up logged actions through the sidecar index.
+        
+        Only the matching lines (or blocks) are read, by seeking to their byte
+        offsets, and decrypted, so the cost depends on the number of matches rather than on the
+        total size of the memory log.
+        
+        Args:
+            brain (Optional[str]): Only entries from this brain (e.g., "AUTOMATION_BRAIN")
+            action (Optional[str]): Only entries with this action (e.g., "SEARCH_COMPLETED")
+            since: Inclusive lower time bound (ISO string, datetime or epoch seconds)
+            until: Inclusive upper time bound (ISO string, datetime or epoch seconds)
+            limit (Optional[int]): Maximum number of entries to return
+            newest_first (bool): Return the most recent matches first
+            
+        Returns:
+            List[Dict[str, Any]]: Matching decrypted log entries
+            
+        Example:
+            memory_brain.query(brain="CNS", action="COMMAND_PROCESSED_ENHANCED",
+                               since=datetime.datetime.now() - datetime.timedelta(days=1), limit=20)
+        """
+        self._ensure_ready()
+        results: List[Dict[str, Any]] = []
+        since_ts = None if since is None else _LogIndex.to_epoch(since)
+        until_ts = None if until is None else _LogIndex.to_epoch(until)
+        
+        def matches(log_entry: Dict[str, Any]) -> bool:
+            # Tags are truncated hashes, and archives are not indexed - confirm the real values
+            if brain is not None and log_entry.get('brain') != brain:
+                return False
+            if action is not None and log_entry.get('action') != action:
+                return False
+            if since_ts is not None or until_ts is not None:
+                entry_ts = _LogIndex.to_epoch(log_entry.get('timestamp'))
+                if (since_ts is not None and entry_ts < since_ts) or (until_ts is not None and entry_ts > until_ts):
+                    return False
+            return True
+        
+        try:
+            self.flush()
+            segments = self._store.snapshot()
+            if newest_first:
+                segments.reverse()
+            
+            for segment in segments:
+                if limit is not None and len(results) >= limit:
+                    break
+                # Segments whose time range misses the window are skipped without being opened
+                if segment["first_ts"] is not None and until_ts is not None and segment["first_ts"] > until_ts:
+                    continue
+                if segment["last_ts"] is not None and since_ts is not None and segment["last_ts"] < since_ts:
+                    continue
+                if not self._store.path_of(segment).exists():
+                    continue
+                
+                if segment["kind"] == "archive":
+                    archived = [entry for entry in self._store.iter_archive(segment) if matches(entry)]
+                    if newest_first:
+                        archived.reverse()
+                    results.extend(archived)
+                    continue
+                
+                index = self._store._index_for(segment)
+                positions = index.positions(brain=brain, action=action, since=since_ts, until=until_ts)
+                if newest_first:
+                    positions.reverse()
+                for _, log_entry in self._store.read_positions(segment, index, positions):
+                    if log_entry is None or not matches(log_entry):
+                        continue
+                    results.append(log_entry)
+                    if limit is not None and len(results) >= limit:
+                        break
+            
+            if limit is not None:
+                results = results[:limit]
+            self.logger.debug(f"Memory query matched {len(results)} entries")
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Failed to query memory log: {e}")
+            raise RuntimeError(f"Memory Brain query failure: {e}") from e
+    
+    def get_aggregates(self, group_by: Optional[str] = None, brain: Optional[str] = None,
+                       action: Optional[str] = None,
+                       since: Union[str, datetime.datetime, float, None] = None,
+                       until: Union[str, datetime.datetime, float, None] = None) -> Dict[str, Any]:
+        """
+        Answer counting questions from the rolling counters instead of the log.
+        
+        Counters are updated as entries are written, so the cost is independent of
+        the size of the log. An entry counts as a success/failure when its details
+        contain a boolean "success". Time windows are applied at hour granularity
+        for the last `hours_kept` hours and at day granularity before that.
+        
+        Args:
+            group_by (Optional[str]): "brain", "action", "brain_action", "hour" or "day"
+            brain (Optional[str]): Only count entries from this brain
+            action (Optional[str]): Only count entries with this action
+            since: Inclusive lower time bound (ISO string, datetime or epoch seconds)
+            until: Inclusive upper time bound (ISO string, datetime or epoch seconds)
+            
+        Returns:
+            Dict[str, Any]: "total", "success" and "failure" counts, plus a "groups"
+            mapping of the same counts per group when `group_by` is given
+            
+        Example:
+            today = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            memory_brain.get_aggregates(group_by="brain", since=today)
+            memory_brain.get_aggregates(group_by="action")["groups"]  # busiest actions first
+        """
+        self._ensure_ready()
+        def to_iso(value: Union[str, datetime.datetime, float, None]) -> Optional[str]:
+            if value is None or isinstance(value, str):
+                return value
+            if isinstance(value, (int, float)):
+                value = datetime.datetime.fromtimestamp(value)
+            return value.isoformat()
+        
+        self.flush()
+        return self._store.aggregates.query(group_by=group_by, brain=brain, action=action,
+                                            since=to_iso(since), until=to_iso(until))
+    
+    def search(self, text: str, since: Union[str, datetime.datetime, float, None] = None,
+               until: Union[str, datetime.datetime, float, None] = None,
+               brain: Optional[str] = None, action: Optional[str] = None,
+               limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Ranked keyword search over the text in logged entries' details.
+        
+        Matching uses the per-segment encrypted inverted indexes, and entries are
+        ranked with BM25, newest first on ties. Only the entries that make it into
+        the results are decrypted from the log.
+        
+        Args:
+            text (str): Keywords to look for (any keyword may match; more matches rank higher)
+            since: Inclusive lower time bound (ISO string, datetime or epoch seconds)
+            until: Inclusive upper time bound (ISO string, datetime or epoch seconds)
+            brain (Optional[str]): Only return entries from this brain
+            action (Optional[str]): Only return entries with this action
+            limit (int): Maximum number of results
+            
+        Returns:
+            List[Dict[str, Any]]: {"score": float, "entry": Dict} items, best match first
+            
+        Example:
+            memory_brain.search("python tutorial", since=datetime.datetime.now() - datetime.timedelta(days=30))
+        """
+        self._ensure_ready()
+        terms = list(dict.fromkeys(_TextIndex.tokenize(text)))
+        if not terms:
+            return []
+        since_ts = None if since is None else _LogIndex.to_epoch(since)
+        until_ts = None if until is None else _LogIndex.to_epoch(until)
+        
+        try:
+            self.flush()
+            candidates = []  # (segment, ordinal, term frequencies, entry length, timestamp)
+            total_docs = 0
+            total_length = 0
+            for segment in self._store.snapshot():
+                if segment["first_ts"] is not None and until_ts is not None and segment["first_ts"] > until_ts:
+                    continue
+                if segment["last_ts"] is not None and since_ts is not None and segment["last_ts"] < since_ts:
+                    continue
+                if not self._store.path_of(segment).exists():
+                    continue
+                text_index = self._store.text_index_for(segment)
+                total_docs += text_index.covered
+                total_length += text_index.total_length
+                for ordinal, frequencies in text_index.matches(terms, since_ts, until_ts).items():
+                    candidates.append((segment, ordinal, frequencies, text_index.lengths[ordinal],
+                                       text_index.timestamps[ordinal]))
+            if not candidates:
+                return []
+            
+            # BM25 over the segments in the window
+            k1, b = 1.2, 0.75
+            average_length = total_length / max(total_docs, 1)
+            document_frequency = {term: 0 for term in terms}
+            for _, _, frequencies, _, _ in candidates:
+                for term in frequencies:
+                    document_frequency[term] += 1
+            idf = {term: math.log(1 + (total_docs - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+            
+            def score(frequencies: Dict[str, int], length: int) -> float:
+                norm = k1 * (1 - b + b * length / average_length) if average_length else k1
+                return sum(idf[term] * tf * (k1 + 1) / (tf + norm) for term, tf in frequencies.items())
+            
+            ranked = sorted(((score(freqs, length), ts, segment, ordinal)
+                             for segment, ordinal, freqs, length, ts in candidates),
+                            key=lambda item: (-item[0], -item[1]))
+            
+            results: List[Dict[str, Any]] = []
+            archives: Dict[int, List[Dict[str, Any]]] = {}
+            for entry_score, _, segment, ordinal in ranked:
+                if segment["kind"] == "archive":
+                    if segment["id"] not in archives:
+                        archives[segment["id"]] = list(self._store.iter_archive(segment))
+                    entry = archives[segment["id"]][ordinal]
+                else:
+                    index = self._store._index_for(segment)
+                    _, entry = next(self._store.read_positions(segment, index, [ordinal]))
+                if entry is None:
+                    continue
+                if (brain is not None and entry.get("brain") != brain) or (action is not None and entry.get("action") != action):
+                    continue
+                results.append({"score": round(entry_score, 4), "entry": entry})
+                if len(results) >= limit:
+                    break
+            
+            self.logger.debug(f"Memory search for {terms} matched {len(candidates)} entries")
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Failed to search memory log: {e}")
+            raise RuntimeError(f"Memory Brain search failure: {e}") from e
+    
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the sidecar indexes of all log segments from their encrypted contents.
+        
+        Indexes are caught up automatically when first used; this is for segments that
+        were copied in from elsewhere or an index that is suspected to be damaged.
+        
+        Returns:
+            int: Number of entries indexed
+        """
+        self._ensure_ready()
+        self.flush()
+        return self._store.rebuild_indexes()
+    
+    def apply_retention(self, max_age_days: Optional[float] = None, max_bytes: Optional[int] = None) -> int:
+        """
+        Delete whole sealed segments that fall outside the retention policy.
+        
+        Retention also runs automatically whenever the log rotates, using the
+        `retention_max_age_days` / `retention_max_bytes` settings.
+        
+        Args:
+            max_age_days (Optional[float]): Override for the maximum entry age
+            max_bytes (Optional[int]): Override for the maximum total size on disk
+            
+        Returns:
+            int: Number of segments deleted
+        """
+        self._ensure_ready()
+        self.flush()
+        try:
+            removed = self._store.apply_retention(
+                max_age=max_age_days * 86400 if max_age_days else None, max_bytes=max_bytes
+            )
+            if removed:
+                self.log_action("MEMORY_BRAIN", "RETENTION_APPLIED", {"segments_removed": removed})
+            return removed
+        except Exception as e:
+            self.logger.error(f"Failed to apply memory retention: {e}")
+            return 0
+    
+    def compact_segments(self, older_than_days: float = 7) -> int:
+        """
+        Merge old sealed segments into a single compressed archive segment.
+        
+        Args:
+            older_than_days (float): Only segments whose newest entry is older than this are merged
+            
+        Returns:
+            int: Number of segments merged into the archive
+        """
+        self._ensure_ready()
+        self.flush()
+        try:
+            merged = self._store.compact(older_than_days * 86400)
+            if merged:
+                self.log_action("MEMORY_BRAIN", "SEGMENTS_COMPACTED", {"segments_merged": merged})
+            return merged
+        except Exception as e:
+            self.logger.error(f"Failed to compact memory segments: {e}")
+            return 0
+    
+    def migrate_to_block_format(self, block_entries: int = 256) -> Dict[str, int]:
+        """
+        Rewrite existing line-format segments in the block format.
+        
+        Each entry is moved over unchanged (corrupted-entry placeholders included)
+        into compressed, AES-GCM sealed blocks of `block_entries` entries, and new
+        writes use the block format from then on, also in later sessions (the
+        format is kept in the segment manifest). Each segment is swapped in the
+        manifest before its old file is deleted, so an interrupted migration leaves
+        a readable store that can simply be migrated again. Archive segments are
+        already compressed and are left as they are.
+        
+        Args:
+            block_entries (int): Entries per block in the rewritten segments
+            
+        Returns:
+            Dict[str, int]: Segments migrated, entries moved and bytes before/after
+        """
+        self._ensure_ready()
+        self.flush()
+        try:
+            summary = self._store.migrate_to_block(block_entries)
+            self.log_format = "block"
+            self.log_action("MEMORY_BRAIN", "LOG_FORMAT_MIGRATED", {"format": "block", **summary})
+            return summary
+        except Exception as e:
+            self.logger.error(f"Failed to migrate memory log to block format: {e}")
+            raise RuntimeError(f"Memory Brain migration failure: {e}") from e
+    
     def clear_log(self) -> bool:
         """
         Securely delete the entire log file (DANGEROUS OPERATION).
@@ -264,7 +2507,8 @@ class MemoryBrain:
             All historical data will be permanently lost.
         """
         try:
-            if self.log_file_path.exists():
+            self._ensure_ready()
+            if any(self._store.path_of(segment).exists() for segment in self._store.segments):
                 # Log the clearing action before deletion (for audit trail)
                 self.log_action("MEMORY_BRAIN", "LOG_CLEAR_INITIATED", {
                     "timestamp": datetime.datetime.now().isoformat(),
@@ -272,11 +2516,14 @@ class MemoryBrain:
                     "warning": "All historical memory data will be permanently deleted"
                 })
                 
-                # Actually delete the file
-                self.log_file_path.unlink()
+                # Drain pending writes before deleting
+                self.flush()
+                
+                # Actually delete every segment (and their now meaningless indexes)
+                self._store.clear()
                 self.logger.warning("⚠️  ZIA memory log has been completely cleared by Boss request")
                 
-                # Create a new log entry documenting the clearing (will create new file)
+                # Create a new log entry documenting the clearing (will start a new segment file)
                 self.log_action("MEMORY_BRAIN", "LOG_CLEARED", {
                     "timestamp": datetime.datetime.now().isoformat(),
                     "status": "complete",
@@ -297,28 +2544,60 @@ class MemoryBrain:
         """
         Get statistics about ZIA's memory log without decrypting all entries.
         
-        This method provides useful information about the log file size,
-        entry count, and other metadata for system monitoring.
+        This method provides useful information about the log size, entry count,
+        segments and time span for system monitoring. Figures come from the
+        segment manifest (and the active segment's index), so the cost is
+        O(segments) rather than O(entries).
+        Success/failure counts and per-brain totals come from the rolling
+        aggregates (see get_aggregates()).
         
         Returns:
             Dict[str, Any]: Statistics including entry count, file size, etc.
         """
         try:
+            self._ensure_ready()
             stats = {
                 "total_entries": 0,
                 "file_size_bytes": 0,
                 "file_exists": False,
                 "encryption_status": "active",
-                "key_file_exists": self.key_file_path.exists()
+                "key_file_exists": self.key_file_path.exists(),
+                "segments": 0,
+                "archive_segments": 0,
+                "log_format": self._store.log_format,
+                "success_count": 0,
+                "failure_count": 0,
+                "entries_by_brain": {},
+                "oldest_entry": None,
+                "newest_entry": None
             }
             
-            if self.log_file_path.exists():
+            self.flush()
+            
+            first_ts, last_ts = None, None
+            for segment in self._store.snapshot():
+                if not segment["entries"]:
+                    continue
                 stats["file_exists"] = True
-                stats["file_size_bytes"] = self.log_file_path.stat().st_size
-                
-                # Count entries without full decryption (for performance)
-                with open(self.log_file_path, 'rb') as f:
-                    stats["total_entries"] = sum(1 for line in f if line.strip())
+                stats["segments"] += 1
+                stats["archive_segments"] += segment["kind"] == "archive"
+                stats["total_entries"] += segment["entries"]
+                stats["file_size_bytes"] += segment["bytes"]
+                if segment["first_ts"] is not None:
+                    first_ts = segment["first_ts"] if first_ts is None else min(first_ts, segment["first_ts"])
+                if segment["last_ts"] is not None:
+                    last_ts = segment["last_ts"] if last_ts is None else max(last_ts, segment["last_ts"])
+            
+            # Lifetime counts come from the rolling aggregates, not from the log itself
+            by_brain = self._store.aggregates.query(group_by="brain")
+            stats["success_count"] = by_brain["success"]
+            stats["failure_count"] = by_brain["failure"]
+            stats["entries_by_brain"] = {name: counts["total"] for name, counts in by_brain["groups"].items()}
+            
+            if first_ts is not None:
+                stats["oldest_entry"] = datetime.datetime.fromtimestamp(first_ts).isoformat()
+            if last_ts is not None:
+                stats["newest_entry"] = datetime.datetime.fromtimestamp(last_ts).isoformat()
             
             return stats
             
@@ -331,18 +2610,56 @@ class MemoryBrain:
                 "total_entries": 0
             }
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Force all buffered log entries to be written to the encrypted log file.
+        
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait, None waits forever
+            
+        Returns:
+            bool: True if every pending entry was written within the timeout
+        """
+        writer = getattr(self, '_writer', None)
+        if writer is None:
+            return True  # Storage never opened - nothing buffered
+        try:
+            return writer.flush(timeout)
+        except Exception as e:
+            self.logger.error(f"Failed to flush memory log: {e}")
+            return False
+    
+    def close(self) -> None:
+        """
+        Flush pending entries and stop the background writer.
+        
+        Called by the CNS during shutdown so nothing queued is lost on a clean exit.
+        Any action logged after close() is written synchronously.
+        """
+        writer = getattr(self, '_writer', None)
+        if writer is None:
+            return  # Storage never opened - nothing to close
+        try:
+            writer.close()
+            self._store.close()
+            self.logger.info("Memory Brain writer closed - all memories flushed to disk")
+        except Exception as e:
+            self.logger.error(f"Failed to close memory log writer: {e}")
+    
     def __del__(self):
         """
         Cleanup method called when MemoryBrain is destroyed.
         Logs the shutdown event for completeness and audit trail.
         """
         try:
-            if hasattr(self, 'log_action') and hasattr(self, 'cipher_suite'):
+            # A brain that never opened its storage has nothing to record
+            if getattr(self, '_writer', None) is not None:
                 self.log_action("MEMORY_BRAIN", "SHUTDOWN", {
                     "timestamp": datetime.datetime.now().isoformat(),
                     "status": "clean_shutdown",
                     "message": "Memory Brain going offline. All memories secured, Boss!"
                 })
+            self.close()
         except:
             # Ignore any errors during cleanup to prevent cascading failures
             pass
@@ -403,6 +2720,8 @@ if __name__ == "__main__":
         stats = memory.get_log_stats()
         print(f"✅ Log stats: {stats['total_entries']} entries, {stats['file_size_bytes']} bytes")
         
+        memory.close()
+        
         print("\n🎉 ZIA Memory Brain test completed successfully!")
         print("🔒 All data encrypted and stored securely")
         
@@ -0,0 +1,56 @@
+"""
+zia-X Memory Log Migration
+==========================
+
+Rewrites the encrypted memory log from the original line format (one Fernet
+token per entry) into the block format (compressed AES-GCM blocks).
+
+Run it from the zia-X directory while the assistant is not running:
+
+    python migrate_memory_log.py
+
+The segment manifest records the block format, so later sessions keep
+writing blocks even while "log_format" in the memory_brain config section
+still says "line". Setting it to "block" as well keeps the config in line
+with what is on disk.
+"""
+
+import sys
+import logging
+
+from brains.memory_brain import MemoryBrain
+
+
+class MigrationConfig:
+    session_id = "memory_migration"
+    version = "migration"
+    memory_brain = {"write_behind": False}
+
+
+def run_migration():
+    """
+    Migrate every line-format memory segment to the block format.
+    """
+    print("--- zia-X Memory Log Migration ---")
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        memory = MemoryBrain(None, MigrationConfig())
+        before = memory.get_log_stats()
+        print(f"Entries: {before['total_entries']}, size on disk: {before['file_size_bytes']} bytes")
+
+        summary = memory.migrate_to_block_format()
+        after = memory.get_log_stats()
+
+        print(f"\n✅ Migrated {summary['segments']} segment(s), {summary['entries']} entries")
+        print(f"   {summary['bytes_before']} -> {summary['bytes_after']} bytes")
+        print(f"   Entries now on disk: {after['total_entries']}")
+        print(f"   Log format: {after['log_format']} (kept in the segment manifest)")
+        print('   Optionally set "log_format": "block" in the memory_brain section of vita_x.py to match')
+        memory.close()
+    except Exception as e:
+        print(f"\n❌ Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,64 @@
+"""
+zia-X Intent Classifier Training
+================================
+
+Trains the DecisionBrain's n-gram fallback classifier offline and saves it to
+config/intent_classifier.npz, where the assistant picks it up on startup
+instead of training one in-process.
+
+The model is built from the literal text of every intent pattern plus the
+successful commands in config/learning_data.jsonl. Extra labelled commands can
+be supplied as a tab-separated file of "command<TAB>intent" lines, e.g. from a
+replayed command log:
+
+    python train_intent_classifier.py
+    python train_intent_classifier.py labelled_commands.tsv
+
+Retrain after changing intent patterns - a model trained on different
+patterns is ignored at startup.
+"""
+
+import sys
+import logging
+
+from brains.decision_brain import DecisionBrain
+
+
+def read_labelled_commands(path):
+    """(command, intent) pairs from a tab-separated file, skipping blank and comment lines."""
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            command, _, intent = line.rstrip("\n").rpartition("\t")
+            if command and intent:
+                samples.append((command, intent.strip()))
+    return samples
+
+
+def run_training():
+    """
+    Train the fallback classifier and save it for later sessions.
+    """
+    print("--- zia-X Intent Classifier Training ---")
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        # Train here only, without the brain's own background load of the saved model
+        brain = DecisionBrain(None, {"decision_brain": {"fallback_classifier_enabled": False}})
+        extra_samples = read_labelled_commands(sys.argv[1]) if len(sys.argv) > 1 else []
+
+        classifier = brain.train_fallback_classifier(extra_samples, save=True)
+        if classifier is None:
+            print("\n❌ Training failed: NumPy is not installed or there is nothing to train on")
+            sys.exit(1)
+
+        print(f"\n✅ Trained on {len(classifier.intents)} intents ({len(extra_samples)} labelled commands)")
+        print(f"   Saved to {brain.fallback_model_path}")
+    except Exception as e:
+        print(f"\n❌ Training failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_training()
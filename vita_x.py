@@ -118,9 +118,9 @@ class VitaCNS:
         default_config = {
             "response_brain": {"enabled": True},
             "security_brain": {"enabled": True},
-            "automation_brain": {"enabled": True},
-            "decision_brain": { "enabled": True, "confidence_threshold": 0.7, "max_alternatives": 3, "learning_enabled": True, "context_window": 5 },
-            "memory_brain": {"enabled": True},
+            "automation_brain": {"enabled": True, "http_pool_connections": 10, "http_pool_maxsize": 10, "http_max_retries": 2, "http_backoff_factor": 0.3, "http_connect_timeout": 3.05, "http_read_timeout": 10, "concurrent_search": True, "search_workers": 4, "cache_ttl": 300, "cache_max_entries": 256, "cache_max_bytes": 1048576, "cache_expiry_interval": 60, "website_status_cache_ttl": 60, "system_info_cache_ttl": 3600, "search_cache_enabled": True, "search_cache_ttl": 86400, "search_cache_stale_ttl": 604800, "search_cache_max_entries": 5000, "search_cache_max_bytes": 20971520, "search_revalidation_workers": 2},
+            "decision_brain": { "enabled": True, "confidence_threshold": 0.7, "max_alternatives": 3, "learning_enabled": True, "context_window": 5, "context_boost": 0.1, "context_turn_half_life": 1.0, "context_time_half_life_seconds": 300, "decision_cache_size": 512, "fallback_classifier_enabled": True, "fallback_min_similarity": 0.35, "fallback_min_margin": 0.1, "learning_top_k": 50, "learning_half_life_days": 30 },
+            "memory_brain": { "enabled": True, "write_behind": True, "flush_interval": 0.5, "flush_size": 64, "max_queue_size": 10000, "segment_max_bytes": 8388608, "segment_max_age_hours": 24, "retention_max_age_days": None, "retention_max_bytes": None, "compact_after_days": None, "parallel_read_workers": None, "parallel_read_min_bytes": 4194304, "log_format": "line", "aggregate_save_interval": 30, "durability": "none", "fsync_batch_entries": 256, "fsync_batch_ms": 1000 },
             "cns": { "max_retries": 3, "command_timeout": 30, "enable_performance_tracking": True }
         }
         
@@ -506,6 +506,8 @@ class VitaCNS:
                 try:
                     self.memory_brain.log_action("CNS", "SESSION_ENDED", { "session_duration": str(datetime.datetime.now() - self.session_stats['session_start']).split('.')[0], "final_stats": final_stats['session_stats'], "commands_processed": self.session_stats['commands_processed'], "success_rate": (self.session_stats['successful_commands'] / max(self.session_stats['commands_processed'], 1)) * 100, "shutdown_time": datetime.datetime.now().isoformat(), "message": "Enhanced CNS session completed successfully, Boss!" })
                 except Exception as e: self.logger.error(f"Error logging final session data: {e}")
+                try: self.memory_brain.close(); print("✅ Memory Brain flushed and closed")
+                except Exception as e: self.logger.error(f"Error closing Memory Brain: {e}")
             
             print(f"\n📊 Session Summary:\n⏰ Duration: {str(datetime.datetime.now() - self.session_stats['session_start']).split('.')[0]}\n📝 Commands Processed: {self.session_stats['commands_processed']}\n✅ Success Rate: {(self.session_stats['successful_commands'] / max(self.session_stats['commands_processed'], 1)) * 100:.1f}%")
             print("✅ ZIA-X Enhanced CNS shutdown complete.\n👋 Thank you for using ZIA-X Enhanced Edition, Boss!")